@@ -1,15 +1,33 @@
 import base64
 import binascii
 import os
+import time
+from pathlib import Path
 from typing import Optional
 
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, g, jsonify, render_template, request
 try:
     from flask_cors import CORS
 except ModuleNotFoundError:  # pragma: no cover
     CORS = None  # type: ignore[misc,assignment]
 
-from solar_dust_detection import logger
+from solar_dust_detection import configure_logging, logger
+from solar_dust_detection.pipeline.jobs import (
+    JobQueue,
+    JobQueueFull,
+    JobStore,
+    JobTooLarge,
+    list_images,
+)
+from solar_dust_detection.pipeline.metrics import (
+    ERRORS,
+    REGISTRY,
+    REQUEST_SECONDS,
+    REQUESTS,
+    STAGE_SECONDS,
+    Gauge,
+)
+from solar_dust_detection.pipeline.tiling import TileBudgetExceeded
 # Define environment variables for UTF-8 output
 os.putenv("LANG", "en_US.UTF-8")
 os.putenv("LC_ALL", "en_US.UTF-8")
@@ -22,7 +40,45 @@ def _parse_cors_origins(value: str) -> Optional[list[str]]:
     return [v.strip() for v in value.split(",") if v.strip()]
 
 
+def _decode_base64_image(image_b64: str) -> bytes:
+    """Decode raw base64 or a data URL; raises ValueError on invalid base64."""
+    # Accept either raw base64 or data URL form.
+    if "," in image_b64 and image_b64.strip().lower().startswith("data:"):
+        image_b64 = image_b64.split(",", 1)[1]
+    with STAGE_SECONDS.time("base64_decode"):
+        return base64.b64decode(image_b64, validate=False)
+
+
+ERROR_KINDS = {400: "invalid_input", 413: "too_large", 500: "internal"}
+
+
+def _register_pipeline_metrics(classifier) -> None:
+    """Scrape-time gauges over the pipeline's own state; fakes without it export zeros."""
+
+    def queue_depth() -> float:
+        batcher = getattr(classifier, "batcher", None)
+        return batcher.qsize() if batcher is not None else 0
+
+    def cache_counter(field: str):
+        def read() -> float:
+            cache_stats = getattr(classifier, "cache_stats", None)
+            stats = cache_stats() if cache_stats is not None else None
+            return stats[field] if stats else 0
+        return read
+
+    REGISTRY.register(
+        Gauge("solar_dust_batcher_queue_depth", "Requests waiting for a micro-batch.", queue_depth)
+    )
+    REGISTRY.register(
+        Gauge("solar_dust_prediction_cache_hits_total", "Prediction cache hits.", cache_counter("hits"), "counter")
+    )
+    REGISTRY.register(
+        Gauge("solar_dust_prediction_cache_misses_total", "Prediction cache misses.", cache_counter("misses"), "counter")
+    )
+
+
 def create_app(pipeline_cls=None) -> Flask:
+    configure_logging()
     flask_app = Flask(__name__)
 
     # CORS: set CORS_ORIGINS="https://yourdomain.com,https://www.yourdomain.com"
@@ -36,15 +92,52 @@ def create_app(pipeline_cls=None) -> Flask:
     else:
         logger.warning("flask-cors is not installed; continuing without CORS support.")
 
-    predict_filename = os.getenv("PREDICT_FILENAME", "inputImage.jpg")
     max_image_bytes = int(os.getenv("MAX_IMAGE_BYTES", str(5 * 1024 * 1024)))  # 5MB default
+    max_batch_images = int(os.getenv("MAX_BATCH_IMAGES", "256"))
+    # Full-array captures for /predict/tiled are far larger than single-panel crops.
+    max_tiled_image_bytes = int(os.getenv("MAX_TILED_IMAGE_BYTES", str(50 * 1024 * 1024)))
 
     # MODEL_PATH can point to artifacts/training/model.pt or model/model.pt
     if pipeline_cls is None:
         # Import lazily so unit tests can run without torch installed.
         from solar_dust_detection.pipeline.prediction import PredictionPipeline as pipeline_cls
 
-    classifier = pipeline_cls(filename=predict_filename, model_path=os.getenv("MODEL_PATH"))
+    classifier = pipeline_cls(model_path=os.getenv("MODEL_PATH"))
+    # Pre-fork servers reach the pipeline here to re-initialize it per worker (gunicorn.conf.py).
+    flask_app.extensions["prediction_pipeline"] = classifier
+    _register_pipeline_metrics(classifier)
+
+    # Background scoring jobs reuse the loaded pipeline. JOBS_DB defaults to in-memory, which
+    # only works with one server process; gunicorn.conf.py points it at a file shared by workers.
+    jobs = JobQueue(
+        classifier,
+        store=JobStore(os.getenv("JOBS_DB", ":memory:")),
+        max_queued=int(os.getenv("JOBS_MAX_QUEUED", "16")),
+        max_queued_bytes=int(os.getenv("JOBS_MAX_QUEUED_BYTES", str(256 * 1024 * 1024))),
+        workers=int(os.getenv("JOBS_WORKERS", "1")),
+        retention_s=float(os.getenv("JOBS_RETENTION_S", "3600")),
+    )
+    jobs_input_root = Path(os.environ["JOBS_INPUT_ROOT"]).resolve() if os.getenv("JOBS_INPUT_ROOT") else None
+    max_job_images = int(os.getenv("MAX_JOB_IMAGES", "1000"))
+    REGISTRY.register(Gauge("solar_dust_jobs_queued", "Jobs waiting for a job worker.", jobs.qsize))
+
+    @flask_app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @flask_app.after_request
+    def record_request(response):
+        # Label by route rule, not raw path, so unknown URLs cannot blow up label cardinality.
+        endpoint = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        REQUEST_SECONDS.observe(time.perf_counter() - g.request_start, endpoint)
+        REQUESTS.inc(endpoint, str(response.status_code))
+        if response.status_code >= 400:
+            ERRORS.inc(endpoint, ERROR_KINDS.get(response.status_code, str(response.status_code)))
+        return response
+
+    @flask_app.get("/metrics")
+    def metrics():
+        return Response(REGISTRY.render(), mimetype="text/plain; version=0.0.4")
 
     @flask_app.get("/")
     def home():
@@ -52,7 +145,11 @@ def create_app(pipeline_cls=None) -> Flask:
 
     @flask_app.get("/health")
     def health():
-        return jsonify({"status": "ok"})
+        body = {"status": "ok"}
+        cache_stats = getattr(classifier, "cache_stats", None)
+        if cache_stats is not None and cache_stats() is not None:
+            body["prediction_cache"] = cache_stats()
+        return jsonify(body)
 
     @flask_app.post("/predict")
     def predict_route():
@@ -61,12 +158,8 @@ def create_app(pipeline_cls=None) -> Flask:
         if not isinstance(image_b64, str) or not image_b64.strip():
             return jsonify({"error": "Missing required field 'image' (base64 string)."}), 400
 
-        # Accept either raw base64 or data URL form.
-        if "," in image_b64 and image_b64.strip().lower().startswith("data:"):
-            image_b64 = image_b64.split(",", 1)[1]
-
         try:
-            image_bytes = base64.b64decode(image_b64, validate=False)
+            image_bytes = _decode_base64_image(image_b64)
         except (binascii.Error, ValueError):
             return jsonify({"error": "Invalid base64 in field 'image'."}), 400
 
@@ -76,15 +169,146 @@ def create_app(pipeline_cls=None) -> Flask:
                 413,
             )
 
+        # Decode straight from memory: no shared temp file between concurrent requests.
         try:
-            with open(predict_filename, "wb") as f:
-                f.write(image_bytes)
-            result = classifier.predict()
+            result = classifier.predict(image_bytes)
             return jsonify(result)
+        except ValueError:
+            return jsonify({"error": "Field 'image' is not a decodable image."}), 400
         except Exception as e:
             logger.exception("Prediction failed", exc_info=e)
             return jsonify({"error": "Prediction failed. Check server logs."}), 500
 
+    @flask_app.post("/predict/tiled")
+    def predict_tiled_route():
+        # A multipart file field "image", or JSON {"image": b64}; options as form or JSON fields.
+        if "image" in request.files:
+            image_bytes = request.files["image"].read(max_tiled_image_bytes + 1)
+            options = request.form
+        else:
+            options = request.get_json(silent=True) or {}
+            image_b64 = options.get("image")
+            if not isinstance(image_b64, str) or not image_b64.strip():
+                return jsonify({"error": "Provide a multipart file 'image' or field 'image' (base64 string)."}), 400
+            try:
+                image_bytes = _decode_base64_image(image_b64)
+            except (binascii.Error, ValueError):
+                return jsonify({"error": "Invalid base64 in field 'image'."}), 400
+
+        if len(image_bytes) > max_tiled_image_bytes:
+            return jsonify({"error": f"Image too large. Max is {max_tiled_image_bytes} bytes."}), 413
+
+        try:
+            kwargs = {k: float(options[k]) for k in ("overlap", "threshold") if options.get(k) is not None}
+        except (TypeError, ValueError):
+            return jsonify({"error": "Fields 'overlap' and 'threshold' must be numbers."}), 400
+
+        try:
+            return jsonify(classifier.predict_tiled(image_bytes, **kwargs))
+        except TileBudgetExceeded as e:
+            return jsonify({"error": str(e)}), 413
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        except Exception as e:
+            logger.exception("Tiled prediction failed", exc_info=e)
+            return jsonify({"error": "Prediction failed. Check server logs."}), 500
+
+    def read_batch_images(max_images: int):
+        """Images from multipart files (any field name, in upload order) or JSON {"images": [b64, ...]}.
+
+        Returns `(images, None)`, or `(None, error response)` when the request is invalid.
+        """
+        if request.files:
+            uploads = list(request.files.items(multi=True))
+            images = [f.read(max_image_bytes + 1) for _, f in uploads]
+        else:
+            payload = request.get_json(silent=True) or {}
+            images_b64 = payload.get("images")
+            if not isinstance(images_b64, list) or not images_b64:
+                return None, (
+                    jsonify({"error": "Provide multipart files or field 'images' (list of base64 strings)."}),
+                    400,
+                )
+            if len(images_b64) > max_images:
+                return None, (jsonify({"error": f"Too many images. Max is {max_images}."}), 413)
+            images = []
+            for i, image_b64 in enumerate(images_b64):
+                if not isinstance(image_b64, str) or not image_b64.strip():
+                    return None, (jsonify({"error": f"Item {i} of 'images' is not a base64 string."}), 400)
+                try:
+                    images.append(_decode_base64_image(image_b64))
+                except (binascii.Error, ValueError):
+                    return None, (jsonify({"error": f"Invalid base64 in item {i} of 'images'."}), 400)
+
+        if len(images) > max_images:
+            return None, (jsonify({"error": f"Too many images. Max is {max_images}."}), 413)
+        for i, image_bytes in enumerate(images):
+            if len(image_bytes) > max_image_bytes:
+                return None, (
+                    jsonify({"error": f"Image {i} too large. Max is {max_image_bytes} bytes."}),
+                    413,
+                )
+        return images, None
+
+    @flask_app.post("/predict/batch")
+    def predict_batch_route():
+        images, error = read_batch_images(max_batch_images)
+        if error is not None:
+            return error
+
+        try:
+            results = classifier.predict_batch(images)
+            undecodable = sum(1 for r in results if "error" in r)
+            if undecodable:
+                ERRORS.inc("/predict/batch", "undecodable_image", amount=undecodable)
+            return jsonify({"predictions": results})
+        except Exception as e:
+            logger.exception("Batch prediction failed", exc_info=e)
+            return jsonify({"error": "Prediction failed. Check server logs."}), 500
+
+    @flask_app.post("/jobs")
+    def submit_job_route():
+        # {"path": "..."} scores image files under JOBS_INPUT_ROOT; anything else is an image batch.
+        # A body this large (base64 adds a third, plus JSON/multipart framing) cannot hold a job
+        # that fits the byte budget, so it is refused before being read.
+        if (request.content_length or 0) > 2 * jobs.max_queued_bytes + 1024 * 1024:
+            return jsonify({"error": f"Job too large. Max is {jobs.max_queued_bytes} bytes of images."}), 413
+        payload = None if request.files else request.get_json(silent=True)
+        if isinstance(payload, dict) and "path" in payload:
+            if jobs_input_root is None:
+                return jsonify({"error": "Path jobs are disabled; set JOBS_INPUT_ROOT."}), 400
+            path = (jobs_input_root / str(payload["path"])).resolve()
+            if not path.is_relative_to(jobs_input_root) or not path.exists():
+                return jsonify({"error": "Field 'path' must exist under JOBS_INPUT_ROOT."}), 400
+            inputs = list_images(path)
+            if not inputs:
+                return jsonify({"error": "No images found at 'path'."}), 400
+            if len(inputs) > max_job_images:
+                return jsonify({"error": f"Too many images. Max is {max_job_images}."}), 413
+        else:
+            inputs, error = read_batch_images(max_job_images)
+            if error is not None:
+                return error
+
+        try:
+            job_id = jobs.submit(inputs)
+        except JobTooLarge:
+            return jsonify({"error": f"Job too large. Max is {jobs.max_queued_bytes} bytes of images."}), 413
+        except JobQueueFull:
+            return jsonify({"error": "Too many queued jobs; retry later."}), 429, {"Retry-After": "5"}
+        return (
+            jsonify({"id": job_id, "status": "queued", "total": len(inputs)}),
+            202,
+            {"Location": f"/jobs/{job_id}"},
+        )
+
+    @flask_app.get("/jobs/<job_id>")
+    def get_job_route(job_id):
+        job = jobs.get(job_id)
+        if job is None:
+            return jsonify({"error": "Unknown job id."}), 404
+        return jsonify(job)
+
     return flask_app
 
 
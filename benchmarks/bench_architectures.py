@@ -0,0 +1,94 @@
+"""Accuracy, parameter count, model size and CPU images/sec for each backbone in the model registry.
+
+Each architecture is built the way BaseModel builds it (ImageNet weights with --pretrained,
+head resized to the dataset's classes). With --data it is fine-tuned for --epochs with the
+training loop on 70% of the image folder and scored on the other 30% (the evaluation stage's
+split); --epochs 0 only scores it. Without --data the accuracy column stays empty. Speed is
+the median no-grad forward time of a --batch-size batch on the CPU.
+
+Usage:
+    python benchmarks/bench_architectures.py --data artifacts/data_ingestion/Detect_solar_dust --epochs 3 --pretrained
+    python benchmarks/bench_architectures.py --architectures resnet18 mobilenet_v3_small --threads 4
+"""
+import argparse
+import io
+
+from common import print_table, summarize, time_calls
+
+
+def make_loaders(data, image_size, batch_size):
+    import torch
+    from torch.utils.data import DataLoader, random_split
+
+    from solar_dust_detection.components.model_evaluation_mlflow import MapDataset
+    from solar_dust_detection.utils.image_folder import image_folder
+    from solar_dust_detection.utils.preprocessing import ImagePreprocessor
+
+    preprocessor = ImagePreprocessor(size=(image_size, image_size))
+    folder = image_folder(data, loader=preprocessor.decode)
+    torch.manual_seed(42)
+    val_size = int(len(folder) * 0.30)
+    train, val = random_split(folder, [len(folder) - val_size, val_size])
+    loaders = [
+        DataLoader(MapDataset(subset, preprocessor.load), batch_size=batch_size, shuffle=shuffle,
+                   collate_fn=preprocessor.collate)
+        for subset, shuffle in ((train, True), (val, False))
+    ]
+    return loaders, len(folder.classes)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--architectures", nargs="+", default=None, help="default: every registered backbone")
+    parser.add_argument("--data", default=None, help="ImageFolder directory to fine-tune and score on")
+    parser.add_argument("--epochs", type=int, default=1)
+    parser.add_argument("--learning-rate", type=float, default=0.01)
+    parser.add_argument("--pretrained", action="store_true", help="start from ImageNet weights (downloads them)")
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--iterations", type=int, default=10, help="timed forward passes per backbone")
+    parser.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 keeps the default)")
+    args = parser.parse_args()
+
+    import torch
+    import torch.nn as nn
+
+    from solar_dust_detection.utils.model_registry import ARCHITECTURES, build_model
+    from solar_dust_detection.utils.train_loop import evaluate, train_epoch
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    loaders, num_classes = make_loaders(args.data, args.image_size, args.batch_size) if args.data else (None, 2)
+    batch = torch.randn(args.batch_size, 3, args.image_size, args.image_size)
+
+    rows = []
+    for name in args.architectures or list(ARCHITECTURES):
+        torch.manual_seed(0)
+        model = build_model(name, num_classes, pretrained=args.pretrained)
+        accuracy = None
+        if loaders:
+            train_loader, val_loader = loaders
+            criterion = nn.CrossEntropyLoss()
+            optimizer = torch.optim.SGD(model.parameters(), lr=args.learning_rate)
+            for _ in range(args.epochs):
+                train_epoch(model, train_loader, criterion, optimizer, "cpu")
+            model.eval()
+            _, accuracy = evaluate(model, val_loader, criterion, "cpu")
+
+        model.eval()
+        buffer = io.BytesIO()
+        torch.save(model.state_dict(), buffer)
+        with torch.no_grad():
+            latency = summarize(time_calls(lambda model=model: model(batch), args.iterations))
+        rows.append({
+            "architecture": name,
+            "accuracy": accuracy if accuracy is not None else "-",
+            "params (M)": sum(p.numel() for p in model.parameters()) / 1e6,
+            "size (MB)": buffer.getbuffer().nbytes / 2**20,
+            "CPU img/s": args.batch_size / (latency["p50_ms"] / 1000),
+        })
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
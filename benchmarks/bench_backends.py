@@ -0,0 +1,67 @@
+"""Latency and throughput of the torch and onnxruntime PredictionPipeline backends.
+
+Usage:
+    python benchmarks/bench_backends.py --batch-sizes 1 8 32 --iterations 20
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import make_checkpoint, make_jpeg_bytes, print_table, summarize, time_calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    import torch
+
+    from solar_dust_detection.components.model_export import ModelExport
+    from solar_dust_detection.entity.config_entity import ModelExportConfig
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        config = ModelExportConfig(
+            root_dir=tmp_dir,
+            trained_model_path=make_checkpoint(tmp_dir / "model.pt"),
+            torchscript_model_path=tmp_dir / "model.ts",
+            onnx_model_path=tmp_dir / "model.onnx",
+            params_image_size=[224, 224, 3],
+            params_classes=2,
+        )
+        export = ModelExport(config)
+        export.load_trained_model()
+        export.export_onnx()
+
+        pipelines = {
+            "torch": PredictionPipeline(model_path=str(config.trained_model_path), backend="torch"),
+            "onnxruntime": PredictionPipeline(
+                model_path=str(config.onnx_model_path), backend="onnxruntime"
+            ),
+        }
+        # Time the forward pass only: decode/preprocess is identical for both backends.
+        sample = pipelines["torch"].preprocess(pipelines["torch"].load_image(make_jpeg_bytes()))
+        rows = []
+        for batch_size in args.batch_sizes:
+            tensors = [sample.clone() for _ in range(batch_size)]
+            for name, pipeline in pipelines.items():
+                with torch.no_grad():
+                    stats = summarize(
+                        time_calls(lambda p=pipeline, t=tensors: p._forward(t), args.iterations)
+                    )
+                rows.append(
+                    {
+                        "backend": name,
+                        "batch_size": batch_size,
+                        "images_per_s": batch_size / (stats["mean_ms"] / 1000),
+                        **stats,
+                    }
+                )
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
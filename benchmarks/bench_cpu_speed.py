@@ -0,0 +1,93 @@
+"""Training and inference images/sec on CPU per speed option (BF16, CHANNELS_LAST, COMPILE, threads).
+
+Each row builds a fresh ResNet18, applies one `SpeedOptions` setting the way Training and
+PredictionPipeline do, warms it up (the "warmup_s" column includes torch.compile time) and
+then times train steps and no-grad forward passes on synthetic data.
+
+Usage:
+    python benchmarks/bench_cpu_speed.py --batch-size 16 --steps 10 --threads 4
+"""
+import argparse
+import time
+
+from common import print_table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--steps", type=int, default=10)
+    parser.add_argument("--threads", type=int, default=0, help="intra-op threads for the threads row")
+    parser.add_argument("--skip-compile", action="store_true")
+    args = parser.parse_args()
+
+    import torch
+    import torch.nn as nn
+    from torchvision import models
+
+    from solar_dust_detection.utils.acceleration import SpeedOptions, bf16_supported
+    from solar_dust_detection.utils.train_loop import evaluate, train_epoch
+
+    settings = {
+        "fp32 eager": SpeedOptions(),
+        "channels_last": SpeedOptions(channels_last=True),
+        "bf16": SpeedOptions(bf16=True),
+        "bf16 + channels_last": SpeedOptions(bf16=True, channels_last=True),
+    }
+    if not args.skip_compile:
+        settings["compile"] = SpeedOptions(compile=True)
+        settings["all"] = SpeedOptions(bf16=True, channels_last=True, compile=True)
+    if args.threads:
+        settings[f"intra_op_threads={args.threads}"] = SpeedOptions(intra_op_threads=args.threads)
+    if not bf16_supported("cpu"):
+        print("This CPU has no native bf16; bf16 rows fall back to fp32.")
+
+    generator = torch.Generator().manual_seed(0)
+    size = (args.batch_size, 3, args.image_size, args.image_size)
+    batches = [
+        (torch.randn(size, generator=generator), torch.randint(2, (args.batch_size,), generator=generator))
+        for _ in range(args.steps)
+    ]
+    criterion = nn.CrossEntropyLoss()
+    default_threads = torch.get_num_threads()
+    images = args.batch_size * args.steps
+
+    rows = []
+    for name, speed in settings.items():
+        torch.set_num_threads(default_threads)
+        speed = speed.resolve("cpu")
+        speed.apply_threads()
+        model = models.resnet18(weights=None)
+        model.fc = nn.Linear(model.fc.in_features, 2)
+        forward = speed.prepare_model(model)
+        optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+
+        start = time.perf_counter()
+        train_epoch(forward, batches[:2], criterion, optimizer, "cpu", speed=speed)
+        model.eval()
+        evaluate(forward, batches[:2], criterion, "cpu", speed=speed)
+        warmup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        train_epoch(forward, batches, criterion, optimizer, "cpu", speed=speed)
+        train_rate = images / (time.perf_counter() - start)
+
+        model.eval()
+        start = time.perf_counter()
+        evaluate(forward, batches, criterion, "cpu", speed=speed)
+        infer_rate = images / (time.perf_counter() - start)
+
+        rows.append({
+            "option": name,
+            "threads": torch.get_num_threads(),
+            "warmup_s": warmup,
+            "train img/s": train_rate,
+            "inference img/s": infer_rate,
+        })
+        torch._dynamo.reset()
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Images/sec of the training DataLoader alone vs loader + model step, per worker setting.
+
+If "loader + model" is close to "loader only", decoding/augmentation is the bottleneck;
+if it is much lower, the model is.
+
+Usage:
+    python benchmarks/bench_data_loader.py --images 256 --workers 0 2 auto [--cache]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from common import make_checkpoint, make_jpeg_bytes, print_table
+
+
+def make_image_folder(root: Path, count: int) -> Path:
+    for i in range(count):
+        label_dir = root / ("Dusty" if i % 2 else "Clean")
+        label_dir.mkdir(parents=True, exist_ok=True)
+        (label_dir / f"{i}.jpg").write_bytes(make_jpeg_bytes(seed=i))
+    return root
+
+
+def images_per_second(loader, step=None) -> float:
+    count = 0
+    start = time.perf_counter()
+    for images, labels in loader:
+        if step is not None:
+            step(images, labels)
+        count += len(labels)
+    return count / (time.perf_counter() - start)
+
+
+def make_train_step(model, device):
+    import torch
+    import torch.nn as nn
+
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+
+    def step(images, labels):
+        images, labels = images.to(device), labels.to(device)
+        optimizer.zero_grad()
+        criterion(model(images), labels).backward()
+        optimizer.step()
+
+    return step
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--images", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", nargs="+", default=["0", "2", "auto"])
+    parser.add_argument("--no-augmentation", action="store_true")
+    parser.add_argument("--cache", action="store_true", help="build and use the decoded dataset cache")
+    args = parser.parse_args()
+
+    from solar_dust_detection.components.dataset_cache import DatasetCache
+    from solar_dust_detection.components.model_training import Training
+    from solar_dust_detection.entity.config_entity import DatasetCacheConfig, TrainingConfig
+    from solar_dust_detection.utils.data_loading import resolve_num_workers
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        data = make_image_folder(tmp_dir / "data", args.images)
+        if args.cache:
+            DatasetCache(
+                DatasetCacheConfig(
+                    root_dir=tmp_dir / "cache",
+                    training_data=data,
+                    data_manifest_path=tmp_dir / "manifest.json",
+                    params_image_size=[224, 224, 3],
+                )
+            ).build()
+
+        rows = []
+        for workers in args.workers:
+            config = TrainingConfig(
+                root_dir=tmp_dir,
+                trained_model_path=tmp_dir / "model.pt",
+                updated_base_model_path=make_checkpoint(tmp_dir / "base.pt"),
+                training_data=data,
+                data_manifest_path=tmp_dir / "manifest.json",
+                params_epochs=1,
+                params_batch_size=args.batch_size,
+                params_is_augmentation=not args.no_augmentation,
+                params_image_size=[224, 224, 3],
+                params_learning_rate=0.01,
+                params_classes=2,
+                dataset_cache_dir=tmp_dir / "cache",
+                params_num_workers=workers,
+                params_prefetch_factor=2,
+                params_persistent_workers=True,
+                params_pin_memory="auto",
+                feature_cache_dir=tmp_dir / "features",
+                params_feature_cache=False,
+                params_feature_cache_views=1,
+                params_log_every_n_steps=0,
+                checkpoint_path=tmp_dir / "checkpoint.pt",
+                params_checkpoint_every_n_epochs=1,
+                params_early_stopping_patience=0,
+                params_bf16=False,
+                params_channels_last=False,
+                params_compile=False,
+                params_intra_op_threads=0,
+                params_inter_op_threads=0,
+            )
+            training = Training(config)
+            training.get_base_model()
+            training.train_valid_generator()
+            step = make_train_step(training.model, training.device)
+            images_per_second(training.train_loader)  # start persistent workers / warm caches
+            rows.append(
+                {
+                    "num_workers": f"{workers} ({resolve_num_workers(workers)})",
+                    "loader_only_img_s": images_per_second(training.train_loader),
+                    "loader_plus_model_img_s": images_per_second(training.train_loader, step),
+                }
+            )
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
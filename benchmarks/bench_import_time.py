@@ -0,0 +1,92 @@
+"""Cold import time per module (`python -X importtime`), checked against a budget.
+
+Each module is imported in a fresh interpreter; the best of `--repeats` runs is reported
+with the slowest direct imports underneath it. Budgets (ms) live in `import_budget.json`
+next to this script: the package, CLI, config and stage modules must stay torch-free, while
+modules that genuinely need torch get a budget that still catches e.g. mlflow sneaking back
+in at module level. `--check` exits non-zero when a module goes over budget.
+
+Usage:
+    python benchmarks/bench_import_time.py [--check] [--repeats 3] [module ...]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from common import ROOT, print_table
+
+BUDGET_FILE = ROOT / "benchmarks" / "import_budget.json"
+
+
+def import_times(module: str) -> List[Tuple[int, str, float]]:
+    """`(depth, name, cumulative ms)` for every import triggered by `import module`."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join([str(ROOT / "src"), str(ROOT)])}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        cwd=ROOT,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, name.strip(), int(cumulative) / 1000))
+    return rows
+
+
+def measure(module: str, repeats: int) -> Tuple[float, List[Tuple[str, float]]]:
+    """Best cumulative ms for `module` and its direct imports, slowest first."""
+    best_ms, best_children = float("inf"), []
+    for _ in range(repeats):
+        # -X importtime prints children before their parent: collect depth-1 rows until
+        # the module's own depth-0 row (rows before an earlier depth-0 row belong to it).
+        children: List[Tuple[str, float]] = []
+        for depth, name, ms in import_times(module):
+            if depth == 1:
+                children.append((name, ms))
+            elif depth == 0 and name != module:
+                children = []
+            elif depth == 0:
+                if ms < best_ms:
+                    best_ms, best_children = ms, children
+                break
+    return best_ms, sorted(best_children, key=lambda r: -r[1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("modules", nargs="*", help="modules to measure (default: every budgeted module)")
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--check", action="store_true", help="exit 1 if any module exceeds its budget")
+    args = parser.parse_args()
+
+    budgets: Dict[str, float] = json.loads(BUDGET_FILE.read_text())
+    rows, over = [], []
+    for module in args.modules or budgets:
+        total, children = measure(module, args.repeats)
+        budget = budgets.get(module)
+        if budget is not None and total > budget:
+            over.append(module)
+        rows.append({
+            "module": module,
+            "ms": total,
+            "budget_ms": budget if budget is not None else "-",
+            "slowest imports": ", ".join(f"{name} {ms:.0f}" for name, ms in children[:3]),
+        })
+    print_table(rows)
+
+    if args.check and over:
+        print(f"\nOver budget: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
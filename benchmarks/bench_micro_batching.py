@@ -0,0 +1,76 @@
+"""Throughput and latency of concurrent `predict` calls with and without micro-batching.
+
+Usage:
+    python benchmarks/bench_micro_batching.py --clients 16 --requests 20 --batch-sizes 1 4 8 16
+"""
+import argparse
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import make_checkpoint, make_jpeg_bytes, print_table, summarize
+
+
+def run_clients(pipeline, image_bytes: bytes, clients: int, requests: int):
+    latencies = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client():
+        local = []
+        barrier.wait()
+        for _ in range(requests):
+            start = time.perf_counter()
+            pipeline.predict(image_bytes)
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=20, help="requests per client")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = make_checkpoint(Path(tmp) / "model.pt")
+        image_bytes = make_jpeg_bytes()
+        rows = []
+        for max_batch_size in args.batch_sizes:
+            pipeline = PredictionPipeline(
+                model_path=str(model_path),
+                max_batch_size=max_batch_size,
+                max_wait_ms=args.max_wait_ms,
+                # Every client sends the same bytes; the cache would answer them all.
+                cache_size=0,
+            )
+            run_clients(pipeline, image_bytes, args.clients, 1)  # warm-up
+            latencies, elapsed = run_clients(pipeline, image_bytes, args.clients, args.requests)
+            if pipeline.batcher is not None:
+                pipeline.batcher.close()
+            rows.append(
+                {
+                    "max_batch_size": max_batch_size,
+                    "images_per_s": len(latencies) / elapsed,
+                    **summarize(latencies),
+                }
+            )
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Cold-start time of PredictionPipeline: state_dict rebuild vs the TorchScript export.
+
+Each path runs in a fresh interpreter so imports, model load and the first forward pass
+are all counted, as they are for a newly scheduled pod.
+
+Usage:
+    python benchmarks/bench_model_startup.py --runs 5
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from common import ROOT, make_checkpoint, print_table, summarize
+
+CHILD = """
+import time
+t0 = time.perf_counter()
+import sys
+sys.path.insert(0, {src!r})
+from solar_dust_detection.pipeline.prediction import PredictionPipeline
+t1 = time.perf_counter()
+pipeline = PredictionPipeline(model_path={model!r})
+t2 = time.perf_counter()
+from PIL import Image
+pipeline.predict(Image.new("RGB", (640, 480)))
+t3 = time.perf_counter()
+import json
+print(json.dumps({{"import": t1 - t0, "load": t2 - t1, "first_predict": t3 - t2}}))
+"""
+
+
+def measure(model_path: Path, runs: int):
+    samples = {"import": [], "load": [], "first_predict": [], "total": []}
+    code = CHILD.format(src=str(ROOT / "src"), model=str(model_path))
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        ).stdout
+        timings = json.loads(out.strip().splitlines()[-1])
+        for key, value in timings.items():
+            samples[key].append(value * 1000)
+        samples["total"].append(sum(timings.values()) * 1000)
+    return {f"{k}_p50_ms": summarize(v)["p50_ms"] for k, v in samples.items()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    from solar_dust_detection.components.model_export import ModelExport
+    from solar_dust_detection.entity.config_entity import ModelExportConfig
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        config = ModelExportConfig(
+            root_dir=tmp_dir,
+            trained_model_path=make_checkpoint(tmp_dir / "model.pt"),
+            torchscript_model_path=tmp_dir / "model.ts",
+            onnx_model_path=tmp_dir / "model.onnx",
+            params_image_size=[224, 224, 3],
+            params_classes=2,
+        )
+        export = ModelExport(config)
+        export.load_trained_model()
+        export.export_torchscript()
+
+        rows = [
+            {"artifact": "state_dict (model.pt)", **measure(config.trained_model_path, args.runs)},
+            {"artifact": "torchscript (model.ts)", **measure(config.torchscript_model_path, args.runs)},
+        ]
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
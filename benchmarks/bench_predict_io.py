@@ -0,0 +1,48 @@
+"""Compare the old temp-file round trip against in-memory decoding for `/predict`.
+
+Usage:
+    python benchmarks/bench_predict_io.py --iterations 200
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from common import make_checkpoint, make_jpeg_bytes, print_table, summarize, time_calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    args = parser.parse_args()
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        model_path = make_checkpoint(tmp_dir / "model.pt")
+        image_bytes = make_jpeg_bytes(args.width, args.height)
+        upload_path = tmp_dir / "inputImage.jpg"
+        # Every call sends the same bytes; without cache_size=0 both paths would time a cache hit.
+        pipeline = PredictionPipeline(
+            filename=str(upload_path), model_path=str(model_path), cache_size=0
+        )
+
+        def file_round_trip():
+            # What the route did before: write the upload, then reopen it by path.
+            with open(upload_path, "wb") as f:
+                f.write(image_bytes)
+            return pipeline.predict()
+
+        def in_memory():
+            return pipeline.predict(image_bytes)
+
+        rows = []
+        for name, fn in (("file_round_trip", file_round_trip), ("in_memory", in_memory)):
+            rows.append({"path": name, **summarize(time_calls(fn, args.iterations))})
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
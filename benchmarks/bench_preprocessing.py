@@ -0,0 +1,66 @@
+"""Per-image torchvision transforms vs the batched ImagePreprocessor.
+
+Reports ms per batch, images/sec and the max absolute difference from the torchvision
+chain (the numerical-equivalence check).
+
+Usage:
+    python benchmarks/bench_preprocessing.py --batch-size 32 --width 1280 --height 960
+"""
+import argparse
+import io
+
+from common import make_jpeg_bytes, print_table, summarize, time_calls
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--iterations", type=int, default=10)
+    args = parser.parse_args()
+
+    import torch
+    from PIL import Image
+    from torchvision import transforms
+
+    from solar_dust_detection.utils.preprocessing import (
+        IMAGENET_MEAN,
+        IMAGENET_STD,
+        ImagePreprocessor,
+    )
+
+    images = [make_jpeg_bytes(args.width, args.height, seed=i) for i in range(args.batch_size)]
+    reference = transforms.Compose(
+        [
+            transforms.Resize((224, 224)),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+        ]
+    )
+
+    def torchvision_chain(batch):
+        return torch.stack([reference(Image.open(io.BytesIO(b)).convert("RGB")) for b in batch])
+
+    candidates = {
+        "torchvision_chain": torchvision_chain,
+        "preprocessor": ImagePreprocessor(size=(224, 224)),
+        "preprocessor_draft": ImagePreprocessor(size=(224, 224), draft=True),
+    }
+    expected = torchvision_chain(images)
+    rows = []
+    for name, fn in candidates.items():
+        stats = summarize(time_calls(lambda fn=fn: fn(images), args.iterations, warmup=1))
+        rows.append(
+            {
+                "path": name,
+                "images_per_s": args.batch_size / (stats["mean_ms"] / 1000),
+                "p50_ms_per_batch": stats["p50_ms"],
+                "max_abs_diff": float((fn(images) - expected).abs().max()),
+            }
+        )
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
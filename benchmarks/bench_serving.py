@@ -0,0 +1,132 @@
+"""Load test of the pre-fork gunicorn server: requests/sec and tail latency per worker count.
+
+Starts `gunicorn --config gunicorn.conf.py "app:create_app()"` for each worker count with a
+random checkpoint, then hammers /predict from concurrent clients. The prediction cache is
+disabled so every request runs the model.
+
+Usage:
+    python benchmarks/bench_serving.py --workers 1 2 4 --clients 16 --requests 25
+"""
+import argparse
+import base64
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+import numpy as np
+from common import ROOT, make_checkpoint, make_jpeg_bytes, print_table
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 120.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"server did not become ready at {url}")
+
+
+def post(url: str, body: bytes) -> None:
+    req = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as resp:
+        resp.read()
+
+
+def load_test(url: str, body: bytes, clients: int, requests: int):
+    latencies, errors = [], []
+    lock = threading.Lock()
+    barrier = threading.Barrier(clients)
+
+    def client():
+        local = []
+        barrier.wait()
+        for _ in range(requests):
+            start = time.perf_counter()
+            try:
+                post(url, body)
+            except OSError as e:
+                with lock:
+                    errors.append(e)
+                continue
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return latencies, len(errors), time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--threads", type=int, default=4, help="SERVE_THREADS per worker")
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=25, help="requests per client")
+    args = parser.parse_args()
+
+    body = json.dumps({"image": base64.b64encode(make_jpeg_bytes()).decode()}).encode()
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = make_checkpoint(Path(tmp) / "model.pt")
+        rows = []
+        for workers in args.workers:
+            port = free_port()
+            env = {
+                **os.environ,
+                "PYTHONPATH": str(ROOT / "src"),
+                "MODEL_PATH": str(model_path),
+                "PORT": str(port),
+                "SERVE_WORKERS": str(workers),
+                "SERVE_THREADS": str(args.threads),
+                "PREDICT_CACHE_SIZE": "0",
+            }
+            server = subprocess.Popen(
+                [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py", "app:create_app()"],
+                cwd=ROOT,
+                env=env,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            try:
+                base = f"http://127.0.0.1:{port}"
+                wait_ready(f"{base}/health")
+                load_test(f"{base}/predict", body, args.clients, 2)  # warm-up every worker
+                latencies, errors, elapsed = load_test(f"{base}/predict", body, args.clients, args.requests)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+            arr = np.asarray(latencies)
+            rows.append(
+                {
+                    "workers": workers,
+                    "req_per_s": len(latencies) / elapsed,
+                    "p50_ms": float(np.percentile(arr, 50)),
+                    "p95_ms": float(np.percentile(arr, 95)),
+                    "p99_ms": float(np.percentile(arr, 99)),
+                    "errors": errors,
+                }
+            )
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
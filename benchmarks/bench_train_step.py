@@ -0,0 +1,107 @@
+"""Training step time with a per-step device sync (the old loop) vs on-device metric accumulation.
+
+The old loop called `loss.item()` and `(predicted == labels).sum().item()` every batch and
+`zero_grad()` without `set_to_none`. The new loop (`utils.train_loop.train_epoch`) reads
+metrics back once per epoch. On CPU a sync is free, so expect parity there; the gap shows
+on CUDA/MPS, where each `.item()` stalls the host until the queued kernels finish.
+
+Usage:
+    python benchmarks/bench_train_step.py --steps 30 --batch-size 16 --image-size 224
+"""
+import argparse
+import time
+
+from common import print_table
+
+
+def legacy_epoch(model, loader, criterion, optimizer, device):
+    import torch
+
+    model.train()
+    running_loss = 0.0
+    correct = 0
+    total = 0
+    for images, labels in loader:
+        images, labels = images.to(device), labels.to(device)
+        optimizer.zero_grad()
+        outputs = model(images)
+        loss = criterion(outputs, labels)
+        loss.backward()
+        optimizer.step()
+        running_loss += loss.item()
+        _, predicted = torch.max(outputs.data, 1)
+        total += labels.size(0)
+        correct += (predicted == labels).sum().item()
+    return running_loss / len(loader), correct / total
+
+
+def synchronize(device) -> None:
+    import torch
+
+    if device == "cuda":
+        torch.cuda.synchronize()
+    elif device == "mps":
+        torch.mps.synchronize()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--image-size", type=int, default=224)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    import torch
+    import torch.nn as nn
+    from torch.utils.data import DataLoader, TensorDataset
+    from torchvision import models
+
+    from solar_dust_detection.utils.train_loop import train_epoch
+
+    device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
+    generator = torch.Generator().manual_seed(0)
+    count = args.steps * args.batch_size
+    images = torch.randn(count, 3, args.image_size, args.image_size, generator=generator)
+    labels = torch.randint(2, (count,), generator=generator)
+    loader = DataLoader(
+        TensorDataset(images, labels),
+        batch_size=args.batch_size,
+        shuffle=False,
+        pin_memory=device == "cuda",
+    )
+
+    model = models.resnet18(weights=None)
+    model.fc = nn.Linear(model.fc.in_features, 2)
+    model.to(device)
+    criterion = nn.CrossEntropyLoss()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.01)
+
+    loops = {
+        "per-step sync": lambda: legacy_epoch(model, loader, criterion, optimizer, device),
+        "on-device accumulation": lambda: train_epoch(model, loader, criterion, optimizer, device),
+    }
+    timings = {name: [] for name in loops}
+    loops["per-step sync"]()  # warm-up (allocator, cuDNN autotuning)
+    for _ in range(args.repeats):
+        for name, run in loops.items():
+            synchronize(device)
+            start = time.perf_counter()
+            run()
+            synchronize(device)
+            timings[name].append(time.perf_counter() - start)
+
+    rows = []
+    for name, samples in timings.items():
+        best = min(samples)
+        rows.append({
+            "loop": name,
+            "device": device,
+            "ms/step": 1000 * best / args.steps,
+            "images/s": count / best,
+        })
+    print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
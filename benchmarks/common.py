@@ -0,0 +1,70 @@
+"""Shared helpers for the benchmark scripts in this directory.
+
+The benchmarks run against randomly initialised weights and synthetic JPEGs so they
+work on a fresh checkout without the DVC artifacts.
+"""
+import io
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from PIL import Image
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "src"))
+
+
+def make_checkpoint(path: Path, num_classes: int = 2) -> Path:
+    """Write a randomly initialised ResNet18 state_dict shaped like `model.pt`."""
+    import torch
+    import torch.nn as nn
+    from torchvision import models
+
+    model = models.resnet18(weights=None)
+    model.fc = nn.Linear(model.fc.in_features, num_classes)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), path)
+    return path
+
+
+def make_jpeg_bytes(width: int = 640, height: int = 480, seed: int = 0) -> bytes:
+    """Encode a noisy RGB image as JPEG, roughly the size of a phone upload."""
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    buf = io.BytesIO()
+    Image.fromarray(pixels).save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+def time_calls(fn: Callable[[], object], iterations: int, warmup: int = 3) -> List[float]:
+    """Return per-call latencies in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    arr = np.asarray(samples)
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "mean_ms": float(arr.mean()),
+    }
+
+
+def print_table(rows: List[Dict[str, object]]) -> None:
+    if not rows:
+        return
+    headers = list(rows[0].keys())
+    cells = [[f"{r[h]:.2f}" if isinstance(r[h], float) else str(r[h]) for h in headers] for r in rows]
+    widths = [max(len(h), *(len(c[i]) for c in cells)) for i, h in enumerate(headers)]
+    print("  ".join(h.ljust(w) for h, w in zip(headers, widths, strict=True)))
+    for c in cells:
+        print("  ".join(v.ljust(w) for v, w in zip(c, widths, strict=True)))
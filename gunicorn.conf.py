@@ -0,0 +1,44 @@
+"""Production server settings: `gunicorn --config gunicorn.conf.py "app:create_app()"`.
+
+The app (and the model) is loaded once in the master process and workers are forked from
+it, so the weights are shared copy-on-write instead of loaded N times.
+
+Env vars:
+- SERVE_WORKERS: worker processes (default: 2)
+- SERVE_THREADS: request threads per worker (default: 4)
+- TORCH_NUM_THREADS: torch intra-op threads per worker (default: cores // workers, min 1)
+- PORT: listen port (default: 8080)
+- JOBS_DB: job store shared by the workers (default: solar_dust_jobs.db in the temp dir).
+  Each worker runs the jobs it accepted, but any worker may get the `GET /jobs/<id>`, so
+  the per-process in-memory default of `app.py` would lose track of most jobs here.
+"""
+import gc
+import os
+import tempfile
+
+from solar_dust_detection.utils.data_loading import available_cores
+
+workers = int(os.getenv("SERVE_WORKERS", "2"))
+threads = int(os.getenv("SERVE_THREADS", "4"))
+worker_class = "gthread"
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+preload_app = True
+timeout = int(os.getenv("SERVE_TIMEOUT_S", "60"))
+accesslog = "-"
+
+os.environ.setdefault("JOBS_DB", os.path.join(tempfile.gettempdir(), "solar_dust_jobs.db"))
+
+torch_threads = int(os.getenv("TORCH_NUM_THREADS", str(max(1, available_cores() // workers))))
+
+
+def pre_fork(server, worker):
+    # Move the preloaded objects out of the GC's reach so collections in the workers
+    # do not write to (and un-share) their pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    pipeline = server.app.wsgi().extensions.get("prediction_pipeline")
+    if pipeline is not None and hasattr(pipeline, "after_fork"):
+        pipeline.after_fork(num_threads=torch_threads)
+    server.log.info("Worker %s serving with %d torch threads", worker.pid, torch_threads)
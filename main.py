@@ -1,44 +1,28 @@
-from solar_dust_detection import logger
-from solar_dust_detection.pipeline.stage_01_data_ingestion import STAGE, DataIngestionTrainingPipeline
-from solar_dust_detection.pipeline.stage_02_base_model import BaseModelTrainingPipeline
-from solar_dust_detection.pipeline.stage_03_model_training import ModelTrainingPipeline
+import argparse
 
+from solar_dust_detection import configure_logging, logger
 
-#----------------------------------------------------------------
-STAGE_NAME = "Data Ingestion Stage" 
 
-try:
-    logger.info(f">>>>> stage {STAGE_NAME} started <<<<<")
-    obj = DataIngestionTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>> stage {STAGE_NAME} completed <<<<<\n\nx================x")
-except Exception as e:
-    logger.exception(e)
-    raise e
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run the dvc.yaml stages in one process, skipping stages whose inputs are unchanged."
+    )
+    parser.add_argument("stages", nargs="*", help="stages to bring up to date (default: all); upstream stages are included")
+    parser.add_argument("--force", action="store_true", help="re-run the stages even when their inputs are unchanged")
+    args = parser.parse_args(argv)
 
-#----------------------------------------------------------------
-STAGE_NAME = "Base Model Stage"
+    configure_logging()
+    from solar_dust_detection.pipeline.runner import PipelineRunner, format_report
 
-try:
-    logger.info(f">>>>> stage {STAGE_NAME} started <<<<<")
-    obj = BaseModelTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>> stage {STAGE_NAME} completed <<<<<\n\nx================x")
-except Exception as e:
-    logger.exception(e)
-    raise e
+    runner = PipelineRunner()
+    try:
+        runner.run(args.stages or None, force=args.force)
+    except Exception as e:
+        logger.exception(e)
+        raise e
+    finally:
+        print(format_report(runner.results))
 
-#----------------------------------------------------------------
-STAGE_NAME = "Model Training Stage"
 
-try:
-    logger.info(f">>>>> stage {STAGE_NAME} started <<<<<")
-    obj = ModelTrainingPipeline()
-    obj.main()
-    logger.info(f">>>>> stage {STAGE_NAME} completed <<<<<\n\nx================x")
-except Exception as e:
-    logger.exception(e)
-    raise e
-
-
-#----------------------------------------------------------------
\ No newline at end of file
+if __name__ == "__main__":
+    main()
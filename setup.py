@@ -43,5 +43,6 @@ setuptools.setup(
     packages=setuptools.find_packages(where="src"),
     python_requires=">=3.10",
     install_requires=_read_requirements(),
+    entry_points={"console_scripts": ["solar-dust=solar_dust_detection.cli:main"]},
 )
     
\ No newline at end of file
@@ -1,22 +1,31 @@
+import logging
 import os
 import sys
-import logging
-
 
 logging_str = "[%(asctime)s: %(levelname)s: %(module)s]: %(message)s"
 log_dir = "logs"
 log_filepath = os.path.join(log_dir, "solar_dust_detection.log")
-os.makedirs(log_dir, exist_ok=True)
 
+logger = logging.getLogger("solar_dust_detection_logger")
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format=logging_str,
-    handlers=[
-        logging.FileHandler(log_filepath),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+def configure_logging(log_dir: str = log_dir) -> None:
+    """Log to stdout and `<log_dir>/solar_dust_detection.log`.
 
-logger = logging.getLogger("solar_dust_detection_logger")
\ No newline at end of file
+    Called by the entry points (stage scripts, main.py, the CLI and the Flask app) rather
+    than at import, so importing the package has no side effects. Safe to call repeatedly.
+    """
+    root = logging.getLogger()
+    if any(getattr(h, "_solar_dust_detection", False) for h in root.handlers):
+        return
+    os.makedirs(log_dir, exist_ok=True)
+    handlers = [
+        logging.FileHandler(os.path.join(log_dir, "solar_dust_detection.log")),
+        logging.StreamHandler(sys.stdout),
+    ]
+    formatter = logging.Formatter(logging_str)
+    for handler in handlers:
+        handler._solar_dust_detection = True
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    root.setLevel(logging.INFO)
@@ -0,0 +1,111 @@
+"""`solar-dust` command line entry point.
+
+    solar-dust score <dir or file list> --output scores/ [--format csv|parquet]
+    solar-dust metrics [artifacts/evaluation/predictions.npz] [--threshold 0.3 0.5] [--curves]
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from solar_dust_detection import configure_logging
+
+
+def _score(args: argparse.Namespace) -> int:
+    from solar_dust_detection.pipeline.bulk_scoring import BulkScorer
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    if args.workers:
+        os.environ["PREDICT_DECODE_WORKERS"] = str(args.workers)
+    pipeline = PredictionPipeline(model_path=args.model_path, backend=args.backend)
+    pipeline.chunk_size = args.batch_size
+    scorer = BulkScorer(
+        pipeline,
+        output_dir=args.output,
+        fmt=args.format,
+        shard_size=args.shard_size,
+        block_size=args.batch_size * 8,
+        log_every_s=args.log_every,
+    )
+    checkpoint = scorer.score(args.source)
+    print(f"Wrote {checkpoint['done']} rows in {checkpoint['shards']} shards to {args.output}")
+    return 0
+
+
+def _metrics(args: argparse.Namespace) -> int:
+    from solar_dust_detection.utils.classification_metrics import (
+        DEFAULT_THRESHOLDS,
+        classification_report,
+    )
+    from solar_dust_detection.utils.prediction_log import load_prediction_log
+
+    log = load_prediction_log(args.prediction_log)
+    report = classification_report(
+        log["logits"],
+        log["label"],
+        log["classes"],
+        positive_class=args.positive_class,
+        thresholds=args.threshold or DEFAULT_THRESHOLDS,
+        curves=args.curves,
+    )
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text, encoding="utf-8")
+        print(f"Wrote metrics for {report['samples']} samples to {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="solar-dust", description="Solar panel dust detection tools.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    score = commands.add_parser(
+        "score",
+        help="Bulk-score a directory of images or a file list",
+        description="Score every image under a directory (or listed one per line in a file) "
+        "into sharded CSV/Parquet files. Rerunning with the same output directory resumes.",
+    )
+    score.add_argument("source", type=Path, help="directory of images, or a text file with one path per line")
+    score.add_argument("--output", "-o", type=Path, required=True, help="directory for shards and checkpoint")
+    score.add_argument("--format", choices=("csv", "parquet"), default="csv")
+    score.add_argument("--shard-size", type=int, default=10000, help="rows per output shard")
+    score.add_argument("--batch-size", type=int, default=32, help="images per forward pass")
+    score.add_argument("--workers", type=int, default=None, help="decode threads (default: min(4, cores))")
+    score.add_argument("--model-path", default=None, help="model artifact (default: MODEL_PATH or exported model)")
+    score.add_argument("--backend", choices=("torch", "onnxruntime"), default=None)
+    score.add_argument("--log-every", type=float, default=10.0, help="seconds between progress lines")
+    score.set_defaults(func=_score)
+
+    metrics = commands.add_parser(
+        "metrics",
+        help="Recompute evaluation metrics from the prediction log",
+        description="Confusion matrix, per-class precision/recall, ROC AUC, average precision and "
+        "a threshold sweep from the logits stored by the evaluation stage; the model is not run.",
+    )
+    metrics.add_argument(
+        "prediction_log",
+        type=Path,
+        nargs="?",
+        default=Path("artifacts/evaluation/predictions.npz"),
+        help="prediction log written by the evaluation stage",
+    )
+    metrics.add_argument("--positive-class", default=None, help="class scored by the curves (default: Dusty)")
+    metrics.add_argument("--threshold", type=float, nargs="+", help="thresholds to sweep (default: 0.05..0.95)")
+    metrics.add_argument("--curves", action="store_true", help="include the full ROC and PR curves")
+    metrics.add_argument("--output", "-o", type=Path, default=None, help="write the JSON report here")
+    metrics.set_defaults(func=_metrics)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,10 @@
 import os
 from pathlib import Path
 import torch
-import torchvision.models as models
 import torch.nn as nn
 from solar_dust_detection import logger
 from solar_dust_detection.entity.config_entity import BaseModelConfig
+from solar_dust_detection.utils.model_registry import build_model, get_head, set_head
 
 
 
@@ -13,25 +13,21 @@ class BaseModel:
         self.config = config
     
     def get_base_model(self):
-        if self.config.params_weights == "imagenet":
-            weights = models.ResNet18_Weights.IMAGENET1K_V1
-        else:
-            weights = None
-        
-        self.model = models.resnet18(weights=weights)
+        architecture = self.config.params_architecture
+        self.model = build_model(architecture, pretrained=self.config.params_weights == "imagenet")
         self.save_model(path=self.config.base_model_path, model=self.model)
         logger.info(f"Base model saved at {self.config.root_dir}")
 
         for param in self.model.parameters():
             param.requires_grad = False
         
-        num_features = self.model.fc.in_features
+        num_features = get_head(self.model, architecture).in_features
         
-        self.model.fc = nn.Linear(num_features, self.config.params_classes)
+        set_head(self.model, architecture, nn.Linear(num_features, self.config.params_classes))
         
         self.save_model(path=self.config.updated_base_model_path, model=self.model)
         
-        logger.info(f"Updated model (classes={self.config.params_classes}) saved to {self.config.updated_base_model_path}")
+        logger.info(f"Updated {architecture} (classes={self.config.params_classes}) saved to {self.config.updated_base_model_path}")
     
     @staticmethod
     def save_model(path: Path, model: nn.Module):
@@ -1,36 +1,185 @@
+import hashlib
 import os
-import gdown
+import shutil
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import unquote, urlparse
+
 from solar_dust_detection import logger
 from solar_dust_detection.entity.config_entity import DataIngestionConfig
 from solar_dust_detection.utils.common import get_size
+from solar_dust_detection.utils.manifest import (
+    CHUNK_SIZE,
+    read_manifest,
+    sha256_file,
+    write_manifest,
+)
+
+
+def local_source(source: str) -> Optional[Path]:
+    """The local path for a `file://` URL or plain path source, else None."""
+    parsed = urlparse(source)
+    if parsed.scheme == "file":
+        return Path(unquote(parsed.path))
+    if len(parsed.scheme) <= 1:  # plain path, or one starting with a Windows drive letter
+        return Path(source)
+    return None
+
+
+def member_label(name: str) -> str:
+    """Class of an archive member laid out as `<dataset>/<class>/.../<file>` (or `<class>/<file>`)."""
+    parts = Path(name).parts
+    if len(parts) > 2:
+        return parts[1]
+    return parts[0] if len(parts) == 2 else ""
+
 
 class DataIngestion:
     def __init__(self, config: DataIngestionConfig):
         self.config = config
 
     def download_data(self) -> str:
-        """Download data from Google Drive."""
+        """Fetch the archive from Google Drive, or copy it from a local path / `file://` URL.
+
+        Nothing is fetched when `local_data_file` already matches `source_sha256`.
+        """
         try:
             dataset_url = self.config.source_URL
-            zip_download_dir = self.config.local_data_file
-            os.makedirs("artifacts/data_ingestion", exist_ok=True)
-            logger.info(f"Created directory at: artifacts/data_ingestion")
+            zip_download_dir = Path(self.config.local_data_file)
+            os.makedirs(zip_download_dir.parent, exist_ok=True)
+
+            expected = self.config.source_sha256
+            if expected and zip_download_dir.exists() and sha256_file(zip_download_dir) == expected:
+                logger.info(f"{zip_download_dir} matches the expected checksum; skipping download")
+                return str(zip_download_dir)
 
-            file_id = dataset_url.split("/")[-2]
-            prefix_url = "https://drive.google.com/uc?export=download&id="
-            gdown.download(prefix_url + file_id, str(zip_download_dir))
-            logger.info(f"Downloading data from {dataset_url} to {zip_download_dir}")
+            source = local_source(dataset_url)
+            if source is not None:
+                if source.resolve() != zip_download_dir.resolve():
+                    shutil.copyfile(source, zip_download_dir)
+                logger.info(f"Copied data from {source} to {zip_download_dir}")
+            else:
+                import gdown
+
+                file_id = dataset_url.split("/")[-2]
+                prefix_url = "https://drive.google.com/uc?export=download&id="
+                gdown.download(prefix_url + file_id, str(zip_download_dir))
+                logger.info(f"Downloading data from {dataset_url} to {zip_download_dir}")
+            return str(zip_download_dir)
 
         except Exception as e:
             logger.error(f"Error occurred while downloading data: {e}")
             raise e
 
-    def extract_zip_file(self) -> None:
-        """Extract the zip file to the specified directory."""
-        unzip_path = self.config.unzipped_data_dir
+    def verify_checksum(self) -> str:
+        """SHA-256 of the archive; raises ValueError if it differs from `source_sha256`."""
+        actual = sha256_file(self.config.local_data_file)
+        expected = self.config.source_sha256
+        if expected and actual != expected:
+            raise ValueError(
+                f"Checksum mismatch for {self.config.local_data_file}: expected {expected}, got {actual}"
+            )
+        logger.info(f"Archive {self.config.local_data_file} ({get_size(Path(self.config.local_data_file))}) sha256={actual}")
+        return actual
+
+    def _target(self, unzip_path: Path, name: str) -> Path:
+        target = (unzip_path / name).resolve()
+        if not target.is_relative_to(unzip_path.resolve()):
+            raise ValueError(f"Archive member {name!r} would extract outside {unzip_path}")
+        return target
+
+    def _is_current(self, member: zipfile.ZipInfo, entry: Optional[dict], target: Path) -> bool:
+        return (
+            entry is not None
+            and entry["size"] == member.file_size
+            and entry["crc32"] == member.CRC
+            and target.is_file()
+            and target.stat().st_size == member.file_size
+        )
+
+    def extract_zip_file(self, num_workers: Optional[int] = None) -> None:
+        """Extract the archive incrementally and write the manifest.
+
+        Members whose size and CRC match the previous manifest and whose file is still on
+        disk are skipped. The rest are streamed to disk in parallel (one ZipFile handle per
+        thread, 1MB chunks) and hashed on the way. Files from the previous manifest that are
+        no longer in the archive are removed.
+        """
+        unzip_path = Path(self.config.unzipped_data_dir)
+        manifest_path = Path(self.config.manifest_path)
         os.makedirs(unzip_path, exist_ok=True)
 
-        with zipfile.ZipFile(self.config.local_data_file, 'r') as zip_ref:
-            zip_ref.extractall(unzip_path)
-        logger.info(f"Extracted data to {unzip_path}")
\ No newline at end of file
+        archive_sha256 = self.verify_checksum()
+        previous = read_manifest(manifest_path) or {"files": []}
+        manifest_dir = manifest_path.parent.resolve()
+        previous_entries: Dict[str, dict] = {e["path"]: e for e in previous["files"]}
+
+        with zipfile.ZipFile(self.config.local_data_file, "r") as zip_ref:
+            members = [m for m in zip_ref.infolist() if not m.is_dir()]
+
+        entries: Dict[str, dict] = {}
+        todo: List[zipfile.ZipInfo] = []
+        for member in members:
+            target = self._target(unzip_path, member.filename)
+            key = os.path.relpath(target, manifest_dir)
+            if self._is_current(member, previous_entries.get(key), target):
+                entries[member.filename] = previous_entries[key]
+            else:
+                todo.append(member)
+
+        if todo:
+            local = threading.local()
+            handles: List[zipfile.ZipFile] = []
+            handles_lock = threading.Lock()
+
+            def extract(member: zipfile.ZipInfo) -> dict:
+                if not hasattr(local, "zip"):
+                    local.zip = zipfile.ZipFile(self.config.local_data_file, "r")
+                    with handles_lock:
+                        handles.append(local.zip)
+                target = self._target(unzip_path, member.filename)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp = target.with_name(target.name + ".part")
+                digest = hashlib.sha256()
+                with local.zip.open(member) as src, open(tmp, "wb") as dst:
+                    for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                        digest.update(chunk)
+                        dst.write(chunk)
+                os.replace(tmp, target)
+                return {
+                    "path": os.path.relpath(target, manifest_dir),
+                    "size": member.file_size,
+                    "sha256": digest.hexdigest(),
+                    "crc32": member.CRC,
+                    "label": member_label(member.filename),
+                }
+
+            try:
+                with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as pool:
+                    for member, entry in zip(todo, pool.map(extract, todo), strict=True):
+                        entries[member.filename] = entry
+            finally:
+                for handle in handles:
+                    handle.close()
+            logger.info(f"Extracted {len(todo)} of {len(members)} files to {unzip_path}")
+        else:
+            logger.info(f"{unzip_path} is up to date with the archive; skipping extraction")
+
+        current = {e["path"] for e in entries.values()}
+        for path in previous_entries.keys() - current:
+            stale = manifest_dir / path
+            if stale.is_file():
+                stale.unlink()
+                logger.info(f"Removed {stale}: no longer in the archive")
+
+        write_manifest(
+            manifest_path,
+            {
+                "archive_sha256": archive_sha256,
+                "files": sorted(entries.values(), key=lambda e: e["path"]),
+            },
+        )
+        logger.info(f"Wrote manifest of {len(entries)} files to {manifest_path}")
@@ -0,0 +1,115 @@
+import json
+import os
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from solar_dust_detection import logger
+from solar_dust_detection.entity.config_entity import DatasetCacheConfig
+from solar_dust_detection.utils.image_folder import image_folder
+from solar_dust_detection.utils.manifest import source_fingerprint
+from solar_dust_detection.utils.preprocessing import ImagePreprocessor
+
+
+def cache_key(image_size: Sequence[int]) -> str:
+    return f"{int(image_size[0])}x{int(image_size[1])}"
+
+
+class CachedImageDataset(Dataset):
+    """
+    ImageFolder-compatible dataset over a pre-decoded cache: item i is
+    `(CHW uint8 tensor, class index)` in the same order as `datasets.ImageFolder`,
+    so seeded `random_split`s select the same images as before.
+
+    `images.npy` is memory-mapped copy-on-write, so items are views into the page cache and
+    nothing is decoded at training time. The map is opened lazily per process, which keeps
+    the dataset cheap to pickle into DataLoader workers.
+    """
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = Path(cache_dir)
+        with open(self.cache_dir / "meta.json", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.classes = self.meta["classes"]
+        self.class_to_idx = {c: i for i, c in enumerate(self.classes)}
+        self.labels = np.load(self.cache_dir / "labels.npy")
+        self.targets = self.labels.tolist()
+        self._images: Optional[np.ndarray] = None
+
+    @classmethod
+    def open_if_fresh(cls, root_dir: Path, image_size: Sequence[int], source: Path):
+        """Return the cache for `image_size` if it was built from the current `source` tree."""
+        cache_dir = Path(root_dir) / cache_key(image_size)
+        if not (cache_dir / "meta.json").exists():
+            return None
+        dataset = cls(cache_dir)
+        if dataset.meta.get("source_fingerprint") != source_fingerprint(Path(source)):
+            logger.warning(f"Dataset cache {cache_dir} is stale; decoding images from {source}")
+            return None
+        logger.info(f"Using decoded dataset cache {cache_dir} ({len(dataset)} images)")
+        return dataset
+
+    @property
+    def images(self) -> np.ndarray:
+        if self._images is None:
+            self._images = np.load(self.cache_dir / "images.npy", mmap_mode="c")
+        return self._images
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_images"] = None
+        return state
+
+    def __getitem__(self, index):
+        return torch.from_numpy(self.images[index]), int(self.labels[index])
+
+    def __len__(self):
+        return len(self.labels)
+
+
+class DatasetCache:
+    def __init__(self, config: DatasetCacheConfig):
+        self.config = config
+        self.cache_dir = Path(self.config.root_dir) / cache_key(self.config.params_image_size[:-1])
+
+    def build(self, num_workers: Optional[int] = None) -> CachedImageDataset:
+        """Decode and resize every image once into `<root_dir>/<H>x<W>/images.npy`; returns the cache."""
+        folder = image_folder(self.config.training_data, self.config.data_manifest_path)
+        preprocessor = ImagePreprocessor(size=self.config.params_image_size[:-1])
+        height, width = preprocessor.size
+
+        # Build next to the final directory and swap it in, so readers never see half a cache.
+        staging = self.cache_dir.with_name(self.cache_dir.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        images = np.lib.format.open_memmap(
+            staging / "images.npy", mode="w+", dtype=np.uint8, shape=(len(folder), 3, height, width)
+        )
+
+        def write(index: int):
+            path, _ = folder.samples[index]
+            images[index] = preprocessor.load(path).numpy()
+
+        with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count() or 1) as pool:
+            list(pool.map(write, range(len(folder))))
+        images.flush()
+
+        np.save(staging / "labels.npy", np.asarray(folder.targets, dtype=np.int64))
+        meta = {
+            "classes": folder.classes,
+            "image_size": [height, width],
+            "samples": [os.path.relpath(p, self.config.training_data) for p, _ in folder.samples],
+            "source_fingerprint": source_fingerprint(Path(self.config.training_data)),
+        }
+        with open(staging / "meta.json", "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.replace(staging, self.cache_dir)
+        logger.info(f"Cached {len(folder)} decoded images at {self.cache_dir}")
+        return CachedImageDataset(self.cache_dir)
@@ -0,0 +1,55 @@
+import os
+from typing import Optional
+
+import torch
+from torch.utils.data import Dataset
+
+from solar_dust_detection import logger
+from solar_dust_detection.components.model_evaluation_mlflow import Evaluation
+from solar_dust_detection.entity.config_entity import ModelDistillationConfig
+from solar_dust_detection.utils.common import save_json
+from solar_dust_detection.utils.model_registry import model_from_state_dict
+from solar_dust_detection.utils.train_loop import latency_ms
+
+
+class DistillationEvaluation:
+    """
+    Accuracy gap and speedup of the distilled student against the trained model (teacher).
+
+    Both are scored with the same `Evaluation` loop on the evaluation stage's validation split
+    (its split manifest), and timed on a single-image batch.
+    """
+
+    def __init__(self, config: ModelDistillationConfig, evaluation: Evaluation):
+        self.config = config
+        self.evaluation = evaluation
+
+    def evaluate(self, state_dict: Optional[dict] = None, full_dataset: Optional[Dataset] = None):
+        evaluation = self.evaluation
+        teacher = evaluation.load_model(self.config.teacher_model_path, state_dict=state_dict)
+        student = model_from_state_dict(
+            torch.load(self.config.student_model_path, map_location=evaluation.device)
+        ).to(evaluation.device)
+        evaluation._valid_generator(full_dataset)
+
+        _, teacher_acc = evaluation.evaluate_model(teacher)
+        _, student_acc = evaluation.evaluate_model(student)
+        sample = next(iter(evaluation.valid_loader))[0][:1].to(evaluation.device)
+        teacher_ms, student_ms = latency_ms(teacher, sample), latency_ms(student, sample)
+        self.scores = {
+            "teacher_accuracy": teacher_acc,
+            "student_accuracy": student_acc,
+            "accuracy_gap": teacher_acc - student_acc,
+            "teacher_latency_ms_per_image": teacher_ms,
+            "student_latency_ms_per_image": student_ms,
+            "speedup": teacher_ms / student_ms,
+            "teacher_model_size_mb": os.path.getsize(self.config.teacher_model_path) / 2**20,
+            "student_model_size_mb": os.path.getsize(self.config.student_model_path) / 2**20,
+        }
+        logger.info(
+            f"Student: accuracy {student_acc:.4f} ({self.scores['accuracy_gap']:+.4f} behind), "
+            f"{self.scores['speedup']:.2f}x faster"
+        )
+
+    def save_scores(self):
+        save_json(path=self.config.comparison_path, data=self.scores)
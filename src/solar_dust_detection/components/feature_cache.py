@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn as nn
+from torch.utils.data import DataLoader
+
+from solar_dust_detection import logger
+
+
+def model_hash(model: nn.Module, exclude: Sequence[str] = ("fc.",)) -> str:
+    """Hash of every backbone tensor in `model.state_dict()`; the (retrained) head is excluded."""
+    digest = hashlib.sha256()
+    for name, tensor in model.state_dict().items():
+        if name.startswith(tuple(exclude)):
+            continue
+        digest.update(name.encode())
+        digest.update(tensor.detach().cpu().contiguous().numpy().tobytes())
+    return digest.hexdigest()
+
+
+def file_hash(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class FeatureCache:
+    """
+    On-disk cache of penultimate features (the input of the `head` Linear, `fc` for
+    ResNet18), one row per image content hash. With `head=None` it caches the model's own
+    outputs instead (e.g. a distillation teacher's logits).
+
+    `<root_dir>/<model hash>/<H>x<W>-v<views>/features.npy` holds a `(N, views, dim)` float32
+    array: view 0 is the un-augmented image, views 1.. are fixed augmented copies. Rows are
+    keyed by image content, so adding images only extracts features for the new ones, and a
+    different backbone, image size or view count lands in a different directory.
+    """
+
+    def __init__(
+        self,
+        root_dir: Path,
+        model: nn.Module,
+        image_size: Sequence[int],
+        views: int = 1,
+        head: Optional[str] = "fc",
+    ):
+        self.views = max(1, int(views))
+        self.head = head
+        self.cache_dir = (
+            Path(root_dir)
+            / model_hash(model, exclude=(f"{head}.",) if head else ())[:16]
+            / f"{int(image_size[0])}x{int(image_size[1])}-v{self.views}"
+        )
+
+    def _load(self):
+        keys_path = self.cache_dir / "keys.json"
+        if not keys_path.exists():
+            return [], None
+        with open(keys_path, encoding="utf-8") as f:
+            keys = json.load(f)
+        return keys, np.load(self.cache_dir / "features.npy", mmap_mode="r")
+
+    def _drop_head(self, model: nn.Module) -> Callable[[], None]:
+        """Swap the head for an Identity (a no-op when `head` is None); returns the undo."""
+        if self.head is None:
+            return lambda: None
+        parent_name, _, attr = self.head.rpartition(".")
+        parent = model.get_submodule(parent_name)
+        head = getattr(parent, attr)
+        setattr(parent, attr, nn.Identity())
+        return lambda: setattr(parent, attr, head)
+
+    @staticmethod
+    @torch.no_grad()
+    def extract(backbone: nn.Module, loader: DataLoader, device: str) -> torch.Tensor:
+        features = [backbone(images.to(device)).flatten(1).float().cpu() for images, _ in loader]
+        return torch.cat(features)
+
+    def get(
+        self,
+        model: nn.Module,
+        keys: List[str],
+        make_loader: Callable[[List[int], int], DataLoader],
+        device: str,
+        seed: int = 42,
+    ) -> torch.Tensor:
+        """
+        Features `(len(keys), views, dim)` for the images with content hashes `keys`.
+
+        Missing rows are computed by running `model` without its head (if any) over
+        `make_loader(indices, view)`, where `indices` are positions in `keys`.
+        """
+        cached_keys, cached = self._load()
+        row_of: Dict[str, int] = {k: i for i, k in enumerate(cached_keys)}
+        new_keys, indices, seen = [], [], set(row_of)
+        for i, key in enumerate(keys):
+            if key not in seen:
+                seen.add(key)
+                new_keys.append(key)
+                indices.append(i)
+
+        if new_keys:
+            logger.info(f"Extracting features for {len(indices)} images x {self.views} views into {self.cache_dir}")
+            restore_head = self._drop_head(model)
+            was_training = model.training
+            model.eval()
+            try:
+                views = []
+                for view in range(self.views):
+                    # Seeded per view so the augmented copies are fixed, not resampled per run.
+                    torch.manual_seed(seed + view)
+                    views.append(self.extract(model, make_loader(indices, view), device))
+            finally:
+                restore_head()
+                model.train(was_training)
+            self._save(cached_keys + new_keys, cached, torch.stack(views, dim=1).numpy())
+            cached_keys, cached = self._load()
+            row_of = {k: i for i, k in enumerate(cached_keys)}
+        else:
+            logger.info(f"Using feature cache {self.cache_dir} ({len(keys)} images)")
+
+        rows = [row_of[k] for k in keys]
+        return torch.from_numpy(np.ascontiguousarray(cached[rows]))
+
+    def _save(self, keys: List[str], cached: Optional[np.ndarray], new_features: np.ndarray):
+        # Same staging-then-swap as the decoded dataset cache: readers never see half a write.
+        staging = self.cache_dir.with_name(self.cache_dir.name + ".tmp")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+        features = new_features if cached is None else np.concatenate([cached, new_features])
+        np.save(staging / "features.npy", features.astype(np.float32, copy=False))
+        with open(staging / "keys.json", "w", encoding="utf-8") as f:
+            json.dump(keys, f)
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.replace(staging, self.cache_dir)
+
@@ -0,0 +1,187 @@
+import copy
+import warnings
+from pathlib import Path
+from typing import Optional
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+import torch.optim as optim
+from torch.utils.data import DataLoader, Dataset
+
+from solar_dust_detection import logger
+from solar_dust_detection.components.feature_cache import FeatureCache
+from solar_dust_detection.components.model_export import ModelExport
+from solar_dust_detection.components.model_training import MapDataset, Training
+from solar_dust_detection.entity.config_entity import ModelDistillationConfig
+from solar_dust_detection.utils.common import save_json
+from solar_dust_detection.utils.model_registry import build_model
+from solar_dust_detection.utils.train_loop import evaluate, to_device
+
+
+def distillation_loss(
+    student_logits: torch.Tensor,
+    teacher_logits: torch.Tensor,
+    labels: torch.Tensor,
+    temperature: float,
+    alpha: float,
+) -> torch.Tensor:
+    """`alpha` * T^2 * KL(teacher || student at temperature T) + (1 - alpha) * cross-entropy.
+
+    The T^2 factor keeps the softened targets' gradients on the scale of the hard-label term.
+    """
+    soft = F.kl_div(
+        F.log_softmax(student_logits / temperature, dim=1),
+        F.log_softmax(teacher_logits / temperature, dim=1),
+        reduction="batchmean",
+        log_target=True,
+    )
+    return alpha * temperature**2 * soft + (1 - alpha) * F.cross_entropy(student_logits, labels)
+
+
+class _WithPositions(Dataset):
+    """Yields `(image, position)` so a batch can look up its cached teacher logits."""
+
+    def __init__(self, dataset: Dataset):
+        self.dataset = dataset
+
+    def __getitem__(self, index):
+        return self.dataset[index][0], index
+
+    def __len__(self):
+        return len(self.dataset)
+
+
+class ModelDistillation:
+    """
+    Knowledge distillation of the trained model (teacher) into a smaller registry backbone.
+
+    The teacher's logits for the train split are computed once into a content-keyed cache
+    (FeatureCache without a head), so distillation epochs only run the student and reruns
+    with other DISTILL_* params never run the teacher. Cached logits are for the un-augmented
+    images, so the student trains on those. It is scored every epoch on the training stage's
+    validation split, and the best epoch is exported as a state_dict and a frozen TorchScript
+    module, both of which PredictionPipeline serves via MODEL_PATH.
+    """
+
+    def __init__(self, config: ModelDistillationConfig, training: Training):
+        self.config = config
+        self.training = training
+        self.device = training.device
+
+    def load_teacher(self, state_dict: Optional[dict] = None) -> nn.Module:
+        if state_dict is None:
+            state_dict = torch.load(self.config.teacher_model_path, map_location=self.device)
+        self.training.get_base_model(state_dict)
+        self.teacher = self.training.model.eval()
+        return self.teacher
+
+    def teacher_logits(self):
+        """Teacher logits `(N, classes)` and labels for the train split, from the logit cache."""
+        cache = FeatureCache(
+            self.config.teacher_logits_dir,
+            self.teacher,
+            self.config.params_image_size[:-1],
+            head=None,
+        )
+        keys, labels = self.training.train_sample_keys()
+        logits = cache.get(self.teacher, keys, self.training.train_view_loader, self.device)
+        return logits[:, 0], labels
+
+    def train(self):
+        training = self.training
+        teacher_logits, labels = self.teacher_logits()
+        teacher_logits, labels = teacher_logits.to(self.device), labels.to(self.device)
+        temperature, alpha = self.config.params_temperature, self.config.params_alpha
+
+        self.student = build_model(
+            self.config.params_student_architecture,
+            self.config.params_classes,
+            pretrained=self.config.params_weights == "imagenet",
+        ).to(self.device)
+        optimizer = optim.SGD(self.student.parameters(), lr=self.config.params_learning_rate)
+        # train_subset order is the order of `teacher_logits`.
+        loader = DataLoader(
+            _WithPositions(MapDataset(training.train_subset, training.val_transforms)),
+            batch_size=training.config.params_batch_size,
+            shuffle=True,
+            collate_fn=training.preprocessor.collate,
+            **training.loader_kwargs
+        )
+        validate = len(training.valid_loader.dataset) > 0
+        criterion = nn.CrossEntropyLoss()
+        best_val_loss, best_state = float("inf"), None
+
+        logger.info(f"Distilling into {self.config.params_student_architecture} on {self.device} "
+                    f"with {len(labels)} samples.")
+        for epoch in range(self.config.params_epochs):
+            self.student.train()
+            loss_sum = torch.zeros((), device=self.device)
+            correct = torch.zeros((), dtype=torch.long, device=self.device)
+            steps = 0
+            for images, positions in loader:
+                images, positions = to_device(images, positions, self.device)
+                optimizer.zero_grad(set_to_none=True)
+                outputs = self.student(images)
+                loss = distillation_loss(
+                    outputs, teacher_logits[positions], labels[positions], temperature, alpha
+                )
+                loss.backward()
+                optimizer.step()
+                loss_sum += loss.detach()
+                correct += (outputs.detach().argmax(1) == labels[positions]).sum()
+                steps += 1
+            message = (f"Epoch [{epoch+1}/{self.config.params_epochs}] "
+                       f"Distillation loss: {loss_sum.item() / max(1, steps):.4f} "
+                       f"Acc: {100 * correct.item() / max(1, len(labels)):.2f}%")
+
+            if validate:
+                self.student.eval()
+                val_loss, val_acc = evaluate(
+                    self.student, training.valid_loader, criterion, self.device
+                )
+                message += f" Val Loss: {val_loss:.4f} Val Acc: {100 * val_acc:.2f}%"
+                if val_loss < best_val_loss:
+                    best_val_loss, self.best_epoch = val_loss, epoch + 1
+                    best_state = copy.deepcopy(self.student.state_dict())
+            logger.info(message)
+
+        if best_state is not None:
+            self.student.load_state_dict(best_state)
+            logger.info(f"Best student epoch {self.best_epoch} (val loss {best_val_loss:.4f})")
+        self.student.eval()
+
+    def export(self, atol: float = 1e-4):
+        """Save the student's state_dict and a frozen TorchScript module, checking the two agree."""
+        student = self.student.to("cpu").eval()
+        Training._atomic_save(student.state_dict(), self.config.student_model_path)
+
+        height, width = self.config.params_image_size[:2]
+        example = torch.randn(2, 3, height, width)
+        with torch.no_grad(), warnings.catch_warnings():
+            warnings.simplefilter("ignore", FutureWarning)
+            frozen = torch.jit.freeze(torch.jit.trace(student, example))
+            ModelExport.save_torchscript(path=self.config.student_torchscript_path, model=frozen)
+            loaded = ModelExport.load_torchscript(self.config.student_torchscript_path)
+            diff = (loaded(example) - student(example)).abs().max().item()
+        if diff > atol:
+            raise RuntimeError(
+                f"Exported student diverges from eager model (max abs diff {diff:.2e} > {atol:.0e})"
+            )
+        logger.info(
+            f"Student saved to {self.config.student_model_path} and {self.config.student_torchscript_path}"
+        )
+
+        def count(model):
+            return sum(p.numel() for p in model.parameters())
+
+        save_json(
+            path=Path(self.config.scores_path),
+            data={
+                "student_architecture": self.config.params_student_architecture,
+                "teacher_params": count(self.teacher),
+                "student_params": count(student),
+                "student_model_size_mb": Path(self.config.student_model_path).stat().st_size / 2**20,
+                "best_epoch": getattr(self, "best_epoch", self.config.params_epochs),
+            },
+        )
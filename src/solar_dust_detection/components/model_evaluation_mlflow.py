@@ -1,15 +1,27 @@
 import os
 import torch
 import torch.nn as nn
-from torch.utils.data import DataLoader, Dataset, random_split
-from torchvision import transforms, datasets, models
+import torch.nn.functional as F
+from torch.utils.data import DataLoader, Dataset, Subset, random_split
 from pathlib import Path
-import mlflow
-import mlflow.pytorch
+from typing import Optional
 from urllib.parse import urlparse
-from dotenv import load_dotenv
+from solar_dust_detection.components.dataset_cache import CachedImageDataset
 from solar_dust_detection.entity.config_entity import EvaluationConfig
+from solar_dust_detection.utils.classification_metrics import classification_report
 from solar_dust_detection.utils.common import save_json
+from solar_dust_detection.utils.acceleration import SpeedOptions
+from solar_dust_detection.utils.data_loading import dataloader_kwargs
+from solar_dust_detection.utils.image_folder import image_folder
+from solar_dust_detection.utils.model_registry import build_model, get_architecture
+from solar_dust_detection.utils.prediction_log import (
+    load_prediction_log,
+    load_split,
+    save_prediction_log,
+    save_split,
+)
+from solar_dust_detection.utils.preprocessing import ImagePreprocessor
+from solar_dust_detection.utils.train_loop import evaluate, predict
 from solar_dust_detection import logger
 
 class MapDataset(Dataset):
@@ -30,8 +42,12 @@ class Evaluation:
     def __init__(self, config: EvaluationConfig):
         self.config = config
         self.device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
+        self.speed = SpeedOptions.from_config(config).resolve(torch.device(self.device).type)
+        self.speed.apply_threads()
 
     def _load_env(self):
+        from dotenv import load_dotenv
+
         for parent in Path(__file__).resolve().parents:
             env_path = parent / ".env"
             if env_path.exists():
@@ -39,90 +55,136 @@ class Evaluation:
                 return
         load_dotenv()
 
-    def _valid_generator(self):
+    def _valid_generator(self, full_dataset: Optional[CachedImageDataset] = None):
         # 1. Define Transforms
-        # Standard ImageNet normalization
-        normalize = transforms.Normalize(mean=[0.485, 0.456, 0.406],
-                                         std=[0.229, 0.224, 0.225])
-
-        val_transforms = transforms.Compose([
-            transforms.Resize(self.config.params_image_size[:-1]), # Resize to (224, 224)
-            transforms.ToTensor(),
-            normalize
-        ])
-
-        # 2. Load Data
-        full_dataset = datasets.ImageFolder(root=self.config.training_data)
-        
-        # 3. Create Split
-        torch.manual_seed(42) 
-        
-        val_size = int(len(full_dataset) * 0.30)
-        train_size = len(full_dataset) - val_size
-        
-        _, val_subset = random_split(full_dataset, [train_size, val_size])
+        # Standard ImageNet normalization, applied per batch by the collate function
+        preprocessor = ImagePreprocessor(size=self.config.params_image_size[:-1])
+        self.preprocessor = preprocessor
+
+        # 2. Load Data (pre-decoded cache when it matches the data directory)
+        if full_dataset is None:
+            full_dataset = CachedImageDataset.open_if_fresh(
+                self.config.dataset_cache_dir, self.config.params_image_size[:-1], self.config.training_data
+            )
+        transform = None
+        if full_dataset is None:
+            full_dataset = image_folder(
+                self.config.training_data, self.config.data_manifest_path, loader=preprocessor.decode
+            )
+            transform = preprocessor.load
+        self.sample_transform = transform
+        self.classes = list(full_dataset.classes)
+        self.sample_ids = self._sample_ids(full_dataset)
+
+        # 3. Create Split (the persisted index manifest while the sample list is unchanged)
+        split = load_split(self.config.split_manifest_path, self.sample_ids)
+        if split is None:
+            torch.manual_seed(42)
+
+            val_size = int(len(full_dataset) * 0.30)
+            train_size = len(full_dataset) - val_size
+
+            train_subset, val_subset = random_split(full_dataset, [train_size, val_size])
+            save_split(self.config.split_manifest_path, self.sample_ids, train_subset.indices, val_subset.indices)
+            logger.info(f"Split manifest saved to {self.config.split_manifest_path}")
+        else:
+            logger.info(f"Using split manifest {self.config.split_manifest_path}")
+            train_subset = Subset(full_dataset, split["train"])
+            val_subset = Subset(full_dataset, split["val"])
+
+        # The train part is never scored here; quantization calibrates on it.
+        self.train_subset = train_subset
+        self.val_indices = list(val_subset.indices)
 
         # 4. Apply Transforms
-        val_dataset = MapDataset(val_subset, val_transforms)
+        val_dataset = MapDataset(val_subset, transform)
 
         # 5. Create Loader
         self.valid_loader = DataLoader(
             val_dataset, 
             batch_size=self.config.params_batch_size, 
             shuffle=False,
-            num_workers=0 
+            collate_fn=preprocessor.collate,
+            **dataloader_kwargs(self.config, self.device)
         )
 
-    def load_model(self, path: Path) -> nn.Module:
+    def _sample_ids(self, dataset) -> list:
+        """Image paths relative to the data directory, in dataset order."""
+        if isinstance(dataset, CachedImageDataset):
+            return list(dataset.meta["samples"])
+        return [os.path.relpath(path, self.config.training_data) for path, _ in dataset.samples]
 
-        model = models.resnet18(weights=None)
-        num_features = model.fc.in_features
-        model.fc = nn.Linear(num_features, self.config.params_classes) 
+    def load_model(self, path: Path, state_dict: Optional[dict] = None) -> nn.Module:
+        """The trained model from `path`, or from `state_dict` when the weights are already in memory."""
+        model = build_model(self.config.params_architecture, self.config.params_classes)
         
         # Load weights
-        checkpoint = torch.load(path, map_location=self.device)
-        model.load_state_dict(checkpoint)
+        if state_dict is None:
+            state_dict = torch.load(path, map_location=self.device)
+        model.load_state_dict(state_dict)
         
         model.to(self.device)
         model.eval() 
         return model
 
-    def evaluation(self):
-        self.model = self.load_model(self.config.path_of_model)
-        self._valid_generator()
-        
-        criterion = nn.CrossEntropyLoss()
-        
-        running_loss = 0.0
-        correct = 0
-        total = 0
-
-        # No gradient needed for evaluation
-        with torch.no_grad():
-            for images, labels in self.valid_loader:
-                images, labels = images.to(self.device), labels.to(self.device)
-
-                outputs = self.model(images)
-                loss = criterion(outputs, labels)
-
-                running_loss += loss.item()
-                _, predicted = torch.max(outputs.data, 1)
-                total += labels.size(0)
-                correct += (predicted == labels).sum().item()
-
-        # Calculate averages
-        avg_loss = running_loss / len(self.valid_loader)
-        avg_acc = correct / total
-        
-        self.score = [avg_loss, avg_acc]
+    def evaluate_model(self, model: nn.Module, device=None) -> list:
+        """Return [mean loss, accuracy] of `model` on the validation loader."""
+        device = device or self.device
+        # Speed options apply to torch modules only (not e.g. the onnxruntime wrapper).
+        speed = self.speed if isinstance(model, nn.Module) else SpeedOptions()
+        forward = speed.prepare_model(model)
+        # Loss and correct counts stay on the device; they are read back once at the end.
+        avg_loss, avg_acc = evaluate(forward, self.valid_loader, nn.CrossEntropyLoss(), device, speed=speed)
+        return [avg_loss, avg_acc]
+
+    def log_predictions(self, model: nn.Module) -> list:
+        """Score the validation split once, write every sample's logits, label and path to
+        the prediction log, and return [mean loss, accuracy]."""
+        speed = self.speed if isinstance(model, nn.Module) else SpeedOptions()
+        logits, labels = predict(speed.prepare_model(model), self.valid_loader, self.device, speed=speed)
+        save_prediction_log(
+            self.config.prediction_log_path,
+            indices=self.val_indices,
+            paths=[self.sample_ids[i] for i in self.val_indices],
+            labels=labels.numpy(),
+            logits=logits.numpy(),
+            classes=self.classes,
+        )
+        logger.info(f"Prediction log saved to {self.config.prediction_log_path} ({len(labels)} samples)")
+        if not len(labels):
+            return [0.0, 0.0]
+        return [F.cross_entropy(logits, labels).item(), (logits.argmax(1) == labels).float().mean().item()]
+
+    def evaluation(self, state_dict: Optional[dict] = None, full_dataset: Optional[CachedImageDataset] = None):
+        self.model = self.load_model(self.config.path_of_model, state_dict=state_dict)
+        self._valid_generator(full_dataset)
+        self.score = self.log_predictions(self.model)
         self.save_score()
+        self.save_metrics()
+
+    def save_metrics(self):
+        """Confusion matrix, per-class precision/recall and threshold sweep from the prediction log."""
+        log = load_prediction_log(self.config.prediction_log_path)
+        if not len(log["label"]):
+            logger.warning("The validation split is empty; no metrics to report")
+            return
+        self.report = classification_report(log["logits"], log["label"], log["classes"])
+        save_json(path=Path(self.config.metrics_path), data=self.report)
 
     def save_score(self):
         scores = {"loss": self.score[0], "accuracy": self.score[1]}
         save_json(path=Path("scores.json"), data=scores)
         logger.info(f"Scores saved: {scores}")
 
+    def registered_model_name(self) -> str:
+        """MLflow registry name of the evaluated architecture, e.g. "ResNet18Model"."""
+        return f"{get_architecture(self.config.params_architecture).display_name}Model"
+
     def log_into_mlflow(self):
+        # mlflow is slow to import and only needed here, so runs without tracking skip it.
+        import mlflow
+        import mlflow.pytorch
+
         self._load_env()
         tracking_uri = os.getenv("MLFLOW_TRACKING_URI", self.config.mlflow_uri)
         mlflow.set_tracking_uri(tracking_uri)
@@ -153,9 +215,16 @@ class Evaluation:
             mlflow.log_metrics(
                 {"loss": self.score[0], "accuracy": self.score[1]}
             )
+            if getattr(self, "report", None):
+                mlflow.log_metrics(
+                    {"roc_auc": self.report["roc_auc"], "average_precision": self.report["average_precision"]}
+                )
+                mlflow.log_artifact(str(self.config.metrics_path))
             
             # Switch to mlflow.pytorch
             if tracking_url_type_store != "file":
-                mlflow.pytorch.log_model(self.model, "model", registered_model_name="ResNet18Model")
+                mlflow.pytorch.log_model(
+                    self.model, "model", registered_model_name=self.registered_model_name()
+                )
             else:
                 mlflow.pytorch.log_model(self.model, "model")
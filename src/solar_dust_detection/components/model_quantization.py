@@ -0,0 +1,120 @@
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from torch.utils.data import DataLoader, Dataset, Subset
+
+from solar_dust_detection import logger
+from solar_dust_detection.components.model_evaluation_mlflow import Evaluation, MapDataset
+from solar_dust_detection.entity.config_entity import ModelQuantizationConfig
+from solar_dust_detection.pipeline.backends import OnnxRuntimeModel
+from solar_dust_detection.utils.common import save_json
+from solar_dust_detection.utils.data_loading import dataloader_kwargs
+from solar_dust_detection.utils.train_loop import latency_ms
+
+
+class _LoaderCalibrationReader:
+    """Feeds calibration batches from a DataLoader to onnxruntime's quantizer."""
+
+    def __init__(self, loader: DataLoader, input_name: str):
+        self.batches = iter(loader)
+        self.input_name = input_name
+
+    def get_next(self):
+        batch = next(self.batches, None)
+        if batch is None:
+            return None
+        return {self.input_name: batch[0].numpy()}
+
+
+class ModelQuantization:
+    """
+    INT8 post-training static quantization of the exported ONNX model.
+
+    Activations are calibrated on images from the training part of the evaluation split, the
+    candidate is scored with the same `Evaluation` loop as the float model, and it is only
+    published to `quantized_model_path` if accuracy drops by at most `params_max_accuracy_drop`.
+    """
+
+    def __init__(self, config: ModelQuantizationConfig, evaluation: Evaluation):
+        self.config = config
+        self.evaluation = evaluation
+        self.device = "cpu"
+
+    def _calibration_loader(self) -> DataLoader:
+        train_subset = self.evaluation.train_subset
+        count = min(self.config.params_calibration_samples, len(train_subset))
+        calibration = MapDataset(Subset(train_subset, range(count)), self.evaluation.sample_transform)
+        return DataLoader(
+            calibration,
+            batch_size=self.evaluation.config.params_batch_size,
+            shuffle=False,
+            collate_fn=self.evaluation.preprocessor.collate,
+            **dataloader_kwargs(self.evaluation.config, self.device)
+        )
+
+    def quantize(self, full_dataset: Optional[Dataset] = None):
+        from onnxruntime.quantization import QuantFormat, QuantType, quantize_static
+        from onnxruntime.quantization.shape_inference import quant_pre_process
+
+        self.evaluation._valid_generator(full_dataset)
+        preprocessed_path = self.config.root_dir / "preprocessed.onnx"
+        quant_pre_process(str(self.config.onnx_model_path), str(preprocessed_path))
+
+        reader = _LoaderCalibrationReader(self._calibration_loader(), input_name="input")
+        quantize_static(
+            str(preprocessed_path),
+            str(self.config.candidate_model_path),
+            reader,
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+        )
+        preprocessed_path.unlink(missing_ok=True)
+        logger.info(f"Quantized candidate saved to {self.config.candidate_model_path}")
+
+    def evaluate(self, state_dict: Optional[dict] = None):
+        float_model = self.evaluation.load_model(
+            self.config.trained_model_path, state_dict=state_dict
+        ).to(self.device)
+        quantized_model = OnnxRuntimeModel(self.config.candidate_model_path)
+
+        float_loss, float_acc = self.evaluation.evaluate_model(float_model, device=self.device)
+        int8_loss, int8_acc = self.evaluation.evaluate_model(quantized_model, device=self.device)
+
+        sample = next(iter(self.evaluation.valid_loader))[0][:1]
+        self.scores = {
+            "float_accuracy": float_acc,
+            "int8_accuracy": int8_acc,
+            "accuracy_delta": int8_acc - float_acc,
+            "float_loss": float_loss,
+            "int8_loss": int8_loss,
+            # Both sizes are ONNX files, so the ratio is the quantization alone.
+            "float_model_size_mb": os.path.getsize(self.config.onnx_model_path) / 2**20,
+            "int8_model_size_mb": os.path.getsize(self.config.candidate_model_path) / 2**20,
+            "float_latency_ms_per_image": latency_ms(float_model, sample),
+            "int8_latency_ms_per_image": latency_ms(quantized_model, sample),
+            "max_accuracy_drop": self.config.params_max_accuracy_drop,
+        }
+
+    def publish(self):
+        """Promote the candidate if it passes the accuracy gate; always record the scores."""
+        drop = -self.scores["accuracy_delta"]
+        published = drop <= self.config.params_max_accuracy_drop
+        if published:
+            # Copy then rename so serving never sees a half-written model.
+            staging = Path(f"{self.config.quantized_model_path}.tmp")
+            shutil.copyfile(self.config.candidate_model_path, staging)
+            os.replace(staging, self.config.quantized_model_path)
+            logger.info(f"Quantized model published to {self.config.quantized_model_path}")
+        else:
+            # Never leave an older INT8 model next to scores that rejected the current one.
+            Path(self.config.quantized_model_path).unlink(missing_ok=True)
+            logger.warning(
+                f"Quantized model not published: accuracy drop {drop:.4f} exceeds "
+                f"QUANT_MAX_ACCURACY_DROP={self.config.params_max_accuracy_drop}"
+            )
+        self.scores["published"] = published
+        save_json(path=self.config.scores_path, data=self.scores)
@@ -1,16 +1,24 @@
 # Components update
 import os
 from pathlib import Path
+from typing import Optional
 import urllib.request as request
 from zipfile import ZipFile
 import torch
-import torchvision.models as models
 import torch.nn as nn
 import torch.optim as optim
-from torch.utils.data import DataLoader, Dataset, random_split
-from torchvision import transforms, datasets, models
+from torch.utils.data import DataLoader, Dataset, Subset, random_split
+from torchvision import transforms
 from solar_dust_detection import logger
+from solar_dust_detection.components.dataset_cache import CachedImageDataset
+from solar_dust_detection.components.feature_cache import FeatureCache, file_hash
 from solar_dust_detection.entity.config_entity import TrainingConfig
+from solar_dust_detection.utils.acceleration import SpeedOptions
+from solar_dust_detection.utils.data_loading import dataloader_kwargs
+from solar_dust_detection.utils.image_folder import image_folder
+from solar_dust_detection.utils.model_registry import build_model, get_architecture, get_head
+from solar_dust_detection.utils.preprocessing import ImagePreprocessor
+from solar_dust_detection.utils.train_loop import evaluate, train_epoch
 import time
 
 class MapDataset(Dataset):
@@ -32,44 +40,56 @@ class Training:
         self.config = config
         self.device = "cuda" if torch.cuda.is_available() else "mps" if torch.backends.mps.is_available() else "cpu"
         logger.info(f"Using device: {self.device}")
+        self.speed = SpeedOptions.from_config(config).resolve(torch.device(self.device).type)
+        self.speed.apply_threads()
+        if self.speed.describe():
+            logger.info(f"Speed options: {self.speed.describe()}")
 
-    def get_base_model(self):
-        self.model = models.resnet18(weights=None)
+    def get_base_model(self, state_dict: Optional[dict] = None):
+        """`state_dict` is the base model's weights when the caller already holds them in memory."""
+        self.model = build_model(self.config.params_architecture, self.config.params_classes)
         
-        num_features = self.model.fc.in_features
-        self.model.fc = nn.Linear(num_features, self.config.params_classes)
+        if state_dict is None:
+            state_dict = torch.load(self.config.updated_base_model_path, map_location=self.device)
+        self.model.load_state_dict(state_dict)
         
-        checkpoint = torch.load(self.config.updated_base_model_path, map_location=self.device)
-        self.model.load_state_dict(checkpoint)
-        
-        # 4. Move to GPU/CPU
+        # 4. Move to GPU/CPU; `forward_model` may be a compiled wrapper around `self.model`
         self.model.to(self.device)
+        self.forward_model = self.speed.prepare_model(self.model)
         
-    def train_valid_generator(self):
-        
-        normalize = transforms.Normalize(mean=[0.485, 0.456, 0.406],
-                                         std=[0.229, 0.224, 0.225])
-
-        val_transforms = transforms.Compose([
-            transforms.Resize(self.config.params_image_size[:-1]), # Resize to (224, 224)
-            transforms.ToTensor(),
-            normalize
-        ])
-
-        if self.config.params_is_augmentation:
-            train_transforms = transforms.Compose([
-                transforms.Resize(self.config.params_image_size[:-1]),
-                transforms.RandomRotation(40),
-                transforms.RandomHorizontalFlip(),
-                transforms.RandomAffine(degrees=0, translate=(0.2, 0.2), shear=0.2),
-                transforms.ToTensor(),
-                normalize
-            ])
+    def train_valid_generator(self, full_dataset: Optional[CachedImageDataset] = None):
+        """`full_dataset` is a decoded cache the caller just built; without one it is opened from disk."""
+        # Samples stay uint8 until collate, which normalizes the whole batch in one op.
+        preprocessor = ImagePreprocessor(size=self.config.params_image_size[:-1])
+        augmentations = [
+            transforms.RandomRotation(40),
+            transforms.RandomHorizontalFlip(),
+            transforms.RandomAffine(degrees=0, translate=(0.2, 0.2), shear=0.2),
+        ]
+
+        # A fresh decoded cache yields resized uint8 tensors: only the augmentations run per epoch.
+        if full_dataset is None:
+            full_dataset = CachedImageDataset.open_if_fresh(
+                self.config.dataset_cache_dir, self.config.params_image_size[:-1], self.config.training_data
+            )
+        if full_dataset is not None:
+            val_transforms = None
+            train_transforms = transforms.Compose(augmentations) if self.config.params_is_augmentation else None
         else:
-            train_transforms = val_transforms       
+            val_transforms = preprocessor.load
+            if self.config.params_is_augmentation:
+                train_transforms = transforms.Compose([
+                    transforms.Resize(self.config.params_image_size[:-1]),
+                    *augmentations,
+                    preprocessor.to_uint8,
+                ])
+            else:
+                train_transforms = val_transforms       
 
-        # ImageFolder expects structure: data/class_a/img1.jpg, data/class_b/img2.jpg
-        full_dataset = datasets.ImageFolder(root=self.config.training_data)
+            # ImageFolder expects structure: data/class_a/img1.jpg, data/class_b/img2.jpg
+            full_dataset = image_folder(
+                self.config.training_data, self.config.data_manifest_path, loader=preprocessor.decode
+            )
         
         torch.manual_seed(42) 
        
@@ -80,69 +100,275 @@ class Training:
 
         train_dataset = MapDataset(train_subset, train_transforms)
         val_dataset = MapDataset(val_subset, val_transforms)
+        loader_kwargs = dataloader_kwargs(self.config, self.device)
+        logger.info(f"DataLoader settings: {loader_kwargs}")
+
+        # Kept for the feature-cache path, which re-reads the train split with fixed views.
+        self.preprocessor = preprocessor
+        self.train_subset = train_subset
+        self.valid_subset = val_subset
+        self.train_transforms = train_transforms
+        self.val_transforms = val_transforms
+        self.loader_kwargs = loader_kwargs
 
         self.train_loader = DataLoader(
             train_dataset, 
             batch_size=self.config.params_batch_size, 
             shuffle=True, 
-            num_workers=0 
+            collate_fn=preprocessor.collate,
+            **loader_kwargs
         )
         
         self.valid_loader = DataLoader(
             val_dataset, 
             batch_size=self.config.params_batch_size, 
             shuffle=False,
-            num_workers=0
+            collate_fn=preprocessor.collate,
+            **loader_kwargs
         )
 
     @staticmethod
     def save_model(path: Path, model: nn.Module):
         torch.save(model.state_dict(), path)
 
-    def train(self):
-        # 1. Define Loss and Optimizer
-        criterion = nn.CrossEntropyLoss()
-        optimizer = optim.SGD(self.model.parameters(), lr=self.config.params_learning_rate)
+    @staticmethod
+    def _atomic_save(obj, path: Path):
+        # A crash mid-write leaves the previous file intact instead of a truncated one.
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        torch.save(obj, tmp)
+        os.replace(tmp, path)
+
+    def _run_fingerprint(self) -> dict:
+        """Settings a checkpoint must match to be resumed (EPOCHS and patience may change)."""
+        return {
+            "base_model": file_hash(self.config.updated_base_model_path),
+            "learning_rate": self.config.params_learning_rate,
+            "batch_size": self.config.params_batch_size,
+            "augmentation": self.config.params_is_augmentation,
+            "image_size": list(self.config.params_image_size),
+            "classes": self.config.params_classes,
+            # Head-only and full training checkpoints are not interchangeable.
+            "feature_cache": self.config.params_feature_cache,
+        }
 
-        print(f"Training on {self.device} with {len(self.train_loader.dataset)} samples.")
+    def load_checkpoint(self, optimizer: optim.Optimizer):
+        """Restore model, optimizer and RNG state from `checkpoint_path`; returns the saved
+        progress dict, or None when there is no checkpoint for this run."""
+        path = Path(self.config.checkpoint_path)
+        if not path.exists():
+            return None
+        checkpoint = torch.load(path, map_location=self.device, weights_only=False)
+        if checkpoint.get("fingerprint") != self._run_fingerprint():
+            logger.info(f"Ignoring {path}: it was written with different training settings")
+            return None
+        self.model.load_state_dict(checkpoint["model"])
+        optimizer.load_state_dict(checkpoint["optimizer"])
+        torch.set_rng_state(checkpoint["rng_state"].cpu())
+        logger.info(f"Resuming from {path} after epoch {checkpoint['epoch']}")
+        return checkpoint["progress"]
 
-        # 2. The Training Loop 
-        for epoch in range(self.config.params_epochs):
-            self.model.train() 
-            running_loss = 0.0
-            correct = 0
-            total = 0
+    def save_checkpoint(self, optimizer: optim.Optimizer, epoch: int, progress: dict):
+        self._atomic_save(
+            {
+                "epoch": epoch,
+                "model": self.model.state_dict(),
+                "optimizer": optimizer.state_dict(),
+                "rng_state": torch.get_rng_state(),
+                "fingerprint": self._run_fingerprint(),
+                "progress": progress,
+            },
+            self.config.checkpoint_path,
+        )
+
+    def train_sample_keys(self):
+        """Content hashes and labels of the train split's images, in `train_subset` order."""
+        return self._sample_keys(self.train_subset)
+
+    def valid_sample_keys(self):
+        """Content hashes and labels of the validation split's images, in `valid_subset` order."""
+        return self._sample_keys(self.valid_subset)
+
+    def _sample_keys(self, subset: Subset):
+        # random_split indices point into an ImageFolder-ordered dataset (the decoded cache keeps that order).
+        folder = image_folder(self.config.training_data, self.config.data_manifest_path)
+        samples = folder.samples
+        indices = subset.indices
+        # The ingestion manifest already has content hashes; without one, hash the files.
+        hashes = getattr(folder, "sha256", None)
+        keys = [hashes[i] if hashes else file_hash(samples[i][0]) for i in indices]
+        labels = torch.tensor([samples[i][1] for i in indices])
+        return keys, labels
 
-            # --- Batch Loop ---
-            for images, labels in self.train_loader:
-                images, labels = images.to(self.device), labels.to(self.device)
+    def train_view_loader(self, positions, view: int = 0, shuffle: bool = False) -> DataLoader:
+        """Loader over the train split at `positions`: view 0 is validation-style, other views
+        use the training transforms."""
+        transform = self.val_transforms if view == 0 else self.train_transforms
+        return self._view_loader(self.train_subset, positions, transform, shuffle)
 
-                # Zero gradients
-                optimizer.zero_grad()
+    def valid_view_loader(self, positions, view: int = 0) -> DataLoader:
+        """Loader over the validation split at `positions` (only the un-augmented view 0)."""
+        return self._view_loader(self.valid_subset, positions, self.val_transforms)
 
-                # Forward pass
-                outputs = self.model(images)
-                loss = criterion(outputs, labels)
+    def _view_loader(self, split: Subset, positions, transform, shuffle: bool = False) -> DataLoader:
+        subset = Subset(split.dataset, [split.indices[p] for p in positions])
+        return DataLoader(
+            MapDataset(subset, transform),
+            batch_size=self.config.params_batch_size,
+            shuffle=shuffle,
+            collate_fn=self.preprocessor.collate,
+            **self.loader_kwargs
+        )
 
-                # Backward pass and optimize
-                loss.backward()
-                optimizer.step()
+    def cached_train_features(self):
+        """
+        Backbone features `(N, views, dim)` and labels for the train split, from the feature cache.
 
-                # Metrics
-                running_loss += loss.item()
-                _, predicted = torch.max(outputs.data, 1)
-                total += labels.size(0)
-                correct += (predicted == labels).sum().item()
+        View 0 is the validation-style (un-augmented) image; with AUGMENTATION on, views
+        1..FEATURE_CACHE_VIEWS-1 are fixed augmented copies.
+        """
+        views = self.config.params_feature_cache_views if self.config.params_is_augmentation else 1
+        cache = FeatureCache(
+            self.config.feature_cache_dir,
+            self.model,
+            self.config.params_image_size[:-1],
+            views=views,
+            head=get_architecture(self.config.params_architecture).head,
+        )
+        keys, labels = self.train_sample_keys()
+        return cache.get(self.model, keys, self.train_view_loader, self.device), labels
 
-            # --- Epoch Metrics ---
-            epoch_acc = 100 * correct / total
-            logger.info(f"Epoch [{epoch+1}/{self.config.params_epochs}] "
-                  f"Loss: {running_loss/len(self.train_loader):.4f} "
-                  f"Acc: {epoch_acc:.2f}%")
+    def cached_valid_features(self):
+        """Un-augmented backbone features `(N, 1, dim)` and labels for the validation split."""
+        cache = FeatureCache(
+            self.config.feature_cache_dir,
+            self.model,
+            self.config.params_image_size[:-1],
+            head=get_architecture(self.config.params_architecture).head,
+        )
+        keys, labels = self.valid_sample_keys()
+        return cache.get(self.model, keys, self.valid_view_loader, self.device), labels
 
+    def head_on_features(self, criterion: nn.Module):
+        """
+        Optimizer, epoch and validation callables that train only the head on cached backbone
+        features; each epoch samples one view per image, and validation scores the head on
+        the validation split's cached un-augmented features.
+        """
+        features, labels = self.cached_train_features()
+        features, labels = features.to(self.device), labels.to(self.device)
+        head = get_head(self.model, self.config.params_architecture)
+        optimizer = optim.SGD(head.parameters(), lr=self.config.params_learning_rate)
+        batch_size = self.config.params_batch_size
+        num_samples, num_views = features.shape[:2]
+        if len(self.valid_subset):
+            valid_features, valid_labels = self.cached_valid_features()
+            valid_features, valid_labels = valid_features[:, 0].to(self.device), valid_labels.to(self.device)
 
-        self.save_model(
-            path=self.config.trained_model_path,
-            model=self.model
+        logger.info(
+            f"Training the head on {self.device} with {num_samples} cached feature rows x {num_views} views."
         )
-        logger.info(f"Model saved to {self.config.trained_model_path}")
\ No newline at end of file
+
+        def run_epoch(epoch: int):
+            order = torch.randperm(num_samples, device=self.device)
+            view = torch.randint(num_views, (num_samples,), device=self.device)
+            batches = (
+                (features[batch, view[batch]], labels[batch])
+                for batch in order.split(batch_size)
+            )
+            return train_epoch(
+                head,
+                batches,
+                criterion,
+                optimizer,
+                self.device,
+                log_every=self.config.params_log_every_n_steps,
+                epoch=epoch + 1,
+            )
+
+        def run_validation():
+            batches = (
+                (valid_features[batch], valid_labels[batch])
+                for batch in torch.arange(len(valid_labels), device=self.device).split(batch_size)
+            )
+            return evaluate(head, batches, criterion, self.device)
+
+        return optimizer, run_epoch, run_validation
+
+    def train(self):
+        # 1. Define Loss and Optimizer (with FEATURE_CACHE only the head trains, on cached features)
+        criterion = nn.CrossEntropyLoss()
+        if self.config.params_feature_cache:
+            optimizer, run_epoch, run_validation = self.head_on_features(criterion)
+        else:
+            optimizer = optim.SGD(self.model.parameters(), lr=self.config.params_learning_rate)
+
+            def run_epoch(epoch: int):
+                return train_epoch(
+                    self.forward_model,
+                    self.train_loader,
+                    criterion,
+                    optimizer,
+                    self.device,
+                    log_every=self.config.params_log_every_n_steps,
+                    epoch=epoch + 1,
+                    speed=self.speed,
+                )
+
+            def run_validation():
+                return evaluate(
+                    self.forward_model, self.valid_loader, criterion, self.device, speed=self.speed
+                )
+
+            print(f"Training on {self.device} with {len(self.train_loader.dataset)} samples.")
+
+        # 2. Resume from the last checkpoint of an interrupted run with the same settings
+        progress = self.load_checkpoint(optimizer) or {
+            "epoch": 0,
+            "best_epoch": 0,
+            "best_val_loss": float("inf"),
+            "epochs_without_improvement": 0,
+        }
+        best_path = Path(self.config.checkpoint_path).with_name("best_model.pt")
+        validate = len(self.valid_loader.dataset) > 0
+        patience = self.config.params_early_stopping_patience
+        every = max(1, self.config.params_checkpoint_every_n_epochs)
+
+        # 3. The Training Loop (metrics accumulate on the device; one read-back per epoch)
+        for epoch in range(progress["epoch"], self.config.params_epochs):
+            epoch_loss, epoch_acc = run_epoch(epoch)
+            message = (f"Epoch [{epoch+1}/{self.config.params_epochs}] "
+                       f"Loss: {epoch_loss:.4f} "
+                       f"Acc: {100 * epoch_acc:.2f}%")
+
+            # --- Validation / early stopping on validation loss ---
+            stop = False
+            if validate:
+                self.model.eval()
+                val_loss, val_acc = run_validation()
+                message += f" Val Loss: {val_loss:.4f} Val Acc: {100 * val_acc:.2f}%"
+                if val_loss < progress["best_val_loss"]:
+                    progress.update(best_epoch=epoch + 1, best_val_loss=val_loss, epochs_without_improvement=0)
+                    self._atomic_save(self.model.state_dict(), best_path)
+                else:
+                    progress["epochs_without_improvement"] += 1
+                    stop = bool(patience) and progress["epochs_without_improvement"] >= patience
+            logger.info(message)
+
+            progress["epoch"] = epoch + 1
+            if (epoch + 1) % every == 0 or stop:
+                self.save_checkpoint(optimizer, epoch + 1, progress)
+            if stop:
+                logger.info(f"Early stopping: no validation loss improvement for {patience} epochs")
+                break
+
+        # 4. Export the best epoch's weights (the last epoch's when there is no validation split)
+        if validate and best_path.exists():
+            self.model.load_state_dict(torch.load(best_path, map_location=self.device))
+            logger.info(f"Best epoch {progress['best_epoch']} (val loss {progress['best_val_loss']:.4f})")
+        self._atomic_save(self.model.state_dict(), self.config.trained_model_path)
+        logger.info(f"Model saved to {self.config.trained_model_path}")
+
+        # A finished run leaves nothing to resume.
+        Path(self.config.checkpoint_path).unlink(missing_ok=True)
+        best_path.unlink(missing_ok=True)
\ No newline at end of file
@@ -1,5 +1,5 @@
 from solar_dust_detection.constants import *
-from solar_dust_detection.entity.config_entity import DataIngestionConfig, BaseModelConfig, TrainingConfig, EvaluationConfig
+from solar_dust_detection.entity.config_entity import DataIngestionConfig, DatasetCacheConfig, BaseModelConfig, TrainingConfig, EvaluationConfig, ModelDistillationConfig, ModelExportConfig, ModelQuantizationConfig
 from solar_dust_detection.utils.common import read_yaml, create_directories
 from pathlib import Path
 import os
@@ -23,9 +23,24 @@ class ConfigurationManager:
             source_URL=config.source_URL,
             local_data_file=Path(config.local_data_file),
             unzipped_data_dir=Path(config.unzipped_data_dir),
+            source_sha256=config.source_sha256 or "",
+            manifest_path=Path(config.manifest_path),
         )
         return data_ingestion_config
     
+    def get_dataset_cache_config(self) -> DatasetCacheConfig:
+        config = self.config.dataset_cache
+
+        create_directories([Path(config.root_dir)])
+
+        dataset_cache_config = DatasetCacheConfig(
+            root_dir=Path(config.root_dir),
+            training_data=Path(self.config.data_ingestion.unzipped_data_dir) / "Detect_solar_dust",
+            data_manifest_path=Path(self.config.data_ingestion.manifest_path),
+            params_image_size=self.params.IMAGE_SIZE,
+        )
+        return dataset_cache_config
+    
     def get_base_model_config(self) -> BaseModelConfig:
         config = self.config.base_model
         
@@ -39,6 +54,7 @@ class ConfigurationManager:
             params_learning_rate=self.params.LEARNING_RATE,
             params_weights=self.params.WEIGHTS,
             params_classes=self.params.CLASSES,
+            params_architecture=self.params.ARCHITECTURE,
         )
         
         return base_model_config
@@ -64,24 +80,120 @@ class ConfigurationManager:
             trained_model_path=trained_model_path,
             updated_base_model_path=updated_base_model_path,
             training_data=training_data,
+            data_manifest_path=Path(self.config.data_ingestion.manifest_path),
             params_epochs=params_epochs,
             params_batch_size=params_batch_size,
             params_is_augmentation=params_is_augmentation,
             params_image_size=params_image_size,
             params_learning_rate=params_learning_rate,
             params_classes=params_classes,
+            params_architecture=self.params.ARCHITECTURE,
+            dataset_cache_dir=Path(self.config.dataset_cache.root_dir),
+            params_num_workers=self.params.NUM_WORKERS,
+            params_prefetch_factor=self.params.PREFETCH_FACTOR,
+            params_persistent_workers=self.params.PERSISTENT_WORKERS,
+            params_pin_memory=self.params.PIN_MEMORY,
+            feature_cache_dir=Path(training_config.feature_cache_dir),
+            params_feature_cache=self.params.FEATURE_CACHE,
+            params_feature_cache_views=self.params.FEATURE_CACHE_VIEWS,
+            params_log_every_n_steps=self.params.LOG_EVERY_N_STEPS,
+            checkpoint_path=Path(training_config.checkpoint_path),
+            params_checkpoint_every_n_epochs=self.params.CHECKPOINT_EVERY_N_EPOCHS,
+            params_early_stopping_patience=self.params.EARLY_STOPPING_PATIENCE,
+            params_bf16=self.params.BF16,
+            params_channels_last=self.params.CHANNELS_LAST,
+            params_compile=self.params.COMPILE,
+            params_intra_op_threads=self.params.INTRA_OP_THREADS,
+            params_inter_op_threads=self.params.INTER_OP_THREADS,
         )
 
         return training_config
     
     def get_evaluation_config(self) -> EvaluationConfig:
+        config = self.config.evaluation
+
+        create_directories([Path(config.root_dir)])
+
         eval_config = EvaluationConfig(
+            root_dir= Path(config.root_dir),
             path_of_model= "artifacts/training/model.pt",
+            prediction_log_path= Path(config.prediction_log_path),
+            split_manifest_path= Path(config.split_manifest_path),
+            metrics_path= Path(config.metrics_path),
             training_data= "artifacts/data_ingestion/Detect_solar_dust",
+            data_manifest_path= Path(self.config.data_ingestion.manifest_path),
+            dataset_cache_dir= Path(self.config.dataset_cache.root_dir),
             all_params = self.params,
             mlflow_uri= "https://dagshub.com/Arash-keshavarz/end-to-end-solar-dust-detection.mlflow",
             params_image_size = self.params.IMAGE_SIZE,
             params_batch_size = self.params.BATCH_SIZE,
-            params_classes= self.params.CLASSES
+            params_classes= self.params.CLASSES,
+            params_architecture= self.params.ARCHITECTURE,
+            params_num_workers= self.params.NUM_WORKERS,
+            params_prefetch_factor= self.params.PREFETCH_FACTOR,
+            params_persistent_workers= self.params.PERSISTENT_WORKERS,
+            params_pin_memory= self.params.PIN_MEMORY,
+            params_bf16= self.params.BF16,
+            params_channels_last= self.params.CHANNELS_LAST,
+            params_compile= self.params.COMPILE,
+            params_intra_op_threads= self.params.INTRA_OP_THREADS,
+            params_inter_op_threads= self.params.INTER_OP_THREADS
+        )
+        return eval_config
+    
+    def get_model_export_config(self) -> ModelExportConfig:
+        config = self.config.model_export
+
+        create_directories([Path(config.root_dir)])
+
+        model_export_config = ModelExportConfig(
+            root_dir=Path(config.root_dir),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            torchscript_model_path=Path(config.torchscript_model_path),
+            onnx_model_path=Path(config.onnx_model_path),
+            params_image_size=self.params.IMAGE_SIZE,
+            params_classes=self.params.CLASSES,
+            params_architecture=self.params.ARCHITECTURE,
+        )
+        return model_export_config
+    
+    def get_model_distillation_config(self) -> ModelDistillationConfig:
+        config = self.config.model_distillation
+
+        create_directories([Path(config.root_dir)])
+
+        model_distillation_config = ModelDistillationConfig(
+            root_dir=Path(config.root_dir),
+            teacher_model_path=Path(self.config.training.trained_model_path),
+            teacher_logits_dir=Path(config.teacher_logits_dir),
+            student_model_path=Path(config.student_model_path),
+            student_torchscript_path=Path(config.student_torchscript_path),
+            scores_path=Path(config.scores_path),
+            comparison_path=Path(config.comparison_path),
+            params_student_architecture=self.params.DISTILL_STUDENT,
+            params_weights=self.params.WEIGHTS,
+            params_epochs=self.params.DISTILL_EPOCHS,
+            params_learning_rate=self.params.DISTILL_LEARNING_RATE,
+            params_temperature=self.params.DISTILL_TEMPERATURE,
+            params_alpha=self.params.DISTILL_ALPHA,
+            params_image_size=self.params.IMAGE_SIZE,
+            params_classes=self.params.CLASSES,
+        )
+        return model_distillation_config
+
+    def get_model_quantization_config(self) -> ModelQuantizationConfig:
+        config = self.config.model_quantization
+
+        create_directories([Path(config.root_dir)])
+
+        model_quantization_config = ModelQuantizationConfig(
+            root_dir=Path(config.root_dir),
+            trained_model_path=Path(self.config.training.trained_model_path),
+            onnx_model_path=Path(self.config.model_export.onnx_model_path),
+            candidate_model_path=Path(config.candidate_model_path),
+            quantized_model_path=Path(config.quantized_model_path),
+            scores_path=Path(config.scores_path),
+            params_calibration_samples=self.params.QUANT_CALIBRATION_SAMPLES,
+            params_max_accuracy_drop=self.params.QUANT_MAX_ACCURACY_DROP,
         )
-        return eval_config
\ No newline at end of file
+        return model_quantization_config
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List
+from typing import List, Union
 
 @dataclass(frozen=True)
 class DataIngestionConfig:
@@ -8,6 +8,16 @@ class DataIngestionConfig:
     source_URL: str
     local_data_file: Path
     unzipped_data_dir: Path
+    source_sha256: str
+    manifest_path: Path
+    
+    
+@dataclass(frozen=True)
+class DatasetCacheConfig:
+    root_dir: Path
+    training_data: Path
+    data_manifest_path: Path
+    params_image_size: list
     
     
 @dataclass(frozen=True)
@@ -21,6 +31,7 @@ class BaseModelConfig:
     params_learning_rate: float
     params_weights: str
     params_classes: int
+    params_architecture: str
     
     
 
@@ -30,6 +41,7 @@ class TrainingConfig:
     trained_model_path: Path
     updated_base_model_path: Path
     training_data: Path
+    data_manifest_path: Path
     
     # Training hyperparameters
     params_epochs: int
@@ -38,15 +50,106 @@ class TrainingConfig:
     params_image_size: list
     params_learning_rate: float
     params_classes: int
+    params_architecture: str
+    dataset_cache_dir: Path
+    
+    # DataLoader settings ("auto" resolves at runtime)
+    params_num_workers: Union[int, str]
+    params_prefetch_factor: int
+    params_persistent_workers: bool
+    params_pin_memory: Union[bool, str]
+
+    # Frozen-backbone feature cache (train only the head on cached penultimate features)
+    feature_cache_dir: Path
+    params_feature_cache: bool
+    params_feature_cache_views: int
+
+    # Progress log (and device read-back) every N steps; 0 logs once per epoch
+    params_log_every_n_steps: int
+
+    # Resumable checkpoints and early stopping on validation loss (patience 0 disables it)
+    checkpoint_path: Path
+    params_checkpoint_every_n_epochs: int
+    params_early_stopping_patience: int
+
+    # Opt-in CPU speed features (utils.acceleration); threads 0 keeps torch's default
+    params_bf16: bool
+    params_channels_last: bool
+    params_compile: bool
+    params_intra_op_threads: int
+    params_inter_op_threads: int
     
     
 
 @dataclass(frozen=True)
 class EvaluationConfig:
+    root_dir: Path
     path_of_model: Path
+    prediction_log_path: Path
+    split_manifest_path: Path
+    metrics_path: Path
     training_data: Path
+    data_manifest_path: Path
+    dataset_cache_dir: Path
     all_params: dict
     mlflow_uri: str
     params_image_size: list
     params_batch_size: int
-    params_classes: int
\ No newline at end of file
+    params_classes: int
+    params_architecture: str
+    params_num_workers: Union[int, str]
+    params_prefetch_factor: int
+    params_persistent_workers: bool
+    params_pin_memory: Union[bool, str]
+    params_bf16: bool
+    params_channels_last: bool
+    params_compile: bool
+    params_intra_op_threads: int
+    params_inter_op_threads: int
+    
+    
+
+@dataclass(frozen=True)
+class ModelExportConfig:
+    root_dir: Path
+    trained_model_path: Path
+    torchscript_model_path: Path
+    onnx_model_path: Path
+    params_image_size: list
+    params_classes: int
+    params_architecture: str
+    
+    
+
+@dataclass(frozen=True)
+class ModelDistillationConfig:
+    root_dir: Path
+    teacher_model_path: Path
+    teacher_logits_dir: Path
+    student_model_path: Path
+    student_torchscript_path: Path
+    scores_path: Path
+    comparison_path: Path
+
+    # Student network and knowledge-distillation loss
+    params_student_architecture: str
+    params_weights: str
+    params_epochs: int
+    params_learning_rate: float
+    params_temperature: float
+    params_alpha: float
+    params_image_size: list
+    params_classes: int
+
+
+
+@dataclass(frozen=True)
+class ModelQuantizationConfig:
+    root_dir: Path
+    trained_model_path: Path
+    onnx_model_path: Path
+    candidate_model_path: Path
+    quantized_model_path: Path
+    scores_path: Path
+    params_calibration_samples: int
+    params_max_accuracy_drop: float
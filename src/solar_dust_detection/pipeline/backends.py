@@ -0,0 +1,32 @@
+from pathlib import Path
+from typing import Optional
+
+import torch
+
+BACKENDS = ("torch", "onnxruntime")
+
+
+class OnnxRuntimeModel:
+    """
+    ONNX Runtime session with the same contract as the torch model in PredictionPipeline:
+    called with a normalized NCHW float tensor, returns a logits tensor.
+
+    onnxruntime is imported here rather than at module level so the torch backend keeps
+    working on installs without it.
+    """
+
+    def __init__(self, path: Path, intra_op_threads: Optional[int] = None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Follow torch's thread setting so both backends respect the same CPU budget.
+        options.intra_op_num_threads = intra_op_threads or torch.get_num_threads()
+        self.session = ort.InferenceSession(
+            str(path), sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch: torch.Tensor) -> torch.Tensor:
+        inputs = {self.input_name: batch.detach().cpu().contiguous().numpy()}
+        return torch.from_numpy(self.session.run(None, inputs)[0])
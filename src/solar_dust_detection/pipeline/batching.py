@@ -0,0 +1,106 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, List, Optional, Sequence
+
+from solar_dust_detection import logger
+from solar_dust_detection.pipeline.metrics import STAGE_SECONDS
+
+_STOP = object()
+
+
+class MicroBatcher:
+    """
+    Collects items submitted from many threads and runs them through `fn` in batches.
+
+    A batch is dispatched as soon as `max_batch_size` items are queued, or `max_wait_ms`
+    after the first item of the batch arrived, whichever comes first. `fn` receives a list
+    of items and must return one result per item, in order; each caller gets its own result
+    (or the batch's exception) through the returned Future.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 8,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be >= 1")
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max(max_wait_ms, 0.0) / 1000.0
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._closed = False
+        # Held while checking `_closed` and enqueueing, so nothing can land behind `_STOP`.
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            self._queue.put((item, future, time.perf_counter()))
+        return future
+
+    def __call__(self, item: Any, timeout: Optional[float] = None) -> Any:
+        return self.submit(item).result(timeout=timeout)
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Stop accepting work, flush what is queued and join the worker thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _collect(self, first) -> tuple[list, bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is _STOP:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            first = self._queue.get()
+            if first is _STOP:
+                break
+            batch, stopping = self._collect(first)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: list) -> None:
+        started = time.perf_counter()
+        for _, _, enqueued in batch:
+            STAGE_SECONDS.observe(started - enqueued, "queue_wait")
+        batch = [(item, f) for item, f, _ in batch if f.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        items = [item for item, _ in batch]
+        try:
+            results = self.fn(items)
+            if len(results) != len(items):
+                raise RuntimeError(f"Batch function returned {len(results)} results for {len(items)} items")
+        except BaseException as e:
+            logger.exception("Batched call failed (batch size %d)", len(items))
+            for _, f in batch:
+                f.set_exception(e)
+            return
+        for (_, f), result in zip(batch, results, strict=True):
+            f.set_result(result)
@@ -0,0 +1,176 @@
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from solar_dust_detection import logger
+from solar_dust_detection.pipeline.jobs import IMAGE_SUFFIXES
+from solar_dust_detection.pipeline.prediction import CLASS_NAMES
+
+FORMATS = ("csv", "parquet")
+COLUMNS = ["path", "label", *(f"prob_{name}" for name in CLASS_NAMES), "error"]
+CHECKPOINT = "checkpoint.json"
+
+
+def iter_images(root: Path) -> Iterator[Path]:
+    """Image files under `root`, depth-first with each directory's entries sorted.
+
+    Streams the tree instead of listing it up front, and the order is stable between
+    runs, which is what resuming relies on.
+    """
+    with os.scandir(root) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            yield from iter_images(Path(entry.path))
+        elif entry.is_file() and Path(entry.name).suffix.lower() in IMAGE_SUFFIXES:
+            yield Path(entry.path)
+
+
+def iter_file_list(path: Path) -> Iterator[Path]:
+    """Paths listed one per line in `path`; blank lines and `#` comments are skipped."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                yield Path(line)
+
+
+def iter_inputs(source: Path) -> Iterator[Path]:
+    return iter_images(source) if source.is_dir() else iter_file_list(source)
+
+
+def write_shard(rows: List[dict], path: Path, fmt: str) -> None:
+    """Write one shard atomically: a crash leaves either the whole shard or none of it."""
+    tmp = path.with_name(path.name + ".tmp")
+    if fmt == "csv":
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        import pandas as pd
+
+        try:
+            pd.DataFrame(rows, columns=COLUMNS).to_parquet(tmp, index=False)
+        except ImportError as e:
+            raise RuntimeError("Parquet output needs pyarrow or fastparquet installed") from e
+    os.replace(tmp, path)
+
+
+class BulkScorer:
+    """
+    Scores a directory tree or file list through `PredictionPipeline.predict_batch` and
+    writes `shard-00000.<fmt>` files of `shard_size` rows to `output_dir`.
+
+    After every shard, `checkpoint.json` records how many inputs are done. A rerun with the
+    same source skips that many inputs (without decoding them) and continues with the next
+    shard, so at most one shard of work is repeated after a crash.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        output_dir: Path,
+        fmt: str = "csv",
+        shard_size: int = 10000,
+        block_size: int = 256,
+        log_every_s: float = 10.0,
+        out: Optional[TextIO] = None,
+    ):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format '{fmt}'. Expected one of: {', '.join(FORMATS)}")
+        self.pipeline = pipeline
+        self.output_dir = Path(output_dir)
+        self.fmt = fmt
+        self.shard_size = max(1, shard_size)
+        self.block_size = max(1, min(block_size, self.shard_size))
+        self.log_every_s = log_every_s
+        self.out = out or sys.stderr
+
+    def _load_checkpoint(self, source: Path) -> dict:
+        path = self.output_dir / CHECKPOINT
+        if not path.exists():
+            return {
+                "source": str(source),
+                "format": self.fmt,
+                "shard_size": self.shard_size,
+                "done": 0,
+                "shards": 0,
+            }
+        with open(path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        expected = {"source": str(source), "format": self.fmt, "shard_size": self.shard_size}
+        if any(checkpoint.get(k) != v for k, v in expected.items()):
+            raise ValueError(
+                f"{path} belongs to a different run ({ {k: checkpoint.get(k) for k in expected} }); "
+                "use a new output directory"
+            )
+        return checkpoint
+
+    def _save_checkpoint(self, checkpoint: dict) -> None:
+        path = self.output_dir / CHECKPOINT
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp, path)
+
+    def _predict_one(self, path: Path) -> dict:
+        try:
+            return self.pipeline.predict_batch([path])[0]
+        except (ValueError, OSError) as e:
+            return {"error": str(e)}
+
+    def _rows(self, paths: List[Path]) -> List[dict]:
+        try:
+            results = self.pipeline.predict_batch(paths)
+        except (ValueError, OSError):
+            # An unreadable file must not fail the block, or a resumed run would stop on it
+            # again: score the block one input at a time and record the failures as errors.
+            results = [self._predict_one(path) for path in paths]
+        rows = []
+        for path, result in zip(paths, results, strict=True):
+            probabilities = result.get("probabilities", {})
+            row = {"path": str(path), "label": result.get("image", ""), "error": result.get("error", "")}
+            for name in CLASS_NAMES:
+                row[f"prob_{name}"] = probabilities.get(name, "")
+            rows.append(row)
+        return rows
+
+    def score(self, source: Path, inputs: Optional[Iterable[Path]] = None) -> dict:
+        """Score every input (default: `iter_inputs(source)`) and return the final checkpoint."""
+        source = Path(source).resolve()
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint = self._load_checkpoint(source)
+        if checkpoint["done"]:
+            logger.info(f"Resuming after {checkpoint['done']} images ({checkpoint['shards']} shards)")
+
+        inputs = inputs if inputs is not None else iter_inputs(source)
+        remaining = itertools.islice(iter(inputs), checkpoint["done"], None)
+        start = last_log = time.perf_counter()
+        scored = 0
+        rows: List[dict] = []
+        while True:
+            block = list(itertools.islice(remaining, min(self.block_size, self.shard_size - len(rows))))
+            if block:
+                rows.extend(self._rows(block))
+                scored += len(block)
+            if rows and (len(rows) >= self.shard_size or not block):
+                shard = self.output_dir / f"shard-{checkpoint['shards']:05d}.{self.fmt}"
+                write_shard(rows, shard, self.fmt)
+                checkpoint["done"] += len(rows)
+                checkpoint["shards"] += 1
+                self._save_checkpoint(checkpoint)
+                rows = []
+            now = time.perf_counter()
+            if not block or now - last_log >= self.log_every_s:
+                rate = scored / (now - start) if now > start else 0.0
+                done = checkpoint["done"] + len(rows)
+                print(f"{done} images scored, {rate:.1f} images/sec", file=self.out, flush=True)
+                last_log = now
+            if not block:
+                return checkpoint
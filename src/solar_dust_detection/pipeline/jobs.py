@@ -0,0 +1,261 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from solar_dust_detection import logger
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".tif", ".tiff", ".webp"}
+
+JobInput = Union[bytes, Path]
+
+
+class JobQueueFull(Exception):
+    """Raised by `JobQueue.submit` when the bounded queue has no free slot or byte budget."""
+
+
+class JobTooLarge(ValueError):
+    """Raised by `JobQueue.submit` for a job whose images alone exceed the queue's byte budget."""
+
+
+class JobStore:
+    """
+    Job status and per-image results in SQLite.
+
+    `":memory:"` (the default) keeps jobs inside this process. A file path lets every
+    gunicorn worker answer `GET /jobs/<id>` for a job, whichever worker is running it.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # SQLite connections must not cross a fork: a preloaded gunicorn app creates the store
+        # in the master, so each worker opens its own on first use.
+        if self._pid != os.getpid():
+            self._connection = self._connect()
+            self._pid = os.getpid()
+        return self._connection
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL,
+                done INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                created REAL NOT NULL,
+                updated REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL,
+                idx INTEGER NOT NULL,
+                result TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)
+            );
+            """
+        )
+        return conn
+
+    def create(self, job_id: str, total: int) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, total, created, updated) VALUES (?, 'queued', ?, ?, ?)",
+                (job_id, total, now, now),
+            )
+
+    def set_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated = ? WHERE id = ?",
+                (status, error, time.time(), job_id),
+            )
+
+    def add_results(self, job_id: str, start: int, results: Sequence[dict]) -> None:
+        rows = [(job_id, start + i, json.dumps(r)) for i, r in enumerate(results)]
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT INTO job_results (job_id, idx, result) VALUES (?, ?, ?)", rows)
+            self._conn.execute(
+                "UPDATE jobs SET done = done + ?, updated = ? WHERE id = ?",
+                (len(rows), time.time(), job_id),
+            )
+            self._conn.execute("COMMIT")
+
+    def delete(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM jobs WHERE id = ?", (job_id,))
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status, total, done, error, created, updated FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            results = self._conn.execute(
+                "SELECT result FROM job_results WHERE job_id = ? ORDER BY idx", (job_id,)
+            ).fetchall()
+        status, total, done, error, created, updated = row
+        job = {
+            "id": job_id,
+            "status": status,
+            "total": total,
+            "done": done,
+            "progress": done / total if total else 1.0,
+            "created": created,
+            "updated": updated,
+            "results": [json.loads(r) for (r,) in results],
+        }
+        if error:
+            job["error"] = error
+        return job
+
+    def purge(self, older_than_s: float) -> int:
+        """Drop finished jobs last updated more than `older_than_s` seconds ago."""
+        cutoff = time.time() - older_than_s
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute(
+                "DELETE FROM job_results WHERE job_id IN "
+                "(SELECT id FROM jobs WHERE status IN ('done', 'failed') AND updated < ?)",
+                (cutoff,),
+            )
+            deleted = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN ('done', 'failed') AND updated < ?", (cutoff,)
+            ).rowcount
+            self._conn.execute("COMMIT")
+        return deleted
+
+
+def list_images(root: Path) -> List[Path]:
+    """Image files under `root` (or `root` itself), in sorted order."""
+    if root.is_file():
+        return [root]
+    return sorted(p for p in root.rglob("*") if p.is_file() and p.suffix.lower() in IMAGE_SUFFIXES)
+
+
+class JobQueue:
+    """
+    Runs scoring jobs on background threads through an already loaded pipeline.
+
+    At most `max_queued` jobs holding at most `max_queued_bytes` of image bytes wait (or run)
+    at a time; `submit` raises JobQueueFull instead of buffering more, so a burst of uploads
+    cannot grow memory without bound, and JobTooLarge for a job that could never fit. Each job is
+    scored in chunks through `pipeline.predict_batch`, and results are stored per chunk so
+    `GET /jobs/<id>` can report progress. Worker threads start on the first submit, which
+    keeps them out of a pre-fork parent process.
+    """
+
+    def __init__(
+        self,
+        pipeline,
+        store: Optional[JobStore] = None,
+        max_queued: int = 16,
+        max_queued_bytes: int = 256 * 1024 * 1024,
+        workers: int = 1,
+        chunk_size: Optional[int] = None,
+        retention_s: float = 3600.0,
+    ):
+        self.pipeline = pipeline
+        self.store = store or JobStore()
+        self.workers = max(1, workers)
+        self.chunk_size = max(1, chunk_size or getattr(pipeline, "chunk_size", 32))
+        self.retention_s = retention_s
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max(1, max_queued))
+        self.max_queued_bytes = max_queued_bytes
+        self._queued_bytes = 0
+        self._bytes_lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._start_lock = threading.Lock()
+
+    def qsize(self) -> int:
+        return self._queue.qsize()
+
+    def queued_bytes(self) -> int:
+        return self._queued_bytes
+
+    @staticmethod
+    def _input_bytes(inputs: Sequence[JobInput]) -> int:
+        # Path inputs are read by the worker, one chunk at a time.
+        return sum(len(item) for item in inputs if not isinstance(item, Path))
+
+    def _release(self, size: int) -> None:
+        with self._bytes_lock:
+            self._queued_bytes -= size
+
+    def _ensure_started(self) -> None:
+        with self._start_lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"job-worker-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, inputs: Sequence[JobInput]) -> str:
+        """Queue `inputs` (image bytes or file paths) and return the new job id."""
+        size = self._input_bytes(inputs)
+        if size > self.max_queued_bytes:
+            raise JobTooLarge(
+                f"Job has {size} bytes of images; the job queue holds at most {self.max_queued_bytes}"
+            )
+        with self._bytes_lock:
+            if self._queued_bytes + size > self.max_queued_bytes:
+                raise JobQueueFull(f"{self._queued_bytes} bytes of images already queued")
+            self._queued_bytes += size
+        self._ensure_started()
+        self.store.purge(self.retention_s)
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, len(inputs))
+        try:
+            self._queue.put_nowait((job_id, list(inputs), size))
+        except queue.Full:
+            self.store.delete(job_id)
+            self._release(size)
+            raise JobQueueFull(f"{self._queue.maxsize} jobs already queued") from None
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def _run(self) -> None:
+        while True:
+            job_id, inputs, size = self._queue.get()
+            try:
+                self._process(job_id, inputs)
+            finally:
+                # The bytes stay counted until the job is done with them.
+                del inputs
+                self._release(size)
+                self._queue.task_done()
+
+    def _process(self, job_id: str, inputs: List[JobInput]) -> None:
+        self.store.set_status(job_id, "running")
+        try:
+            for start in range(0, len(inputs), self.chunk_size):
+                chunk = inputs[start:start + self.chunk_size]
+                results = [
+                    {**result, "path": str(item)} if isinstance(item, Path) else result
+                    for item, result in zip(chunk, self.pipeline.predict_batch(chunk), strict=True)
+                ]
+                self.store.add_results(job_id, start, results)
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            self.store.set_status(job_id, "failed", str(e))
+            return
+        self.store.set_status(job_id, "done")
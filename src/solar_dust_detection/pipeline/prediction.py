@@ -1,13 +1,80 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Sequence, Union
 
 import torch
 import torch.nn as nn
 from PIL import Image
-from torchvision import models, transforms
 
 from solar_dust_detection import logger
+from solar_dust_detection.components.model_export import ModelExport
+from solar_dust_detection.pipeline.backends import BACKENDS, OnnxRuntimeModel
+from solar_dust_detection.pipeline.batching import MicroBatcher
+from solar_dust_detection.pipeline.metrics import BATCH_SIZE, STAGE_SECONDS
+from solar_dust_detection.pipeline.prediction_cache import (
+    PredictionCache,
+    content_key,
+    model_fingerprint,
+)
+from solar_dust_detection.pipeline.tiling import (
+    batched,
+    decode_peak_bytes,
+    fit_to_tile,
+    image_size,
+    tile_boxes,
+    tile_stride,
+    tiles_per_batch,
+)
+from solar_dust_detection.utils.acceleration import SpeedOptions
+from solar_dust_detection.utils.model_registry import (
+    ARCHITECTURES,
+    detect_architecture,
+    get_architecture,
+    model_from_state_dict,
+)
+from solar_dust_detection.utils.preprocessing import ImagePreprocessor, ImageSource
+
+ImageInput = ImageSource
+
+CLASS_NAMES = ("Clean", "Dusty")
+
+# Default artifacts per backend, in order of preference.
+MODEL_CANDIDATES = {
+    # Prefer the exported TorchScript model, then the DVC training output;
+    # fall back to the "model/" directory.
+    "torch": [
+        Path("artifacts/model_export/model.ts"),
+        Path("model/model.ts"),
+        Path("artifacts/training/model.pt"),
+        Path("model/model.pt"),
+    ],
+    "onnxruntime": [
+        Path("artifacts/model_export/model.onnx"),
+        Path("model/model.onnx"),
+    ],
+}
+# INT8 models published by stage_06_model_quantization; tried first with PREDICT_INT8 on the
+# onnxruntime backend. Opt-in because the published model may trade a little accuracy.
+INT8_CANDIDATES = [
+    Path("artifacts/model_quantization/model_int8.onnx"),
+    Path("model/model_int8.onnx"),
+]
+# Default artifacts derived from another one. An artifact older than its source (e.g. after
+# retraining without rerunning model_export) is stale: the source is served instead when the
+# backend can load it, otherwise the stale artifact is served with a warning.
+ARTIFACT_SOURCES = {
+    Path("artifacts/model_export/model.ts"): Path("artifacts/training/model.pt"),
+    Path("model/model.ts"): Path("model/model.pt"),
+    Path("artifacts/model_export/model.onnx"): Path("artifacts/training/model.pt"),
+    Path("model/model.onnx"): Path("model/model.pt"),
+    Path("artifacts/model_quantization/model_int8.onnx"): Path("artifacts/model_export/model.onnx"),
+    Path("model/model_int8.onnx"): Path("model/model.onnx"),
+}
+
+
+def _older_than(path: Path, source: Path) -> bool:
+    return source.exists() and path.stat().st_mtime_ns < source.stat().st_mtime_ns
 
 
 class PredictionPipeline:
@@ -16,21 +83,122 @@ class PredictionPipeline:
 
     Notes:
     - The model is loaded once during init (better latency than loading per request).
-    - Model path can be provided via MODEL_PATH env var or constructor argument.
+    - Model path can be provided via MODEL_PATH env var or constructor argument. Without one,
+      the TorchScript export (`.ts`, see stage_05_model_export) is preferred over the
+      state_dict, since it loads without rebuilding the network in Python.
+    - `backend` (or PREDICT_BACKEND) selects the runtime: "torch" (default) or "onnxruntime",
+      which serves the ONNX export (`model.onnx`), or with PREDICT_INT8 the published INT8
+      model (`model_int8.onnx`) when there is one.
+    - `predict` accepts raw image bytes or a decoded PIL image, so the serving path never
+      touches the filesystem. `filename` is only used when `predict` is called without input.
+    - With `max_batch_size > 1` (or PREDICT_MAX_BATCH_SIZE), concurrent `predict` calls are
+      grouped by a MicroBatcher into one forward pass, waiting at most `max_wait_ms`
+      (PREDICT_MAX_WAIT_MS, default 5) for a batch to fill.
+    - `predict_batch` decodes many images on a thread pool (PREDICT_DECODE_WORKERS) and runs
+      them in chunks of PREDICT_BATCH_CHUNK_SIZE (default 32), decoding the next chunk while
+      the current one is in the forward pass.
+    - Results for raw image bytes are cached by content hash plus the model artifact's
+      fingerprint (path, size, mtime), so re-uploaded identical frames skip decode and forward.
+      PREDICT_CACHE_SIZE (default 1024, 0 disables) bounds the LRU; PREDICT_CACHE_TTL_S
+      (default 0, no expiry) ages entries out. Counters are exposed via `cache_stats()`.
+    - `predict_tiled` scores a large capture at native resolution as overlapping 224px tiles
+      (PREDICT_TILE_OVERLAP, default 0.25) and returns a dusty-probability grid plus the
+      share of dusty tiles. Tiles are cropped and run batch by batch so the decoded image
+      and in-flight tiles stay within PREDICT_TILE_MEMORY_MB (default 512).
+    - PREDICT_BF16, PREDICT_CHANNELS_LAST, PREDICT_COMPILE, PREDICT_INTRA_OP_THREADS and
+      PREDICT_INTER_OP_THREADS opt into the CPU speed features of utils.acceleration for the
+      torch backend, matching the BF16/CHANNELS_LAST/COMPILE training params.
+    - For pre-fork servers (gunicorn.conf.py), load once in the parent and call `after_fork`
+      in each worker.
     """
 
-    def __init__(self, filename: str, model_path: Optional[str] = None):
+    def __init__(
+        self,
+        filename: Optional[str] = None,
+        model_path: Optional[str] = None,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        backend: Optional[str] = None,
+        cache_size: Optional[int] = None,
+    ):
         self.filename = filename
         self.device = torch.device("cpu")
+        self.backend = (backend or os.getenv("PREDICT_BACKEND", "torch")).lower()
+        if self.backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{self.backend}'. Expected one of: {', '.join(BACKENDS)}")
         self.model_path = self._resolve_model_path(model_path)
-        self.preprocess = transforms.Compose(
-            [
-                transforms.Resize((224, 224)),
-                transforms.ToTensor(),
-                transforms.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
-            ]
+        # Images are decoded/resized to uint8 per request; normalization runs once per batch.
+        self.preprocessor = ImagePreprocessor(size=(224, 224))
+        self.speed = SpeedOptions.from_env() if self.backend == "torch" else SpeedOptions()
+        self.speed = self.speed.resolve("cpu")
+        self.speed.apply_threads()
+        # Registry name of a state_dict checkpoint; exports do not record it.
+        self.architecture: Optional[str] = None
+        # With PREDICT_COMPILE this is a compiled wrapper; it is only ever called, never saved.
+        self.model = self.speed.prepare_model(self._load_model(self.model_path))
+        self.model_fingerprint = model_fingerprint(self.model_path)
+        # The frozen export is already conv/bn-folded; the JIT profiling passes would only add
+        # ~100ms to the first requests, so TorchScript models skip graph-executor optimization.
+        self.jit_optimize = not isinstance(self.model, torch.jit.ScriptModule)
+        self.chunk_size = int(os.getenv("PREDICT_BATCH_CHUNK_SIZE", "32"))
+        self.decode_workers = int(
+            os.getenv("PREDICT_DECODE_WORKERS", str(min(4, os.cpu_count() or 1)))
+        )
+        self._decode_pool: Optional[ThreadPoolExecutor] = None
+        self.tile_overlap = float(os.getenv("PREDICT_TILE_OVERLAP", "0.25"))
+        self.tile_memory_mb = float(os.getenv("PREDICT_TILE_MEMORY_MB", "512"))
+        # Forward working set of one tile; for an export, that of the hungriest registry backbone.
+        tile_forward_mb = (
+            get_architecture(self.architecture).tile_forward_mb
+            if self.architecture
+            else max(arch.tile_forward_mb for arch in ARCHITECTURES.values())
+        )
+        self.tile_forward_bytes = int(tile_forward_mb * 1024 * 1024)
+
+        if cache_size is None:
+            cache_size = int(os.getenv("PREDICT_CACHE_SIZE", "1024"))
+        self.cache: Optional[PredictionCache] = None
+        if cache_size > 0:
+            self.cache = PredictionCache(
+                max_entries=cache_size, ttl_s=float(os.getenv("PREDICT_CACHE_TTL_S", "0"))
+            )
+
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("PREDICT_MAX_BATCH_SIZE", "1"))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.getenv("PREDICT_MAX_WAIT_MS", "5"))
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.batcher: Optional[MicroBatcher] = None
+        self._start_batcher()
+
+    def _start_batcher(self):
+        if self.max_batch_size <= 1:
+            return
+        self.batcher = MicroBatcher(
+            self._forward, max_batch_size=self.max_batch_size, max_wait_ms=self.max_wait_ms
+        )
+        logger.info(
+            "Micro-batching enabled (max_batch_size=%d, max_wait_ms=%.1f)",
+            self.max_batch_size,
+            self.max_wait_ms,
         )
-        self.model = self._load_model(self.model_path)
+
+    def after_fork(self, num_threads: Optional[int] = None):
+        """Make a pipeline loaded in a pre-fork parent usable in a forked worker.
+
+        Model weights stay shared copy-on-write. Threads do not survive `fork`, so the
+        micro-batcher and decode pool are recreated, and an onnxruntime session (which owns
+        its own thread pool) is rebuilt. `num_threads` caps torch intra-op threads so
+        workers do not oversubscribe the cores.
+        """
+        if num_threads is not None:
+            torch.set_num_threads(max(1, int(num_threads)))
+        self._decode_pool = None
+        self.batcher = None
+        self._start_batcher()
+        if isinstance(self.model, OnnxRuntimeModel):
+            self.model = OnnxRuntimeModel(self.model_path, intra_op_threads=torch.get_num_threads())
 
     def _resolve_model_path(self, model_path: Optional[str]) -> Path:
         if model_path:
@@ -40,42 +208,226 @@ class PredictionPipeline:
         if env_path:
             return Path(env_path)
 
-        # Prefer the DVC training output; fall back to the "model/" directory.
-        candidates = [
-            Path("artifacts/training/model.pt"),
-            Path("model/model.pt"),
-        ]
+        candidates = MODEL_CANDIDATES[self.backend]
+        use_int8 = os.getenv("PREDICT_INT8", "").strip().lower() in ("1", "true", "yes", "on")
+        if self.backend == "onnxruntime" and use_int8:
+            candidates = INT8_CANDIDATES + candidates
         for p in candidates:
-            if p.exists():
+            if not p.exists():
+                continue
+            source = ARTIFACT_SOURCES.get(p)
+            if source is None or not _older_than(p, source):
                 return p
+            if source in candidates:
+                logger.warning(f"{p} is older than {source}, which it was made from; serving {source}")
+                return source
+            logger.warning(f"{p} is older than {source}, which it was made from; rerun the pipeline")
+            return p
 
         raise FileNotFoundError(
-            "No model weights found. Expected one of: "
-            "'artifacts/training/model.pt' or 'model/model.pt', "
-            "or set MODEL_PATH env var."
+            f"No model weights found for backend '{self.backend}'. Expected one of: "
+            + ", ".join(f"'{p}'" for p in candidates)
+            + ", or set MODEL_PATH env var."
         )
 
     def _load_model(self, path: Path) -> nn.Module:
-        logger.info("Loading model weights from: %s", path)
-        model = models.resnet18(weights=None)
-        num_features = model.fc.in_features
-        model.fc = nn.Linear(num_features, 2)
+        if self.backend == "onnxruntime":
+            logger.info("Loading ONNX model from: %s", path)
+            return OnnxRuntimeModel(path)
+        if path.suffix == ".onnx":
+            raise ValueError(f"{path} is an ONNX model; set PREDICT_BACKEND=onnxruntime to serve it.")
 
+        if path.suffix == ".ts":
+            logger.info("Loading TorchScript model from: %s", path)
+            return ModelExport.load_torchscript(path).to(self.device)
+
+        logger.info("Loading model weights from: %s", path)
+        # The architecture (utils.model_registry) is recognised from the parameter names.
         checkpoint = torch.load(path, map_location=self.device)
-        model.load_state_dict(checkpoint)
-        model.to(self.device)
-        model.eval()
-        return model
-
-    def predict(self):
-        # Load and preprocess image
-        image_data = Image.open(self.filename).convert("RGB")
+        self.architecture = detect_architecture(checkpoint)
+        return model_from_state_dict(checkpoint, self.architecture).to(self.device)
+
+    def load_image(self, image: Optional[ImageInput] = None) -> Image.Image:
+        """Decode `image` (bytes, PIL image or path) into an RGB PIL image.
+
+        Raises:
+            ValueError: If the input cannot be decoded as an image.
+        """
+        if image is None:
+            if self.filename is None:
+                raise ValueError("No image given and no filename configured.")
+            image = self.filename
+
+        with STAGE_SECONDS.time("image_decode"):
+            return self.preprocessor.decode(image)
+
+    def preprocess(self, image: Image.Image) -> torch.Tensor:
+        """Resize a decoded image to the model input size as a CHW uint8 tensor."""
+        with STAGE_SECONDS.time("preprocess"):
+            return self.preprocessor.to_uint8(self.preprocessor.resize(image))
+
+    def _forward(self, tensors: List[torch.Tensor]) -> List[torch.Tensor]:
+        """Normalize uint8 CHW tensors and run them as one batch; one logit row each."""
+        BATCH_SIZE.observe(len(tensors))
+        with STAGE_SECONDS.time("forward"):
+            batch = self.preprocessor.normalize(torch.stack(tensors).to(self.device))
+            batch = self.speed.prepare_input(batch)
+            with torch.no_grad(), torch.jit.optimized_execution(self.jit_optimize), self.speed.autocast("cpu"):
+                output = self.model(batch)
+            return list(output.float().cpu())
+
+    def _preprocess_or_error(self, image: ImageInput) -> Union[torch.Tensor, Exception]:
+        # OSError covers paths that are missing or unreadable by the time they are decoded.
+        try:
+            return self.preprocess(self.load_image(image))
+        except (ValueError, OSError) as e:
+            return e
+
+    def _get_decode_pool(self) -> ThreadPoolExecutor:
+        if self._decode_pool is None:
+            self._decode_pool = ThreadPoolExecutor(
+                max_workers=self.decode_workers, thread_name_prefix="decode"
+            )
+        return self._decode_pool
+
+    def _cache_key(self, image: Optional[ImageInput]):
+        """Content-hash key for raw bytes; decoded images and paths are not cached."""
+        if self.cache is None or not isinstance(image, (bytes, bytearray, memoryview)):
+            return None
+        return content_key(image, self.model_fingerprint)
+
+    def cache_stats(self) -> Optional[dict]:
+        return self.cache.stats() if self.cache is not None else None
+
+    @staticmethod
+    def _format_probabilities(probs: torch.Tensor) -> dict:
+        values = [float(p) for p in probs]
+        label = CLASS_NAMES[int(torch.argmax(probs).item())]
+        return {"image": label, "probabilities": dict(zip(CLASS_NAMES, values, strict=True))}
+
+    def predict_batch(
+        self, images: Sequence[ImageInput], chunk_size: Optional[int] = None
+    ) -> List[dict]:
+        """Classify many images, returning one result per input in input order.
+
+        Each result is `{"image": label, "probabilities": {...}}`, or `{"error": ...}` for
+        inputs that could not be decoded, so one bad crop does not fail the whole request.
+        """
+        chunk_size = max(1, chunk_size or self.chunk_size)
+        results: List[dict] = [{} for _ in images]
+        keys = [self._cache_key(image) for image in images]
+        todo = []
+        for i, key in enumerate(keys):
+            cached = self.cache.get(key) if key is not None else None
+            if cached is not None:
+                results[i] = dict(cached)
+            else:
+                todo.append(i)
+
+        chunks = [todo[s:s + chunk_size] for s in range(0, len(todo), chunk_size)]
+        if not chunks:
+            return results
+
+        pool = self._get_decode_pool()
+        pending = [pool.submit(self._preprocess_or_error, images[i]) for i in chunks[0]]
+        for k, indices in enumerate(chunks):
+            decoded = [f.result() for f in pending]
+            if k + 1 < len(chunks):
+                pending = [pool.submit(self._preprocess_or_error, images[i]) for i in chunks[k + 1]]
+
+            ok = [(i, t) for i, t in zip(indices, decoded, strict=True) if isinstance(t, torch.Tensor)]
+            for i, t in zip(indices, decoded, strict=True):
+                if not isinstance(t, torch.Tensor):
+                    results[i] = {"error": str(t)}
+            if not ok:
+                continue
+            probs = torch.softmax(torch.stack(self._forward([t for _, t in ok])), dim=1)
+            for (i, _), p in zip(ok, probs, strict=True):
+                results[i] = self._format_probabilities(p)
+                if keys[i] is not None:
+                    self.cache.put(keys[i], results[i])
+        return results
+
+    def predict(self, image: Optional[ImageInput] = None):
+        key = self._cache_key(image)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return [{"image": cached["image"]}]
+
+        # Decode and preprocess image
+        image_data = self.load_image(image)
         input_tensor = self.preprocess(image_data)
-        input_batch = input_tensor.unsqueeze(0)
 
-        with torch.no_grad():
-            output = self.model(input_batch)
-            result_index = int(torch.argmax(output, dim=1).item())
+        if self.batcher is not None:
+            logits = self.batcher(input_tensor)
+        else:
+            logits = self._forward([input_tensor])[0]
+
+        result = self._format_probabilities(torch.softmax(logits, dim=0))
+        if key is not None:
+            self.cache.put(key, result)
+        return [{"image": result["image"]}]
+
+    def predict_tiled(
+        self,
+        image: ImageInput,
+        overlap: Optional[float] = None,
+        threshold: float = 0.5,
+        memory_budget_mb: Optional[float] = None,
+    ) -> dict:
+        """Score overlapping model-sized tiles of a full-resolution image.
+
+        Images with a side shorter than one tile are upscaled to fit one. The result holds
+        `grid` (rows x cols of dusty probabilities, row-major from the top-left tile), the
+        tile geometry, and `coverage_pct`, the share of tiles at or above `threshold`.
+
+        Raises:
+            ValueError: If the input cannot be decoded.
+            TileBudgetExceeded: If decoding the image (source pixels, RGB copy and any
+                upscaled copy) or holding it next to one tile would exceed the memory budget
+                (checked from the header, before decoding).
+        """
+        overlap = self.tile_overlap if overlap is None else overlap
+        if memory_budget_mb is None:
+            memory_budget_mb = self.tile_memory_mb
+        budget = int(memory_budget_mb * 1024 * 1024)
+        tile_size = self.preprocessor.size[0]
+        stride = tile_stride(tile_size, overlap)
+
+        source_size = image_size(image)
+        width, height = fit_to_tile(source_size, tile_size)
+        batch_size = tiles_per_batch(
+            width * height * 3,
+            budget,
+            self.chunk_size,
+            self.tile_forward_bytes,
+            decode_bytes=decode_peak_bytes(source_size, (width, height)),
+        )
+
+        decoded = self.load_image(image)
+        if decoded.size != (width, height):
+            decoded = decoded.resize((width, height), Image.BILINEAR)
+        rows, cols, boxes = tile_boxes(width, height, tile_size, stride)
+
+        dusty = CLASS_NAMES.index("Dusty")
+        probs: List[float] = []
+        for chunk in batched(boxes, batch_size):
+            with STAGE_SECONDS.time("preprocess"):
+                tiles = [self.preprocessor.to_uint8(decoded.crop(box)) for box in chunk]
+            logits = torch.stack(self._forward(tiles))
+            probs.extend(torch.softmax(logits, dim=1)[:, dusty].tolist())
 
-        prediction = "Dusty" if result_index == 1 else "Clean"
-        return [{"image": prediction}]
\ No newline at end of file
+        dusty_tiles = sum(p >= threshold for p in probs)
+        return {
+            "width": width,
+            "height": height,
+            "tile_size": tile_size,
+            "stride": stride,
+            "rows": rows,
+            "cols": cols,
+            "grid": [probs[r * cols:(r + 1) * cols] for r in range(rows)],
+            "threshold": threshold,
+            "dusty_tiles": dusty_tiles,
+            "coverage_pct": 100.0 * dusty_tiles / len(probs),
+        }
@@ -0,0 +1,270 @@
+"""
+In-process runner for the dvc.yaml pipeline.
+
+`dvc repro` starts one Python process per stage, so every stage pays the torch import again
+and hands models and datasets over through disk. This runner reads the same dvc.yaml (deps,
+params, outs) and runs the stages in dependency order in one process:
+
+- All stages share one ConfigurationManager and a `context` dict. A stage that runs leaves
+  its results there (base weights, the decoded dataset, trained weights) and later stages use
+  them instead of reloading the files. A skipped stage leaves nothing, so its consumers fall
+  back to disk.
+- A stage is skipped when its outputs exist and the fingerprint of its inputs matches the one
+  recorded after its last successful run. The fingerprint covers dep file contents (the stage
+  code is a dep), dep directories by path/size/mtime, and the stage's params.yaml keys.
+- Each stage's wall time and peak resident memory are reported at the end.
+"""
+import hashlib
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import yaml
+
+from solar_dust_detection import logger
+from solar_dust_detection.constants import PARAMS_FILE_PATH
+from solar_dust_detection.utils.manifest import sha256_file, source_fingerprint
+
+# dvc.yaml stage name -> "module:PipelineClass" whose `main(config, context)` runs it.
+PIPELINES = {
+    "data_ingestion": "solar_dust_detection.pipeline.stage_01_data_ingestion:DataIngestionTrainingPipeline",
+    "dataset_cache": "solar_dust_detection.pipeline.stage_07_dataset_cache:DatasetCachePipeline",
+    "base_model": "solar_dust_detection.pipeline.stage_02_base_model:BaseModelTrainingPipeline",
+    "training": "solar_dust_detection.pipeline.stage_03_model_training:ModelTrainingPipeline",
+    "model_distillation": "solar_dust_detection.pipeline.stage_08_model_distillation:ModelDistillationPipeline",
+    "model_export": "solar_dust_detection.pipeline.stage_05_model_export:ModelExportPipeline",
+    "evaluation": "solar_dust_detection.pipeline.stage_04_model_evaluation_mlflow:ModelEvaluationPipeline",
+    "model_quantization": "solar_dust_detection.pipeline.stage_06_model_quantization:ModelQuantizationPipeline",
+    "distillation_evaluation": (
+        "solar_dust_detection.pipeline.stage_09_distillation_evaluation:DistillationEvaluationPipeline"
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Stage:
+    name: str
+    deps: Tuple[str, ...]
+    params: Tuple[str, ...]
+    outs: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class StageResult:
+    name: str
+    status: str  # "ran" or "skipped"
+    seconds: float = 0.0
+    peak_rss_mb: Optional[float] = None
+
+
+def _paths(entries: Optional[Iterable]) -> Tuple[str, ...]:
+    # outs/metrics entries are either "path" or {"path": {options}}.
+    paths: List[str] = []
+    for entry in entries or ():
+        paths.extend(entry if isinstance(entry, dict) else [entry])
+    return tuple(paths)
+
+
+def read_stages(dvc_file: Path) -> List[Stage]:
+    with open(dvc_file, encoding="utf-8") as f:
+        spec = yaml.safe_load(f)
+    return [
+        Stage(
+            name=name,
+            deps=_paths(stage.get("deps")),
+            params=tuple(stage.get("params") or ()),
+            outs=_paths(stage.get("outs")) + _paths(stage.get("metrics")),
+        )
+        for name, stage in spec["stages"].items()
+    ]
+
+
+def _overlaps(a: str, b: str) -> bool:
+    """True when one path is the other or lies inside it."""
+    a_parts, b_parts = PurePosixPath(a).parts, PurePosixPath(b).parts
+    shorter = min(len(a_parts), len(b_parts))
+    return a_parts[:shorter] == b_parts[:shorter]
+
+
+def upstream(stages: Sequence[Stage]) -> Dict[str, List[str]]:
+    """Stage name -> names of the stages producing one of its deps."""
+    return {
+        stage.name: [
+            other.name
+            for other in stages
+            if other is not stage and any(_overlaps(dep, out) for dep in stage.deps for out in other.outs)
+        ]
+        for stage in stages
+    }
+
+
+def execution_order(stages: Sequence[Stage], targets: Optional[Sequence[str]] = None) -> List[Stage]:
+    """`targets` (default: every stage) and everything upstream of them, dependencies first
+    and otherwise in dvc.yaml order.
+
+    Raises:
+        ValueError: For an unknown target or a dependency cycle.
+    """
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in targets or () if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {unknown}; dvc.yaml defines {list(by_name)}")
+    graph = upstream(stages)
+    order: List[Stage] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle through stage {name!r}")
+        state[name] = "visiting"
+        for dep in graph[name]:
+            visit(dep)
+        state[name] = "done"
+        order.append(by_name[name])
+
+    for name in targets or list(by_name):
+        visit(name)
+    return order
+
+
+def _digest(path: Path) -> str:
+    if path.is_dir():
+        return "tree:" + source_fingerprint(path)
+    if path.is_file():
+        return sha256_file(path)
+    return "missing"
+
+
+def fingerprint(stage: Stage, params: Dict[str, Any], root: Path = Path(".")) -> str:
+    inputs = {
+        "deps": {dep: _digest(Path(root) / dep) for dep in stage.deps},
+        "params": {key: params.get(key) for key in stage.params},
+    }
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def rss_bytes() -> int:
+    """Current resident set size; where /proc is missing, the process's peak so far."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class PeakMemory:
+    """Context manager sampling `rss_bytes()` in a background thread; `.peak` is the maximum."""
+
+    def __init__(self, interval_s: float = 0.05):
+        self.interval_s = interval_s
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.peak = max(self.peak, rss_bytes())
+
+    def __enter__(self) -> "PeakMemory":
+        self.peak = rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+class PipelineRunner:
+    def __init__(
+        self,
+        dvc_file: Path = Path("dvc.yaml"),
+        params_file: Path = PARAMS_FILE_PATH,
+        state_path: Path = Path("artifacts/pipeline_state.json"),
+        pipelines: Optional[Dict[str, Any]] = None,
+        config=None,
+    ):
+        """`pipelines` maps stage names to pipeline classes or "module:Class" strings
+        (default `PIPELINES`); `config` is the ConfigurationManager the stages share."""
+        self.root = Path(dvc_file).parent
+        self.stages = read_stages(dvc_file)
+        self.params_file = Path(params_file)
+        self.state_path = Path(state_path)
+        self.pipelines = PIPELINES if pipelines is None else pipelines
+        self.config = config
+        self.results: List[StageResult] = []
+
+    def _load_state(self) -> Dict[str, str]:
+        if not self.state_path.exists():
+            return {}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_state(self, state: Dict[str, str]) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp, self.state_path)
+
+    def _pipeline(self, name: str):
+        pipeline = self.pipelines[name]
+        if isinstance(pipeline, str):
+            module, cls = pipeline.split(":")
+            pipeline = getattr(importlib.import_module(module), cls)
+        return pipeline()
+
+    def run(self, targets: Optional[Sequence[str]] = None, force: bool = False) -> List[StageResult]:
+        """Bring `targets` (default: all stages) up to date; `force` re-runs every stage in
+        the plan. Results so far stay in `self.results` if a stage raises."""
+        with open(self.params_file, encoding="utf-8") as f:
+            params = yaml.safe_load(f) or {}
+        if self.config is None:
+            from solar_dust_detection.config.configuration import ConfigurationManager
+
+            self.config = ConfigurationManager()
+
+        state = self._load_state()
+        context: Dict[str, Any] = {}
+        self.results = []
+        for stage in execution_order(self.stages, targets):
+            current = fingerprint(stage, params, self.root)
+            outputs_exist = all((self.root / out).exists() for out in stage.outs)
+            if not force and outputs_exist and state.get(stage.name) == current:
+                logger.info(f">>>>> stage {stage.name} skipped: inputs unchanged <<<<<")
+                self.results.append(StageResult(stage.name, "skipped"))
+                continue
+
+            logger.info(f">>>>> stage {stage.name} started <<<<<")
+            pipeline = self._pipeline(stage.name)
+            start = time.perf_counter()
+            with PeakMemory() as memory:
+                pipeline.main(config=self.config, context=context)
+            self.results.append(
+                StageResult(stage.name, "ran", time.perf_counter() - start, memory.peak / 2**20)
+            )
+            state[stage.name] = current
+            self._save_state(state)
+            logger.info(f">>>>> stage {stage.name} completed <<<<<\n\nx================x")
+        return self.results
+
+
+def format_report(results: Sequence[StageResult]) -> str:
+    lines = [f"{'stage':<20} {'status':<8} {'seconds':>9} {'peak RSS MB':>12}"]
+    for result in results:
+        peak = f"{result.peak_rss_mb:.0f}" if result.peak_rss_mb is not None else "-"
+        lines.append(f"{result.name:<20} {result.status:<8} {result.seconds:>9.2f} {peak:>12}")
+    lines.append(f"{'total':<20} {'':<8} {sum(r.seconds for r in results):>9.2f}")
+    return "\n".join(lines)
@@ -1,6 +1,5 @@
 from solar_dust_detection.config.configuration import ConfigurationManager
-from solar_dust_detection import logger
-from solar_dust_detection.components.data_ingestion import DataIngestion
+from solar_dust_detection import configure_logging, logger
 
 
 
@@ -10,9 +9,10 @@ class DataIngestionTrainingPipeline:
     def __init__(self):
         pass 
     
-    def main(self):
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.data_ingestion import DataIngestion
         
-        config = ConfigurationManager()
+        config = config or ConfigurationManager()
         data_ingestion_config = config.get_data_ingestion_config()
         data_ingestion = DataIngestion(config=data_ingestion_config)
         data_ingestion.download_data()
@@ -22,6 +22,7 @@ class DataIngestionTrainingPipeline:
         
         
 if __name__ == "__main__":
+    configure_logging()
     try:
         logger.info(f">>>>> stage {STAGE} started <<<<<")
         obj = DataIngestionTrainingPipeline()
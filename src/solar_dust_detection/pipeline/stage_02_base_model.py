@@ -1,6 +1,5 @@
 from solar_dust_detection.config.configuration import ConfigurationManager
-from solar_dust_detection import logger
-from solar_dust_detection.components.base_model import BaseModel
+from solar_dust_detection import configure_logging, logger
 
 
 
@@ -10,15 +9,19 @@ class BaseModelTrainingPipeline:
     def __init__(self):
         pass 
     
-    def main(self):
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.base_model import BaseModel
         
-        config = ConfigurationManager()
+        config = config or ConfigurationManager()
         base_model_config = config.get_base_model_config()
         base_model = BaseModel(config=base_model_config)
         base_model.get_base_model()
+        if context is not None:
+            context["base_model_state"] = base_model.model.state_dict()
 
             
 if __name__ == "__main__":
+    configure_logging()
     try:
         logger.info(f">>>>> stage {STAGE} started <<<<<")
         obj = BaseModelTrainingPipeline()
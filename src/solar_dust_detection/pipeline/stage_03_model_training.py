@@ -1,6 +1,5 @@
 from solar_dust_detection.config.configuration import ConfigurationManager
-from solar_dust_detection import logger
-from solar_dust_detection.components.model_training import Training
+from solar_dust_detection import configure_logging, logger
 
 
 
@@ -11,18 +10,22 @@ class ModelTrainingPipeline:
     def __init__(self):
         pass 
     
-    def main(self):
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.model_training import Training
         
-        config = ConfigurationManager()
+        config = config or ConfigurationManager()
         training_config = config.get_training_config()
+        context = {} if context is None else context
         training = Training(config=training_config)
-        training.get_base_model()
-        training.train_valid_generator()
+        training.get_base_model(context.get("base_model_state"))
+        training.train_valid_generator(context.get("dataset"))
         training.train()
+        context["trained_state"] = training.model.state_dict()
 
 
             
 if __name__ == "__main__":
+    configure_logging()
     try:
         logger.info(f">>>>> stage {STAGE} started <<<<<")
         obj = ModelTrainingPipeline()
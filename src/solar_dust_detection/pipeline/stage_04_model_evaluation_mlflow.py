@@ -1,7 +1,6 @@
 import os
 
-from solar_dust_detection import logger
-from solar_dust_detection.components.model_evaluation_mlflow import Evaluation
+from solar_dust_detection import configure_logging, logger
 from solar_dust_detection.config.configuration import ConfigurationManager
 
 
@@ -13,11 +12,14 @@ class ModelEvaluationPipeline:
     def __init__(self):
         pass 
     
-    def main(self):
-        config = ConfigurationManager()
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.model_evaluation_mlflow import Evaluation
+
+        config = config or ConfigurationManager()
         evaluation_config = config.get_evaluation_config()
         evaluation = Evaluation(config=evaluation_config)
-        evaluation.evaluation()
+        context = context or {}
+        evaluation.evaluation(context.get("trained_state"), context.get("dataset"))
         if os.getenv("ENABLE_MLFLOW", "0") == "1":
             evaluation.log_into_mlflow()
         else:
@@ -29,6 +31,7 @@ class ModelEvaluationPipeline:
 
             
 if __name__ == "__main__":
+    configure_logging()
     try:
         logger.info(f">>>>> stage {STAGE} started <<<<<")
         obj = ModelEvaluationPipeline()
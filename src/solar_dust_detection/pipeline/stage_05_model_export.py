@@ -0,0 +1,36 @@
+from solar_dust_detection import configure_logging, logger
+from solar_dust_detection.config.configuration import ConfigurationManager
+
+
+
+STAGE = "Model Export Stage"
+
+
+class ModelExportPipeline:
+    def __init__(self):
+        pass 
+    
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.model_export import ModelExport
+
+        config = config or ConfigurationManager()
+        model_export_config = config.get_model_export_config()
+        model_export = ModelExport(config=model_export_config)
+        model_export.load_trained_model((context or {}).get("trained_state"))
+        model_export.export_torchscript()
+        model_export.verify()
+        model_export.export_onnx()
+        model_export.verify_onnx()
+
+
+            
+if __name__ == "__main__":
+    configure_logging()
+    try:
+        logger.info(f">>>>> stage {STAGE} started <<<<<")
+        obj = ModelExportPipeline()
+        obj.main()
+        logger.info(f">>>>> stage {STAGE} completed <<<<<\n\nx================x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
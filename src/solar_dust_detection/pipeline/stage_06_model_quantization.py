@@ -0,0 +1,37 @@
+from solar_dust_detection import configure_logging, logger
+from solar_dust_detection.config.configuration import ConfigurationManager
+
+
+
+STAGE = "Model Quantization Stage"
+
+
+class ModelQuantizationPipeline:
+    def __init__(self):
+        pass 
+    
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.model_evaluation_mlflow import Evaluation
+        from solar_dust_detection.components.model_quantization import ModelQuantization
+
+        config = config or ConfigurationManager()
+        evaluation = Evaluation(config=config.get_evaluation_config())
+        model_quantization_config = config.get_model_quantization_config()
+        model_quantization = ModelQuantization(config=model_quantization_config, evaluation=evaluation)
+        context = context or {}
+        model_quantization.quantize(context.get("dataset"))
+        model_quantization.evaluate(context.get("trained_state"))
+        model_quantization.publish()
+
+
+            
+if __name__ == "__main__":
+    configure_logging()
+    try:
+        logger.info(f">>>>> stage {STAGE} started <<<<<")
+        obj = ModelQuantizationPipeline()
+        obj.main()
+        logger.info(f">>>>> stage {STAGE} completed <<<<<\n\nx================x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,34 @@
+from solar_dust_detection import configure_logging, logger
+from solar_dust_detection.config.configuration import ConfigurationManager
+
+
+
+STAGE = "Dataset Cache Stage"
+
+
+class DatasetCachePipeline:
+    def __init__(self):
+        pass 
+    
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.dataset_cache import DatasetCache
+
+        config = config or ConfigurationManager()
+        dataset_cache_config = config.get_dataset_cache_config()
+        dataset_cache = DatasetCache(config=dataset_cache_config)
+        dataset = dataset_cache.build()
+        if context is not None:
+            context["dataset"] = dataset
+
+
+            
+if __name__ == "__main__":
+    configure_logging()
+    try:
+        logger.info(f">>>>> stage {STAGE} started <<<<<")
+        obj = DatasetCachePipeline()
+        obj.main()
+        logger.info(f">>>>> stage {STAGE} completed <<<<<\n\nx================x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
@@ -0,0 +1,38 @@
+from solar_dust_detection import configure_logging, logger
+from solar_dust_detection.config.configuration import ConfigurationManager
+
+
+
+STAGE = "Model Distillation Stage"
+
+
+class ModelDistillationPipeline:
+    def __init__(self):
+        pass 
+    
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.model_distillation import ModelDistillation
+        from solar_dust_detection.components.model_training import Training
+
+        config = config or ConfigurationManager()
+        training = Training(config=config.get_training_config())
+        model_distillation_config = config.get_model_distillation_config()
+        model_distillation = ModelDistillation(config=model_distillation_config, training=training)
+        context = context or {}
+        model_distillation.load_teacher(context.get("trained_state"))
+        training.train_valid_generator(context.get("dataset"))
+        model_distillation.train()
+        model_distillation.export()
+
+
+            
+if __name__ == "__main__":
+    configure_logging()
+    try:
+        logger.info(f">>>>> stage {STAGE} started <<<<<")
+        obj = ModelDistillationPipeline()
+        obj.main()
+        logger.info(f">>>>> stage {STAGE} completed <<<<<\n\nx================x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
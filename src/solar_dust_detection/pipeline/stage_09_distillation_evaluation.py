@@ -0,0 +1,34 @@
+from solar_dust_detection import configure_logging, logger
+from solar_dust_detection.config.configuration import ConfigurationManager
+
+STAGE = "Distillation Evaluation Stage"
+
+
+class DistillationEvaluationPipeline:
+    def __init__(self):
+        pass 
+    
+    def main(self, config: ConfigurationManager = None, context: dict = None):
+        from solar_dust_detection.components.distillation_evaluation import DistillationEvaluation
+        from solar_dust_detection.components.model_evaluation_mlflow import Evaluation
+
+        config = config or ConfigurationManager()
+        evaluation = Evaluation(config=config.get_evaluation_config())
+        model_distillation_config = config.get_model_distillation_config()
+        distillation_evaluation = DistillationEvaluation(config=model_distillation_config, evaluation=evaluation)
+        context = context or {}
+        distillation_evaluation.evaluate(context.get("trained_state"), context.get("dataset"))
+        distillation_evaluation.save_scores()
+
+
+            
+if __name__ == "__main__":
+    configure_logging()
+    try:
+        logger.info(f">>>>> stage {STAGE} started <<<<<")
+        obj = DistillationEvaluationPipeline()
+        obj.main()
+        logger.info(f">>>>> stage {STAGE} completed <<<<<\n\nx================x")
+    except Exception as e:
+        logger.exception(e)
+        raise e
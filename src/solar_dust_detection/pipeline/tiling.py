@@ -0,0 +1,110 @@
+import io
+import math
+from typing import TYPE_CHECKING, Iterator, List, Sequence, Tuple
+
+from PIL import Image, UnidentifiedImageError
+
+if TYPE_CHECKING:  # keeps this module (and app.py, which imports it) free of torch
+    from solar_dust_detection.utils.preprocessing import ImageSource
+
+# Decoding holds the source pixels in their own mode (at most 4 bands, e.g. RGBA or CMYK)
+# next to the RGB copy made by `convert("RGB")`.
+DECODE_BYTES_PER_PIXEL = 4 + 3
+
+Box = Tuple[int, int, int, int]
+
+
+class TileBudgetExceeded(ValueError):
+    """Raised when a decoded image alone would not fit in the tiling memory budget."""
+
+
+def tile_starts(length: int, tile_size: int, stride: int) -> List[int]:
+    """Offsets of tiles along one axis; the last tile is aligned to the far edge."""
+    if length <= tile_size:
+        return [0]
+    starts = list(range(0, length - tile_size + 1, stride))
+    if starts[-1] != length - tile_size:
+        starts.append(length - tile_size)
+    return starts
+
+
+def tile_stride(tile_size: int, overlap: float) -> int:
+    if not 0.0 <= overlap < 1.0:
+        raise ValueError(f"Tile overlap must be in [0, 1), got {overlap}")
+    return max(1, tile_size - int(round(tile_size * overlap)))
+
+
+def tile_boxes(width: int, height: int, tile_size: int, stride: int) -> Tuple[int, int, List[Box]]:
+    """`(rows, cols, boxes)` with `(left, top, right, bottom)` boxes in row-major order."""
+    xs = tile_starts(width, tile_size, stride)
+    ys = tile_starts(height, tile_size, stride)
+    boxes = [(x, y, x + tile_size, y + tile_size) for y in ys for x in xs]
+    return len(ys), len(xs), boxes
+
+
+def fit_to_tile(size: Tuple[int, int], tile_size: int) -> Tuple[int, int]:
+    """Size `(w, h)` upscaled (keeping aspect) so both sides hold at least one full tile."""
+    width, height = size
+    scale = max(1.0, tile_size / min(width, height))
+    return max(tile_size, math.ceil(width * scale)), max(tile_size, math.ceil(height * scale))
+
+
+def image_size(source: "ImageSource") -> Tuple[int, int]:
+    """`(width, height)` from the image header, without decoding the pixels.
+
+    Raises:
+        ValueError: If the input cannot be read as an image.
+    """
+    if isinstance(source, Image.Image):
+        return source.size
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    try:
+        with Image.open(source) as img:
+            return img.size
+    except UnidentifiedImageError as e:
+        raise ValueError("Could not decode image data.") from e
+    except OSError as e:
+        raise ValueError(f"Could not decode image data: {e}") from e
+
+
+def decode_peak_bytes(source_size: Tuple[int, int], fitted_size: Tuple[int, int]) -> int:
+    """Peak bytes held while producing the RGB `fitted_size` image from a `source_size` one:
+    the decode with its RGB conversion, then (when upscaling) both RGB images during resize."""
+    source = source_size[0] * source_size[1]
+    peak = source * DECODE_BYTES_PER_PIXEL
+    if tuple(fitted_size) != tuple(source_size):
+        peak = max(peak, (source + fitted_size[0] * fitted_size[1]) * 3)
+    return peak
+
+
+def tiles_per_batch(
+    image_bytes: int,
+    memory_budget_bytes: int,
+    max_batch: int,
+    tile_bytes: int,
+    decode_bytes: int = 0,
+) -> int:
+    """Tiles per forward pass that fit next to the decoded image in the memory budget.
+
+    `image_bytes` is the RGB image held while tiles run and `tile_bytes` the forward working
+    set of one tile (it depends on the backbone); `decode_bytes` is the transient peak of
+    producing the image (`decode_peak_bytes`), which has to fit the budget as well.
+
+    Raises:
+        TileBudgetExceeded: If decoding would exceed the budget, or the decoded image plus a
+            single tile would.
+    """
+    needed = max(decode_bytes, image_bytes + tile_bytes)
+    if needed > memory_budget_bytes:
+        raise TileBudgetExceeded(
+            f"Image needs {needed / 2**20:.0f}MB to decode and tile; the tiling memory budget is "
+            f"{memory_budget_bytes / 2**20:.0f}MB."
+        )
+    available = memory_budget_bytes - image_bytes
+    return max(1, min(max_batch, available // tile_bytes))
+
+
+def batched(boxes: Sequence[Box], size: int) -> Iterator[Sequence[Box]]:
+    for start in range(0, len(boxes), size):
+        yield boxes[start:start + size]
@@ -0,0 +1,105 @@
+"""
+Opt-in speed features for CPU training and inference, shared by Training, Evaluation and
+PredictionPipeline so all three run a model the same way.
+
+- `bf16`: autocast matmuls/convolutions to bfloat16. Only enabled where the CPU supports
+  it natively (AVX512-BF16 / AMX); elsewhere it would be emulated and slower.
+- `channels_last`: NHWC weights and inputs, the layout oneDNN convolutions prefer.
+- `compile`: `torch.compile` the forward pass. The first batches pay for compilation, so
+  it pays off for long training runs and long-lived servers, not one-off scoring.
+- `intra_op_threads` / `inter_op_threads`: explicit torch thread pools (0 keeps torch's
+  default). Inter-op threads can only be set before the first parallel op runs.
+"""
+import contextlib
+import os
+from dataclasses import dataclass
+from typing import ContextManager, Optional
+
+import torch
+import torch.nn as nn
+
+from solar_dust_detection import logger
+
+
+def bf16_supported(device_type: str = "cpu") -> bool:
+    if device_type == "cuda":
+        return torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+    if device_type == "cpu":
+        return torch.backends.mkldnn.is_available() and torch.ops.mkldnn._is_mkldnn_bf16_supported()
+    return False
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+@dataclass(frozen=True)
+class SpeedOptions:
+    bf16: bool = False
+    channels_last: bool = False
+    compile: bool = False
+    intra_op_threads: int = 0
+    inter_op_threads: int = 0
+
+    @classmethod
+    def from_config(cls, config) -> "SpeedOptions":
+        """From the `params_*` fields that TrainingConfig and EvaluationConfig share."""
+        return cls(
+            bf16=bool(config.params_bf16),
+            channels_last=bool(config.params_channels_last),
+            compile=bool(config.params_compile),
+            intra_op_threads=int(config.params_intra_op_threads),
+            inter_op_threads=int(config.params_inter_op_threads),
+        )
+
+    @classmethod
+    def from_env(cls, prefix: str = "PREDICT_") -> "SpeedOptions":
+        """PREDICT_BF16, PREDICT_CHANNELS_LAST, PREDICT_COMPILE, PREDICT_INTRA_OP_THREADS, PREDICT_INTER_OP_THREADS."""
+        return cls(
+            bf16=_env_flag(f"{prefix}BF16"),
+            channels_last=_env_flag(f"{prefix}CHANNELS_LAST"),
+            compile=_env_flag(f"{prefix}COMPILE"),
+            intra_op_threads=int(os.getenv(f"{prefix}INTRA_OP_THREADS", "0")),
+            inter_op_threads=int(os.getenv(f"{prefix}INTER_OP_THREADS", "0")),
+        )
+
+    def resolve(self, device_type: str) -> "SpeedOptions":
+        """Drop bf16 where the device cannot run it natively, with a warning."""
+        if self.bf16 and not bf16_supported(device_type):
+            logger.warning(f"bf16 autocast requested but not supported on this {device_type}; using fp32")
+            return SpeedOptions(**{**self.__dict__, "bf16": False})
+        return self
+
+    def apply_threads(self) -> None:
+        if self.intra_op_threads > 0:
+            torch.set_num_threads(self.intra_op_threads)
+        if self.inter_op_threads > 0 and torch.get_num_interop_threads() != self.inter_op_threads:
+            try:
+                torch.set_num_interop_threads(self.inter_op_threads)
+            except RuntimeError as e:
+                logger.warning(f"Could not set inter-op threads to {self.inter_op_threads}: {e}")
+
+    def prepare_model(self, model: nn.Module) -> nn.Module:
+        """Convert `model` in place to channels_last; returns the module to call, which is a
+        compiled wrapper when `compile` is set. Save and load weights through the original
+        `model`: the wrapper's state_dict keys carry an `_orig_mod.` prefix."""
+        if self.channels_last:
+            model.to(memory_format=torch.channels_last)
+        if self.compile and not isinstance(model, torch.jit.ScriptModule):
+            return torch.compile(model)
+        return model
+
+    def prepare_input(self, batch: torch.Tensor) -> torch.Tensor:
+        if self.channels_last and batch.dim() == 4:
+            return batch.contiguous(memory_format=torch.channels_last)
+        return batch
+
+    def autocast(self, device_type: str) -> ContextManager:
+        if not self.bf16:
+            return contextlib.nullcontext()
+        return torch.autocast(device_type=device_type, dtype=torch.bfloat16)
+
+    def describe(self) -> Optional[str]:
+        enabled = [name for name in ("bf16", "channels_last", "compile") if getattr(self, name)]
+        enabled += [f"{name}={getattr(self, name)}" for name in ("intra_op_threads", "inter_op_threads") if getattr(self, name)]
+        return ", ".join(enabled) or None
@@ -0,0 +1,166 @@
+"""
+Classification metrics computed from stored logits and labels with numpy only.
+
+Everything here is vectorized over samples (sorts, cumulative sums, `bincount`,
+`searchsorted`), so a full report over tens of thousands of predictions takes milliseconds
+and never needs the model. Binary curves treat one class as positive and score each sample
+by its softmax probability for that class.
+"""
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_THRESHOLDS = np.round(np.arange(0.05, 1.0, 0.05), 2)
+
+
+def softmax(logits: np.ndarray) -> np.ndarray:
+    shifted = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(shifted)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise numerator / denominator, 0 where the denominator is 0."""
+    numerator = np.asarray(numerator, dtype=np.float64)
+    denominator = np.asarray(denominator, dtype=np.float64)
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def confusion_matrix(labels: np.ndarray, predictions: np.ndarray, num_classes: int) -> np.ndarray:
+    """`cm[true, predicted]` counts."""
+    flat = num_classes * np.asarray(labels, dtype=np.int64) + np.asarray(predictions, dtype=np.int64)
+    return np.bincount(flat, minlength=num_classes * num_classes).reshape(num_classes, num_classes)
+
+
+def precision_recall_f1(cm: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-class precision, recall and F1 from a confusion matrix."""
+    true_positives = np.diag(cm)
+    precision = _ratio(true_positives, cm.sum(axis=0))
+    recall = _ratio(true_positives, cm.sum(axis=1))
+    f1 = _ratio(2 * precision * recall, precision + recall)
+    return precision, recall, f1
+
+
+def _cumulative_counts(is_positive: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """True/false positive counts when predicting positive for `score >= t`, for every
+    distinct score `t` in decreasing order."""
+    if scores.size == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), scores
+    order = np.argsort(-scores, kind="mergesort")
+    scores = scores[order]
+    is_positive = np.asarray(is_positive, dtype=bool)[order]
+    # Last index of each run of equal scores.
+    distinct = np.r_[np.flatnonzero(np.diff(scores)), scores.size - 1]
+    true_positives = np.cumsum(is_positive)[distinct]
+    false_positives = (distinct + 1) - true_positives
+    return true_positives, false_positives, scores[distinct]
+
+
+def roc_curve(is_positive: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`(fpr, tpr, thresholds)`, starting at (0, 0) with threshold +inf."""
+    true_positives, false_positives, thresholds = _cumulative_counts(is_positive, scores)
+    tpr = _ratio(np.r_[0, true_positives], true_positives[-1] if true_positives.size else 0)
+    fpr = _ratio(np.r_[0, false_positives], false_positives[-1] if false_positives.size else 0)
+    return fpr, tpr, np.r_[np.inf, thresholds]
+
+
+def precision_recall_curve(is_positive: np.ndarray, scores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """`(precision, recall, thresholds)` in decreasing threshold order."""
+    true_positives, false_positives, thresholds = _cumulative_counts(is_positive, scores)
+    precision = _ratio(true_positives, true_positives + false_positives)
+    recall = _ratio(true_positives, true_positives[-1] if true_positives.size else 0)
+    return precision, recall, thresholds
+
+
+def auc(x: np.ndarray, y: np.ndarray) -> float:
+    """Trapezoidal area under `y(x)`."""
+    return float(np.sum(np.diff(x) * (y[1:] + y[:-1]) / 2))
+
+
+def average_precision(precision: np.ndarray, recall: np.ndarray) -> float:
+    """Sum over thresholds of precision times the recall gained (no interpolation)."""
+    return float(np.sum(np.diff(np.r_[0, recall]) * precision))
+
+
+def threshold_sweep(
+    is_positive: np.ndarray, scores: np.ndarray, thresholds: Sequence[float] = DEFAULT_THRESHOLDS
+) -> Dict[str, np.ndarray]:
+    """Precision, recall, F1, false positive rate and accuracy of `score >= t` for each `t`."""
+    is_positive = np.asarray(is_positive, dtype=bool)
+    thresholds = np.asarray(thresholds, dtype=np.float64)
+    positive_scores = np.sort(scores[is_positive])
+    negative_scores = np.sort(scores[~is_positive])
+    # Samples at or above each threshold, found by binary search instead of a pass per threshold.
+    true_positives = positive_scores.size - np.searchsorted(positive_scores, thresholds, side="left")
+    false_positives = negative_scores.size - np.searchsorted(negative_scores, thresholds, side="left")
+    true_negatives = negative_scores.size - false_positives
+    precision = _ratio(true_positives, true_positives + false_positives)
+    recall = _ratio(true_positives, positive_scores.size)
+    return {
+        "threshold": thresholds,
+        "precision": precision,
+        "recall": recall,
+        "f1": _ratio(2 * precision * recall, precision + recall),
+        "false_positive_rate": _ratio(false_positives, negative_scores.size),
+        "accuracy": _ratio(true_positives + true_negatives, scores.size),
+    }
+
+
+def classification_report(
+    logits: np.ndarray,
+    labels: np.ndarray,
+    classes: Sequence[str],
+    positive_class: Optional[str] = None,
+    thresholds: Sequence[float] = DEFAULT_THRESHOLDS,
+    curves: bool = False,
+) -> Dict[str, Any]:
+    """Accuracy, confusion matrix, per-class precision/recall/F1 and, for `positive_class`
+    (default "Dusty", else the last class), ROC AUC, average precision and a threshold
+    sweep; `curves` adds the full ROC and PR curves."""
+    classes = list(classes)
+    labels = np.asarray(labels, dtype=np.int64)
+    probabilities = softmax(np.asarray(logits, dtype=np.float64))
+    predictions = probabilities.argmax(axis=1)
+    cm = confusion_matrix(labels, predictions, len(classes))
+    precision, recall, f1 = precision_recall_f1(cm)
+
+    if positive_class is None:
+        positive_class = "Dusty" if "Dusty" in classes else classes[-1]
+    positive = classes.index(positive_class)
+    is_positive = labels == positive
+    scores = probabilities[:, positive]
+    fpr, tpr, roc_thresholds = roc_curve(is_positive, scores)
+    pr_precision, pr_recall, pr_thresholds = precision_recall_curve(is_positive, scores)
+
+    report: Dict[str, Any] = {
+        "samples": int(labels.size),
+        "accuracy": float(np.trace(cm) / max(1, labels.size)),
+        "classes": classes,
+        "confusion_matrix": cm.tolist(),
+        "per_class": {
+            name: {
+                "precision": float(precision[i]),
+                "recall": float(recall[i]),
+                "f1": float(f1[i]),
+                "support": int(cm[i].sum()),
+            }
+            for i, name in enumerate(classes)
+        },
+        "positive_class": positive_class,
+        "roc_auc": auc(fpr, tpr),
+        "average_precision": average_precision(pr_precision, pr_recall),
+        "threshold_sweep": {k: v.tolist() for k, v in threshold_sweep(is_positive, scores, thresholds).items()},
+    }
+    if curves:
+        report["roc_curve"] = {
+            "fpr": fpr.tolist(),
+            "tpr": tpr.tolist(),
+            # The first point (nothing predicted positive) has an infinite threshold.
+            "threshold": [None, *roc_thresholds[1:].tolist()],
+        }
+        report["pr_curve"] = {
+            "precision": pr_precision.tolist(),
+            "recall": pr_recall.tolist(),
+            "threshold": pr_thresholds.tolist(),
+        }
+    return report
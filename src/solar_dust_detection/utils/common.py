@@ -7,7 +7,6 @@ except Exception:  # pragma: no cover
 import yaml
 from solar_dust_detection import logger
 import json
-import joblib
 from ensure import ensure_annotations
 from box import ConfigBox
 from pathlib import Path
@@ -84,6 +83,8 @@ def save_bin(data: Any, path: Path) -> None:
         data (Any): The data to save.
         path (Path): The path to the binary file.
     """
+    import joblib
+
     joblib.dump(data, path)
     logger.info("Binary file saved at: %s", path)    
     
@@ -97,6 +98,8 @@ def load_bin(path: Path) -> Any:
     Returns:
         Any: The data loaded from the binary file.
     """
+    import joblib
+
     data = joblib.load(path)
     logger.info("Binary file loaded from: %s", path)
     
@@ -0,0 +1,34 @@
+import os
+from typing import Any, Dict, Union
+
+
+def available_cores() -> int:
+    """CPU cores this process may run on (respects taskset/cgroup affinity where available)."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def resolve_num_workers(value: Union[int, str, None]) -> int:
+    """Map NUM_WORKERS to an int; "auto" keeps one core for the main process, up to 8 workers."""
+    if value is None or str(value).lower() == "auto":
+        return max(0, min(8, available_cores() - 1))
+    return int(value)
+
+
+def dataloader_kwargs(config: Any, device: str) -> Dict[str, Any]:
+    """DataLoader keyword arguments from a Training/Evaluation config's loader params.
+
+    `prefetch_factor` and `persistent_workers` only apply with worker processes, and
+    PIN_MEMORY "auto" pins host memory only when batches are copied to a CUDA device.
+    """
+    num_workers = resolve_num_workers(config.params_num_workers)
+    pin_memory = config.params_pin_memory
+    if str(pin_memory).lower() == "auto":
+        pin_memory = str(device).startswith("cuda")
+
+    kwargs: Dict[str, Any] = {"num_workers": num_workers, "pin_memory": bool(pin_memory)}
+    if num_workers > 0:
+        kwargs["prefetch_factor"] = int(config.params_prefetch_factor)
+        kwargs["persistent_workers"] = bool(config.params_persistent_workers)
+    return kwargs
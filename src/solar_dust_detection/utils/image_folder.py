@@ -0,0 +1,54 @@
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from torchvision import datasets
+from torchvision.datasets.folder import IMG_EXTENSIONS, default_loader
+
+from solar_dust_detection.utils.manifest import read_manifest
+
+
+class ManifestImageFolder(datasets.ImageFolder):
+    """
+    `datasets.ImageFolder` whose samples come from the ingestion manifest instead of walking
+    `root`. Classes, sample order and targets match ImageFolder on the same tree, so seeded
+    `random_split`s select the same images. `sha256[i]` is the content hash of sample i.
+    """
+
+    def __init__(self, root: Path, manifest: Dict[str, Any], manifest_dir: Path, loader=default_loader, **kwargs):
+        prefix = Path(os.path.relpath(Path(root).resolve(), Path(manifest_dir).resolve()))
+        self._entries = []
+        for entry in manifest["files"]:
+            rel = Path(entry["path"])
+            if prefix != Path("."):
+                if prefix not in rel.parents:
+                    continue
+                rel = rel.relative_to(prefix)
+            # ImageFolder layout: <root>/<class>/.../<image>
+            if len(rel.parts) >= 2 and rel.suffix.lower() in IMG_EXTENSIONS:
+                self._entries.append((rel, entry["sha256"]))
+        super().__init__(root, loader=loader, **kwargs)
+
+    def find_classes(self, directory):
+        classes = sorted({rel.parts[0] for rel, _ in self._entries})
+        if not classes:
+            raise FileNotFoundError(f"The manifest lists no class folders under {directory}.")
+        return classes, {c: i for i, c in enumerate(classes)}
+
+    def make_dataset(self, directory, class_to_idx, extensions=None, is_valid_file=None, allow_empty=False):
+        # Same order as ImageFolder: classes sorted, then sorted(os.walk(...)) and sorted file names.
+        rows = sorted(
+            (class_to_idx[rel.parts[0]], os.path.join(directory, *rel.parts[:-1]), rel.name, sha)
+            for rel, sha in self._entries
+            if rel.parts[0] in class_to_idx
+        )
+        self.sha256: List[str] = [sha for *_, sha in rows]
+        return [(os.path.join(dirpath, name), target) for target, dirpath, name, _ in rows]
+
+
+def image_folder(root: Path, manifest_path: Optional[Path] = None, loader=default_loader) -> datasets.ImageFolder:
+    """ImageFolder over `root`, listed from the ingestion manifest when one exists."""
+    manifest = read_manifest(manifest_path) if manifest_path else None
+    if manifest is None:
+        return datasets.ImageFolder(root=root, loader=loader)
+    return ManifestImageFolder(root, manifest, Path(manifest_path).parent, loader=loader)
@@ -0,0 +1,132 @@
+"""
+Classification backbones, selected with the `ARCHITECTURE` param.
+
+BaseModel, Training, Evaluation, ModelExport and PredictionPipeline all build their network
+through this registry, so a state_dict written by one stage always loads in the next. Each
+entry names the torchvision constructor, its ImageNet weights and the dotted path of its
+final `nn.Linear` (the head that is resized to `CLASSES` and, with FEATURE_CACHE, trained
+alone on cached penultimate features).
+
+Serving has no params.yaml, so a plain state_dict is matched to its architecture by its
+parameter names (`detect_architecture`).
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import torch
+import torch.nn as nn
+from torchvision import models
+
+
+@dataclass(frozen=True)
+class Architecture:
+    name: str
+    builder: Callable[..., nn.Module]
+    imagenet_weights: Any
+    head: str
+    # Model registry name prefix in MLflow ("<display_name>Model").
+    display_name: str
+    # Peak float32 working set (MB) of one 224px tile in a no-grad forward pass: the input plus
+    # the largest layer input/output pair, rounded up from the measured value. Bounds tiled
+    # prediction's tiles per forward pass.
+    tile_forward_mb: float
+
+
+ARCHITECTURES: Dict[str, Architecture] = {
+    arch.name: arch
+    for arch in (
+        Architecture(
+            "resnet18",
+            models.resnet18,
+            models.ResNet18_Weights.IMAGENET1K_V1,
+            "fc",
+            "ResNet18",
+            tile_forward_mb=8,  # measured 6.7
+        ),
+        Architecture(
+            "mobilenet_v3_small",
+            models.mobilenet_v3_small,
+            models.MobileNet_V3_Small_Weights.IMAGENET1K_V1,
+            "classifier.3",
+            "MobileNetV3Small",
+            tile_forward_mb=3,  # measured 2.3
+        ),
+        Architecture(
+            "mobilenet_v3_large",
+            models.mobilenet_v3_large,
+            models.MobileNet_V3_Large_Weights.IMAGENET1K_V2,
+            "classifier.3",
+            "MobileNetV3Large",
+            tile_forward_mb=8,  # measured 6.7
+        ),
+        Architecture(
+            "efficientnet_b0",
+            models.efficientnet_b0,
+            models.EfficientNet_B0_Weights.IMAGENET1K_V1,
+            "classifier.1",
+            "EfficientNetB0",
+            tile_forward_mb=12,  # measured 9.8
+        ),
+    )
+}
+DEFAULT_ARCHITECTURE = "resnet18"
+
+
+def get_architecture(name: str) -> Architecture:
+    """
+    Raises:
+        ValueError: If `name` is not a registered architecture.
+    """
+    try:
+        return ARCHITECTURES[name]
+    except KeyError:
+        raise ValueError(f"Unknown architecture {name!r}; choose one of {sorted(ARCHITECTURES)}") from None
+
+
+def get_head(model: nn.Module, name: str) -> nn.Linear:
+    return model.get_submodule(get_architecture(name).head)
+
+
+def set_head(model: nn.Module, name: str, module: nn.Module) -> None:
+    parent, _, attr = get_architecture(name).head.rpartition(".")
+    setattr(model.get_submodule(parent), attr, module)
+
+
+def build_model(name: str, num_classes: Optional[int] = None, pretrained: bool = False) -> nn.Module:
+    """`name` with ImageNet weights when `pretrained`, else randomly initialised. Unless
+    `num_classes` is None, the head is replaced by a fresh `num_classes`-way Linear."""
+    arch = get_architecture(name)
+    model = arch.builder(weights=arch.imagenet_weights if pretrained else None)
+    if num_classes is not None:
+        set_head(model, name, nn.Linear(get_head(model, name).in_features, num_classes))
+    return model
+
+
+def detect_architecture(state_dict: Mapping[str, torch.Tensor]) -> str:
+    """
+    Name of the registered architecture whose parameter names match `state_dict`.
+
+    Raises:
+        ValueError: If no registered architecture matches.
+    """
+    keys = set(state_dict)
+    for name in ARCHITECTURES:
+        # Built on the meta device: only the parameter names are needed.
+        with torch.device("meta"):
+            candidate = build_model(name)
+        if set(candidate.state_dict()) == keys:
+            return name
+    raise ValueError(f"The weights match none of the registered architectures {sorted(ARCHITECTURES)}")
+
+
+def model_from_state_dict(state_dict: Mapping[str, torch.Tensor], name: Optional[str] = None) -> nn.Module:
+    """Inference model holding `state_dict`'s tensors; the architecture and number of classes
+    come from the weights unless `name` is given."""
+    name = name or detect_architecture(state_dict)
+    num_classes = state_dict[f"{get_architecture(name).head}.weight"].shape[0]
+    # Build on the meta device: the random init would be overwritten by the checkpoint anyway.
+    with torch.device("meta"):
+        model = build_model(name, num_classes)
+    model.load_state_dict(state_dict, assign=True)
+    model.eval()
+    return model
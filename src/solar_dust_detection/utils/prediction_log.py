@@ -0,0 +1,81 @@
+"""
+On-disk evaluation outputs that later analysis reads instead of re-running the model.
+
+- The prediction log is a columnar `.npz`: one row per validation sample with its dataset
+  `index`, image `path` (relative to the data directory), `label` and raw `logits`, plus the
+  `classes` names. `np.load` reads each column as one contiguous array.
+- The split manifest stores the train/validation indices together with a hash of the
+  ordered sample list, so reruns score exactly the same images as long as the dataset is
+  unchanged, independent of the torch RNG.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def samples_hash(sample_ids: Sequence[str]) -> str:
+    return hashlib.sha256("\n".join(sample_ids).encode()).hexdigest()
+
+
+def save_prediction_log(
+    path: Path,
+    indices: Sequence[int],
+    paths: Sequence[str],
+    labels: np.ndarray,
+    logits: np.ndarray,
+    classes: Sequence[str],
+) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    # Written through a file object: np.savez would append ".npz" to the temporary name.
+    with open(tmp, "wb") as f:
+        np.savez(
+            f,
+            index=np.asarray(indices, dtype=np.int64),
+            path=np.asarray(paths, dtype=str),
+            label=np.asarray(labels, dtype=np.int64),
+            logits=np.asarray(logits, dtype=np.float32),
+            classes=np.asarray(classes, dtype=str),
+        )
+    os.replace(tmp, path)
+
+
+def load_prediction_log(path: Path) -> Dict[str, Any]:
+    """Columns `index`, `path`, `label`, `logits` as arrays and `classes` as a list."""
+    with np.load(path) as data:
+        log = {name: data[name] for name in ("index", "path", "label", "logits")}
+        log["classes"] = data["classes"].tolist()
+    return log
+
+
+def load_split(path: Path, sample_ids: Sequence[str]) -> Optional[Dict[str, List[int]]]:
+    """`{"train": [...], "val": [...]}` from the manifest at `path`, or None when there is no
+    manifest or it was written for a different sample list."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        split = json.load(f)
+    if split.get("samples_sha256") != samples_hash(sample_ids):
+        return None
+    return {"train": split["train"], "val": split["val"]}
+
+
+def save_split(path: Path, sample_ids: Sequence[str], train: Sequence[int], val: Sequence[int]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    split = {
+        "samples": len(sample_ids),
+        "samples_sha256": samples_hash(sample_ids),
+        "train": [int(i) for i in train],
+        "val": [int(i) for i in val],
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(split, f)
+    os.replace(tmp, path)
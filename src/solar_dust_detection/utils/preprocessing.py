@@ -0,0 +1,97 @@
+import io
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import torch
+from PIL import Image, UnidentifiedImageError
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+ImageSource = Union[bytes, bytearray, memoryview, Image.Image, str, Path]
+
+
+class ImagePreprocessor:
+    """
+    Shared decode -> resize -> normalize engine for training, evaluation and serving.
+
+    Equivalent (to float rounding) to `Resize(size) -> ToTensor() -> Normalize(mean, std)`,
+    but split so that the per-image part stays in uint8 and the float work is batched:
+    - `load` decodes and resizes one image with Pillow's bilinear filter (the same call
+      `transforms.Resize` makes) and returns a CHW uint8 tensor.
+    - `normalize` converts a whole uint8 batch to float and normalizes it in one fused op,
+      `x * (1 / (255 * std)) - mean / std`.
+    - `collate` is a DataLoader `collate_fn` that stacks uint8 samples and normalizes them.
+
+    `draft=True` lets Pillow decode JPEGs at a reduced DCT scale when the source is at least
+    twice the target size. It is much faster for large photos but not bit-identical to the
+    torchvision chain, so it is off by default.
+    """
+
+    def __init__(
+        self,
+        size: Sequence[int] = (224, 224),
+        mean: Sequence[float] = IMAGENET_MEAN,
+        std: Sequence[float] = IMAGENET_STD,
+        draft: bool = False,
+    ):
+        self.size = (int(size[0]), int(size[1]))  # (height, width), as in transforms.Resize
+        self.draft = draft
+        std_t = torch.tensor(std, dtype=torch.float32).view(1, -1, 1, 1)
+        mean_t = torch.tensor(mean, dtype=torch.float32).view(1, -1, 1, 1)
+        self.scale = 1.0 / (255.0 * std_t)
+        self.bias = -mean_t / std_t
+
+    def decode(self, source: ImageSource) -> Image.Image:
+        """Decode bytes, a path or a PIL image into an RGB PIL image.
+
+        Raises:
+            ValueError: If the input cannot be decoded as an image, including truncated or
+                corrupt data and unreadable paths (PIL reports those as OSError on open,
+                load or convert).
+        """
+        try:
+            if isinstance(source, Image.Image):
+                return source.convert("RGB")
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                source = io.BytesIO(source)
+            with Image.open(source) as img:
+                if self.draft:
+                    img.draft("RGB", (self.size[1], self.size[0]))
+                return img.convert("RGB")
+        except UnidentifiedImageError as e:
+            raise ValueError("Could not decode image data.") from e
+        except OSError as e:
+            raise ValueError(f"Could not decode image data: {e}") from e
+
+    def resize(self, img: Image.Image) -> Image.Image:
+        target = (self.size[1], self.size[0])
+        if img.size == target:
+            return img
+        return img.resize(target, Image.BILINEAR)
+
+    @staticmethod
+    def to_uint8(img: Image.Image) -> torch.Tensor:
+        """PIL image -> CHW uint8 tensor (like `transforms.PILToTensor`)."""
+        return torch.from_numpy(np.array(img, dtype=np.uint8, copy=True)).permute(2, 0, 1)
+
+    def load(self, source: ImageSource) -> torch.Tensor:
+        return self.to_uint8(self.resize(self.decode(source)))
+
+    def normalize(self, batch: torch.Tensor) -> torch.Tensor:
+        """uint8 CHW or NCHW -> normalized float32, in one fused multiply-add."""
+        squeeze = batch.dim() == 3
+        if squeeze:
+            batch = batch.unsqueeze(0)
+        scale = self.scale.to(batch.device)
+        bias = self.bias.to(batch.device)
+        out = torch.addcmul(bias, batch.to(torch.float32), scale)
+        return out.squeeze(0) if squeeze else out
+
+    def __call__(self, sources: Iterable[ImageSource]) -> torch.Tensor:
+        return self.normalize(torch.stack([self.load(s) for s in sources]))
+
+    def collate(self, samples: List[Tuple[torch.Tensor, int]]) -> Tuple[torch.Tensor, torch.Tensor]:
+        images, labels = zip(*samples, strict=True)
+        return self.normalize(torch.stack(images)), torch.as_tensor(labels)
@@ -0,0 +1,133 @@
+"""
+Training and evaluation loops that do not synchronize with the device per batch.
+
+Loss and correct counts are summed into device tensors and read back with `.item()` once
+per epoch (or every `log_every` steps), so on an accelerator the host keeps queueing work
+and loading the next batch instead of waiting for each step to finish. Batch sizes are
+known on the host, so the sample count never needs a read-back.
+
+`speed` (utils.acceleration.SpeedOptions) adds bf16 autocast and channels_last inputs;
+pass the module returned by `speed.prepare_model` as `model`.
+"""
+import time
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from solar_dust_detection import logger
+from solar_dust_detection.utils.acceleration import SpeedOptions
+
+
+def to_device(images: torch.Tensor, labels: torch.Tensor, device) -> Tuple[torch.Tensor, torch.Tensor]:
+    # non_blocking overlaps the copy with compute when the loader pins memory; a no-op on CPU.
+    return images.to(device, non_blocking=True), labels.to(device, non_blocking=True)
+
+
+def train_epoch(
+    model: nn.Module,
+    batches: Iterable[Tuple[torch.Tensor, torch.Tensor]],
+    criterion: nn.Module,
+    optimizer: torch.optim.Optimizer,
+    device,
+    log_every: int = 0,
+    epoch: Optional[int] = None,
+    speed: Optional[SpeedOptions] = None,
+) -> Tuple[float, float]:
+    """One pass over `batches`; returns (mean batch loss, accuracy in [0, 1])."""
+    speed = speed or SpeedOptions()
+    device_type = torch.device(device).type
+    model.train()
+    loss_sum = torch.zeros((), device=device)
+    correct = torch.zeros((), dtype=torch.long, device=device)
+    total = 0
+    steps = 0
+    for images, labels in batches:
+        images, labels = to_device(images, labels, device)
+        optimizer.zero_grad(set_to_none=True)
+        with speed.autocast(device_type):
+            outputs = model(speed.prepare_input(images))
+            loss = criterion(outputs, labels)
+        loss.backward()
+        optimizer.step()
+
+        loss_sum += loss.detach()
+        correct += (outputs.detach().argmax(1) == labels).sum()
+        total += labels.size(0)
+        steps += 1
+        if log_every and steps % log_every == 0:
+            prefix = f"Epoch {epoch} " if epoch is not None else ""
+            logger.info(
+                f"{prefix}step {steps}: loss {loss_sum.item() / steps:.4f} "
+                f"acc {100 * correct.item() / total:.2f}%"
+            )
+    return loss_sum.item() / max(1, steps), correct.item() / max(1, total)
+
+
+@torch.no_grad()
+def predict(
+    model: nn.Module,
+    batches: Iterable[Tuple[torch.Tensor, torch.Tensor]],
+    device,
+    speed: Optional[SpeedOptions] = None,
+) -> Tuple[torch.Tensor, torch.Tensor]:
+    """float32 logits `(N, classes)` and labels `(N,)` of `model` over `batches`, on the CPU.
+
+    Per-batch outputs stay on the device and are copied back once, after the last batch.
+    """
+    speed = speed or SpeedOptions()
+    device_type = torch.device(device).type
+    outputs, targets = [], []
+    for images, labels in batches:
+        images, labels = to_device(images, labels, device)
+        with speed.autocast(device_type):
+            logits = model(speed.prepare_input(images))
+        outputs.append(logits.float())
+        targets.append(labels)
+    if not outputs:
+        return torch.zeros(0, 0), torch.zeros(0, dtype=torch.long)
+    return torch.cat(outputs).cpu(), torch.cat(targets).cpu()
+
+
+@torch.no_grad()
+def evaluate(
+    model: nn.Module,
+    batches: Iterable[Tuple[torch.Tensor, torch.Tensor]],
+    criterion: nn.Module,
+    device,
+    speed: Optional[SpeedOptions] = None,
+) -> Tuple[float, float]:
+    """Returns (mean batch loss, accuracy in [0, 1]) of `model` over `batches`.
+
+    `model` is any callable returning logits (e.g. an onnxruntime wrapper); an nn.Module
+    should already be in eval mode.
+    """
+    speed = speed or SpeedOptions()
+    device_type = torch.device(device).type
+    loss_sum = torch.zeros((), device=device)
+    correct = torch.zeros((), dtype=torch.long, device=device)
+    total = 0
+    steps = 0
+    for images, labels in batches:
+        images, labels = to_device(images, labels, device)
+        with speed.autocast(device_type):
+            outputs = model(speed.prepare_input(images))
+            loss_sum += criterion(outputs, labels)
+        correct += (outputs.argmax(1) == labels).sum()
+        total += labels.size(0)
+        steps += 1
+    return loss_sum.item() / max(1, steps), correct.item() / max(1, total)
+
+
+@torch.no_grad()
+def latency_ms(model, sample: torch.Tensor, iterations: int = 20, warmup: int = 3) -> float:
+    """Median wall time of `model(sample)` in milliseconds."""
+    for _ in range(warmup):
+        model(sample)
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        model(sample)
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
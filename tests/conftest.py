@@ -1,6 +1,7 @@
 import sys
 from pathlib import Path
 
+import pytest
 
 # Allow tests to import the package without requiring an editable install.
 ROOT = Path(__file__).resolve().parents[1]
@@ -9,3 +10,77 @@ SRC = ROOT / "src"
 sys.path.insert(0, str(ROOT))
 sys.path.insert(0, str(SRC))
 
+
+def _image_folder(root, per_class=5):
+    import numpy as np
+    from PIL import Image
+
+    rng = np.random.default_rng(0)
+    for label in ("Clean", "Dusty"):
+        (root / label).mkdir(parents=True)
+        for i in range(per_class):
+            pixels = rng.integers(0, 256, (40, 50, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(root / label / f"{i}.png")
+    return root
+
+
+@pytest.fixture
+def model_checkpoint(tmp_path):
+    """Factory saving a randomly initialised 2-class `architecture` state_dict (seeded, so
+    reproducible) to `path`, by default `tmp_path / "model.pt"`, and returning the path."""
+    torch = pytest.importorskip("torch")
+    from solar_dust_detection.utils.model_registry import build_model
+
+    def make(architecture="resnet18", path=None, seed=0):
+        path = path or tmp_path / "model.pt"
+        torch.manual_seed(seed)
+        torch.save(build_model(architecture, num_classes=2).state_dict(), path)
+        return path
+
+    return make
+
+
+@pytest.fixture
+def make_training_config(tmp_path, model_checkpoint):
+    """Factory for a small TrainingConfig over 10 random images and a random ResNet18 base."""
+    from solar_dust_detection.entity.config_entity import TrainingConfig
+
+    def make(**overrides):
+        if not (tmp_path / "base.pt").exists():
+            model_checkpoint(path=tmp_path / "base.pt")
+            _image_folder(tmp_path / "data")
+        values = dict(
+            root_dir=tmp_path,
+            trained_model_path=tmp_path / "model.pt",
+            updated_base_model_path=tmp_path / "base.pt",
+            training_data=tmp_path / "data",
+            data_manifest_path=tmp_path / "manifest.json",
+            params_epochs=3,
+            params_batch_size=4,
+            params_is_augmentation=True,
+            params_image_size=[32, 32, 3],
+            params_learning_rate=0.01,
+            params_classes=2,
+            params_architecture="resnet18",
+            dataset_cache_dir=tmp_path / "dataset_cache",
+            params_num_workers=0,
+            params_prefetch_factor=2,
+            params_persistent_workers=False,
+            params_pin_memory=False,
+            feature_cache_dir=tmp_path / "features",
+            params_feature_cache=False,
+            params_feature_cache_views=3,
+            params_log_every_n_steps=0,
+            checkpoint_path=tmp_path / "checkpoint.pt",
+            params_checkpoint_every_n_epochs=1,
+            params_early_stopping_patience=0,
+            params_bf16=False,
+            params_channels_last=False,
+            params_compile=False,
+            params_intra_op_threads=0,
+            params_inter_op_threads=0,
+        )
+        values.update(overrides)
+        return TrainingConfig(**values)
+
+    return make
@@ -0,0 +1,35 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from solar_dust_detection.utils import acceleration  # noqa: E402
+from solar_dust_detection.utils.acceleration import SpeedOptions  # noqa: E402
+
+
+def test_options_from_env_and_unsupported_bf16_falls_back(monkeypatch):
+    monkeypatch.setenv("PREDICT_BF16", "true")
+    monkeypatch.setenv("PREDICT_CHANNELS_LAST", "1")
+    monkeypatch.setenv("PREDICT_INTRA_OP_THREADS", "2")
+    speed = SpeedOptions.from_env()
+    assert speed == SpeedOptions(bf16=True, channels_last=True, intra_op_threads=2)
+
+    monkeypatch.setattr(acceleration, "bf16_supported", lambda device_type="cpu": False)
+    assert speed.resolve("cpu") == SpeedOptions(channels_last=True, intra_op_threads=2)
+
+
+def test_channels_last_prediction_matches_fp32(tmp_path, monkeypatch, model_checkpoint):
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    model_checkpoint()
+    images = [torch.randint(0, 256, (3, 224, 224), dtype=torch.uint8) for _ in range(2)]
+
+    reference = PredictionPipeline(model_path=str(tmp_path / "model.pt"))._forward(images)
+    monkeypatch.setenv("PREDICT_CHANNELS_LAST", "1")
+    pipeline = PredictionPipeline(model_path=str(tmp_path / "model.pt"))
+    assert pipeline.model.conv1.weight.is_contiguous(memory_format=torch.channels_last)
+    torch.testing.assert_close(pipeline._forward(images), reference, atol=1e-4, rtol=1e-4)
+
+    if acceleration.bf16_supported("cpu"):
+        monkeypatch.setenv("PREDICT_BF16", "1")
+        bf16 = PredictionPipeline(model_path=str(tmp_path / "model.pt"))._forward(images)
+        assert all(out.dtype == torch.float32 for out in bf16)
+        torch.testing.assert_close(bf16, reference, atol=0.1, rtol=0.1)
@@ -1,15 +1,17 @@
 import base64
 
+import pytest
+
 
 def test_predict_missing_image_returns_400():
     from app import create_app
 
     class FakePipeline:
-        def __init__(self, filename, model_path=None):
+        def __init__(self, filename=None, model_path=None):
             self.filename = filename
             self.model_path = model_path
 
-        def predict(self):
+        def predict(self, image=None):
             return [{"image": "Clean"}]
 
     app = create_app(pipeline_cls=FakePipeline)
@@ -20,17 +22,14 @@ def test_predict_missing_image_returns_400():
     assert "error" in resp.get_json()
 
 
-def test_predict_happy_path_returns_label(monkeypatch, tmp_path):
-    # Ensure the server writes into a temp file location
-    monkeypatch.setenv("PREDICT_FILENAME", str(tmp_path / "in.jpg"))
-
+def test_predict_happy_path_returns_label():
     # Avoid loading real torch weights by swapping the PredictionPipeline class
     class FakePipeline:
-        def __init__(self, filename, model_path=None):
+        def __init__(self, filename=None, model_path=None):
             self.filename = filename
             self.model_path = model_path
 
-        def predict(self):
+        def predict(self, image=None):
             return [{"image": "Clean"}]
 
     from app import create_app
@@ -44,3 +43,142 @@ def test_predict_happy_path_returns_label(monkeypatch, tmp_path):
 
     assert resp.status_code == 200
     assert resp.get_json() == [{"image": "Clean"}]
+
+
+def test_predict_passes_decoded_bytes_without_touching_disk(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    received = []
+
+    class FakePipeline:
+        def __init__(self, filename=None, model_path=None):
+            self.model_path = model_path
+
+        def predict(self, image=None):
+            received.append(image)
+            return [{"image": "Dusty"}]
+
+    from app import create_app
+
+    client = create_app(pipeline_cls=FakePipeline).test_client()
+    image_bytes = b"\xff\xd8\xff fake jpeg payload"
+    payload = {"image": "data:image/jpeg;base64," + base64.b64encode(image_bytes).decode("utf-8")}
+    resp = client.post("/predict", json=payload)
+
+    assert resp.status_code == 200
+    assert received == [image_bytes]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_predict_undecodable_image_returns_400():
+    class FakePipeline:
+        def __init__(self, filename=None, model_path=None):
+            pass
+
+        def predict(self, image=None):
+            raise ValueError("Could not decode image data.")
+
+    from app import create_app
+
+    client = create_app(pipeline_cls=FakePipeline).test_client()
+    payload = {"image": base64.b64encode(b"garbage").decode("utf-8")}
+    resp = client.post("/predict", json=payload)
+
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+def test_predict_truncated_image_returns_400(monkeypatch, model_checkpoint):
+    pytest.importorskip("torch")
+    import io
+
+    from PIL import Image
+
+    from app import create_app
+
+    monkeypatch.setenv("MODEL_PATH", str(model_checkpoint()))
+
+    buf = io.BytesIO()
+    Image.new("RGB", (320, 240), "gray").save(buf, "JPEG")
+    truncated = buf.getvalue()[: len(buf.getvalue()) // 2]
+    client = create_app().test_client()
+    resp = client.post("/predict", json={"image": base64.b64encode(truncated).decode("utf-8")})
+
+    assert resp.status_code == 400
+    assert "error" in resp.get_json()
+
+
+class FakeBatchPipeline:
+    def __init__(self, filename=None, model_path=None):
+        self.batches = []
+
+    def predict(self, image=None):
+        return [{"image": "Clean"}]
+
+    def predict_batch(self, images):
+        self.batches.append(list(images))
+        return [{"image": "Clean", "probabilities": {"Clean": 1.0, "Dusty": 0.0}} for _ in images]
+
+
+def test_predict_batch_json_returns_results_in_input_order():
+    from app import create_app
+
+    pipelines = []
+
+    def factory(**kwargs):
+        pipelines.append(FakeBatchPipeline(**kwargs))
+        return pipelines[-1]
+
+    client = create_app(pipeline_cls=factory).test_client()
+    raw = [b"first", b"second", b"third"]
+    payload = {"images": [base64.b64encode(b).decode("utf-8") for b in raw]}
+    resp = client.post("/predict/batch", json=payload)
+
+    assert resp.status_code == 200
+    assert len(resp.get_json()["predictions"]) == 3
+    assert pipelines[0].batches == [raw]
+
+
+def test_predict_batch_multipart_upload():
+    import io
+
+    from app import create_app
+
+    pipelines = []
+
+    def factory(**kwargs):
+        pipelines.append(FakeBatchPipeline(**kwargs))
+        return pipelines[-1]
+
+    client = create_app(pipeline_cls=factory).test_client()
+    data = {"images": [(io.BytesIO(b"a"), "a.jpg"), (io.BytesIO(b"b"), "b.jpg")]}
+    resp = client.post("/predict/batch", data=data, content_type="multipart/form-data")
+
+    assert resp.status_code == 200
+    assert pipelines[0].batches == [[b"a", b"b"]]
+
+
+def test_predict_batch_rejects_missing_or_oversized_batches(monkeypatch):
+    monkeypatch.setenv("MAX_BATCH_IMAGES", "2")
+    from app import create_app
+
+    client = create_app(pipeline_cls=FakeBatchPipeline).test_client()
+
+    assert client.post("/predict/batch", json={}).status_code == 400
+    payload = {"images": [base64.b64encode(b"x").decode("utf-8")] * 3}
+    assert client.post("/predict/batch", json=payload).status_code == 413
+
+
+def test_health_reports_prediction_cache_counters():
+    class FakePipeline:
+        def __init__(self, filename=None, model_path=None):
+            self.model_path = model_path
+
+        def cache_stats(self):
+            return {"hits": 3, "misses": 1}
+
+    from app import create_app
+
+    resp = create_app(pipeline_cls=FakePipeline).test_client().get("/health")
+
+    assert resp.status_code == 200
+    assert resp.get_json() == {"status": "ok", "prediction_cache": {"hits": 3, "misses": 1}}
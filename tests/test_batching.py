@@ -0,0 +1,82 @@
+import threading
+import time
+
+import pytest
+
+from solar_dust_detection.pipeline.batching import _STOP, MicroBatcher
+
+
+def test_concurrent_submissions_share_a_batch_and_keep_their_results():
+    batch_sizes = []
+
+    def double(items):
+        batch_sizes.append(len(items))
+        return [2 * x for x in items]
+
+    batcher = MicroBatcher(double, max_batch_size=4, max_wait_ms=200)
+    try:
+        futures = [batcher.submit(i) for i in range(4)]
+        assert [f.result(timeout=2) for f in futures] == [0, 2, 4, 6]
+        assert batch_sizes == [4]
+    finally:
+        batcher.close()
+
+
+def test_partial_batch_is_flushed_after_max_wait():
+    batcher = MicroBatcher(lambda items: [x + 1 for x in items], max_batch_size=64, max_wait_ms=1)
+    try:
+        assert batcher(41, timeout=2) == 42
+    finally:
+        batcher.close()
+
+
+def test_batch_exception_is_raised_in_every_caller():
+    def boom(items):
+        raise RuntimeError("forward failed")
+
+    batcher = MicroBatcher(boom, max_batch_size=2, max_wait_ms=50)
+    try:
+        futures = [batcher.submit(i) for i in range(2)]
+        for f in futures:
+            with pytest.raises(RuntimeError, match="forward failed"):
+                f.result(timeout=2)
+    finally:
+        batcher.close()
+
+
+def test_submit_racing_close_is_still_processed():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=4, max_wait_ms=1)
+    closer = threading.Thread(target=batcher.close)
+    put = batcher._queue.put
+
+    def put_then_race_close(entry, *args, **kwargs):
+        # close() starts between submit's closed check and its put.
+        if entry is not _STOP and not closer.is_alive():
+            closer.start()
+            time.sleep(0.05)
+        put(entry, *args, **kwargs)
+
+    batcher._queue.put = put_then_race_close
+    future = batcher.submit(7)
+    closer.join(timeout=2)
+    assert future.result(timeout=2) == 7
+
+
+def test_after_fork_restarts_the_batcher_and_caps_threads(tmp_path, model_checkpoint):
+    torch = pytest.importorskip("torch")
+    from PIL import Image
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    pipeline = PredictionPipeline(model_path=str(model_checkpoint()), max_batch_size=4)
+    parent_batcher = pipeline.batcher
+    threads = torch.get_num_threads()
+    try:
+        pipeline.after_fork(num_threads=1)
+        assert torch.get_num_threads() == 1
+        assert pipeline.batcher is not parent_batcher
+        assert pipeline.predict(Image.new("RGB", (64, 64)))[0]["image"] in ("Clean", "Dusty")
+    finally:
+        torch.set_num_threads(threads)
+        parent_batcher.close()
+        pipeline.batcher.close()
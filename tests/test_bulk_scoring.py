@@ -0,0 +1,133 @@
+import csv
+import io
+
+import pytest
+
+pytest.importorskip("torch")
+from solar_dust_detection.pipeline.bulk_scoring import BulkScorer  # noqa: E402
+
+
+class FakePipeline:
+    def __init__(self, fail_after=None):
+        self.seen = []
+        self.fail_after = fail_after
+
+    def predict_batch(self, paths):
+        if self.fail_after is not None and len(self.seen) >= self.fail_after:
+            raise RuntimeError("simulated crash")
+        self.seen.extend(paths)
+        return [
+            {"error": "Could not decode image data."}
+            if p.name.startswith("bad")
+            else {"image": "Dusty", "probabilities": {"Clean": 0.25, "Dusty": 0.75}}
+            for p in paths
+        ]
+
+
+def _tree(root):
+    for sub in ("b", "a"):
+        (root / sub).mkdir(parents=True)
+        for i in range(3):
+            (root / sub / f"{i}.jpg").write_bytes(b"x")
+    (root / "a" / "notes.txt").write_text("skip me")
+    (root / "bad.png").write_bytes(b"x")
+    return root
+
+
+def _read_rows(output):
+    rows = []
+    for shard in sorted(output.glob("shard-*.csv")):
+        with open(shard, newline="") as f:
+            rows.extend(csv.DictReader(f))
+    return rows
+
+
+def test_scores_tree_into_shards_and_resumes_after_a_crash(tmp_path):
+    source = _tree(tmp_path / "images")
+    output = tmp_path / "scores"
+
+    crashing = FakePipeline(fail_after=4)
+    with pytest.raises(RuntimeError):
+        BulkScorer(crashing, output, shard_size=2, block_size=2, out=io.StringIO()).score(source)
+    assert len(_read_rows(output)) == 4
+
+    resumed = FakePipeline()
+    checkpoint = BulkScorer(resumed, output, shard_size=2, block_size=2, out=io.StringIO()).score(source)
+
+    rows = _read_rows(output)
+    assert checkpoint["done"] == 7
+    assert checkpoint["shards"] == 4
+    assert len(resumed.seen) == 3  # only the unscored tail
+    assert [r["path"].split("images/")[1] for r in rows] == [
+        "a/0.jpg", "a/1.jpg", "a/2.jpg", "b/0.jpg", "b/1.jpg", "b/2.jpg", "bad.png",
+    ]
+    assert rows[0]["label"] == "Dusty"
+    assert float(rows[0]["prob_Dusty"]) == 0.75
+    assert rows[-1]["error"] and not rows[-1]["label"]
+
+
+def test_checkpoint_from_another_run_is_rejected(tmp_path):
+    source = _tree(tmp_path / "images")
+    output = tmp_path / "scores"
+    BulkScorer(FakePipeline(), output, shard_size=2, out=io.StringIO()).score(source)
+
+    with pytest.raises(ValueError, match="different run"):
+        BulkScorer(FakePipeline(), output, shard_size=3, out=io.StringIO()).score(source)
+
+
+def test_cli_scores_a_file_list_with_the_real_pipeline(tmp_path, capsys, model_checkpoint):
+    from PIL import Image
+
+    from solar_dust_detection.cli import main
+
+    model_checkpoint()
+    paths = []
+    for i, color in enumerate(("white", "black")):
+        paths.append(tmp_path / f"{i}.png")
+        Image.new("RGB", (64, 48), color).save(paths[-1])
+    file_list = tmp_path / "images.txt"
+    file_list.write_text("\n".join(str(p) for p in paths) + "\n")
+
+    assert main(["score", str(file_list), "-o", str(tmp_path / "out"), "--model-path", str(tmp_path / "model.pt")]) == 0
+
+    rows = _read_rows(tmp_path / "out")
+    assert [r["path"] for r in rows] == [str(p) for p in paths]
+    assert all(r["label"] in ("Clean", "Dusty") for r in rows)
+    assert "images/sec" in capsys.readouterr().err
+
+
+class UnreadablePipeline(FakePipeline):
+    def predict_batch(self, paths):
+        for p in paths:
+            if not p.exists():
+                raise FileNotFoundError(f"No such file: {p}")
+        return super().predict_batch(paths)
+
+
+def test_unreadable_inputs_are_errors_and_the_run_finishes(tmp_path, model_checkpoint):
+    from PIL import Image
+
+    good, truncated, missing = tmp_path / "good.jpg", tmp_path / "truncated.jpg", tmp_path / "missing.jpg"
+    Image.new("RGB", (64, 48), "white").save(good)
+    data = good.read_bytes()
+    truncated.write_bytes(data[: len(data) // 2])
+    file_list = tmp_path / "images.txt"
+    file_list.write_text(f"{good}\n{truncated}\n{missing}\n")
+
+    # The fake raises for the whole block; the real pipeline reports per item.
+    scorer = BulkScorer(UnreadablePipeline(), tmp_path / "fake", block_size=3, out=io.StringIO())
+    assert scorer.score(file_list)["done"] == 3
+    assert [bool(r["error"]) for r in _read_rows(tmp_path / "fake")] == [False, False, True]
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    pipeline = PredictionPipeline(model_path=str(model_checkpoint()))
+    output = tmp_path / "real"
+    checkpoint = BulkScorer(pipeline, output, block_size=3, out=io.StringIO()).score(file_list)
+
+    rows = _read_rows(output)
+    assert checkpoint["done"] == 3
+    assert rows[0]["label"] in ("Clean", "Dusty") and not rows[0]["error"]
+    assert rows[1]["error"] and rows[2]["error"]
+    # A rerun resumes past the unreadable files instead of failing on them again.
+    assert BulkScorer(pipeline, output, block_size=3, out=io.StringIO()).score(file_list)["shards"] == 1
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from solar_dust_detection.utils.classification_metrics import (
+    classification_report,
+    confusion_matrix,
+    precision_recall_curve,
+    roc_curve,
+    softmax,
+    threshold_sweep,
+)
+
+
+def _data(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, 2, n)
+    # Quantized logits so that several samples share a score (ties must be grouped).
+    logits = np.round(rng.normal(size=(n, 2)) + np.eye(2)[labels], 1)
+    return logits, labels
+
+
+def test_confusion_matrix_and_per_class_metrics_match_a_loop():
+    logits, labels = _data()
+    predictions = logits.argmax(1)
+    expected = np.zeros((2, 2), dtype=int)
+    for true, predicted in zip(labels, predictions, strict=True):
+        expected[true, predicted] += 1
+    np.testing.assert_array_equal(confusion_matrix(labels, predictions, 2), expected)
+
+    report = classification_report(logits, labels, ["Clean", "Dusty"])
+    assert report["confusion_matrix"] == expected.tolist()
+    assert report["accuracy"] == pytest.approx(np.trace(expected) / len(labels))
+    dusty = report["per_class"]["Dusty"]
+    assert dusty["precision"] == pytest.approx(expected[1, 1] / expected[:, 1].sum())
+    assert dusty["recall"] == pytest.approx(expected[1, 1] / expected[1].sum())
+    assert dusty["support"] == int((labels == 1).sum())
+
+
+def test_roc_auc_equals_the_pairwise_ranking_probability():
+    logits, labels = _data()
+    report = classification_report(logits, labels, ["Clean", "Dusty"])
+    scores = softmax(logits)[:, 1]
+    positives, negatives = scores[labels == 1], scores[labels == 0]
+    pairs = positives[:, None] - negatives[None, :]
+    expected = ((pairs > 0).sum() + 0.5 * (pairs == 0).sum()) / pairs.size
+    assert report["roc_auc"] == pytest.approx(expected)
+
+    fpr, tpr, _ = roc_curve(labels == 1, scores)
+    assert (fpr[0], tpr[0], fpr[-1], tpr[-1]) == (0, 0, 1, 1)
+    assert np.all(np.diff(fpr) >= 0) and np.all(np.diff(tpr) >= 0)
+
+
+def test_curves_and_threshold_sweep_match_per_threshold_counts():
+    logits, labels = _data(seed=1)
+    scores = softmax(logits)[:, 1]
+    is_positive = labels == 1
+
+    precision, recall, thresholds = precision_recall_curve(is_positive, scores)
+    for p, r, t in zip(precision, recall, thresholds, strict=True):
+        predicted = scores >= t
+        assert p == pytest.approx((predicted & is_positive).sum() / predicted.sum())
+        assert r == pytest.approx((predicted & is_positive).sum() / is_positive.sum())
+
+    sweep = threshold_sweep(is_positive, scores, [0.0, 0.3, 0.5, 0.7, 1.0])
+    for i, t in enumerate(sweep["threshold"]):
+        predicted = scores >= t
+        assert sweep["accuracy"][i] == pytest.approx((predicted == is_positive).mean())
+        assert sweep["false_positive_rate"][i] == pytest.approx((predicted & ~is_positive).sum() / (~is_positive).sum())
+    assert sweep["recall"][0] == 1.0 and sweep["precision"][-1] == 0.0
+
+
+def test_report_curves_are_json_ready():
+    logits, labels = _data(n=20)
+    report = classification_report(logits, labels, ["Clean", "Dusty"], positive_class="Clean", curves=True)
+    assert report["positive_class"] == "Clean"
+    assert len(report["roc_curve"]["fpr"]) == len(report["roc_curve"]["threshold"])
+    assert report["roc_curve"]["threshold"][0] is None
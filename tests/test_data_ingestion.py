@@ -0,0 +1,102 @@
+import hashlib
+import io
+import zipfile
+
+import numpy as np
+import pytest
+
+pytest.importorskip("torch")
+from PIL import Image  # noqa: E402
+from torchvision import datasets  # noqa: E402
+
+from solar_dust_detection.components.data_ingestion import DataIngestion  # noqa: E402
+from solar_dust_detection.entity.config_entity import DataIngestionConfig  # noqa: E402
+from solar_dust_detection.utils.image_folder import ManifestImageFolder, image_folder  # noqa: E402
+from solar_dust_detection.utils.manifest import read_manifest  # noqa: E402
+
+
+def _png(seed):
+    rng = np.random.default_rng(seed)
+    buf = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, (8, 8, 3), dtype=np.uint8)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _archive(path, members):
+    with zipfile.ZipFile(path, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return path
+
+
+def _config(tmp_path, source, sha256=""):
+    out = tmp_path / "artifacts"
+    return DataIngestionConfig(
+        root_dir=out,
+        source_URL=source,
+        local_data_file=out / "data.zip",
+        unzipped_data_dir=out,
+        source_sha256=sha256,
+        manifest_path=out / "manifest.json",
+    )
+
+
+MEMBERS = {
+    "Detect_solar_dust/Clean/b.png": _png(0),
+    "Detect_solar_dust/Clean/a.png": _png(1),
+    "Detect_solar_dust/Dusty/x/c.png": _png(2),
+    "Detect_solar_dust/Dusty/d.png": _png(3),
+}
+
+
+def test_ingests_file_url_and_manifest_replaces_image_folder(tmp_path):
+    archive = _archive(tmp_path / "source.zip", MEMBERS)
+    config = _config(tmp_path, archive.as_uri())
+    ingestion = DataIngestion(config)
+    ingestion.download_data()
+    ingestion.extract_zip_file(num_workers=2)
+
+    manifest = read_manifest(config.manifest_path)
+    assert {e["path"] for e in manifest["files"]} == set(MEMBERS)
+    for entry in manifest["files"]:
+        assert entry["sha256"] == hashlib.sha256(MEMBERS[entry["path"]]).hexdigest()
+        assert entry["size"] == len(MEMBERS[entry["path"]])
+    assert {e["label"] for e in manifest["files"]} == {"Clean", "Dusty"}
+
+    root = config.unzipped_data_dir / "Detect_solar_dust"
+    folder = image_folder(root, config.manifest_path)
+    walked = datasets.ImageFolder(root=root)
+    assert isinstance(folder, ManifestImageFolder)
+    assert folder.classes == walked.classes
+    assert folder.samples == walked.samples
+    assert folder.sha256[0] == hashlib.sha256(MEMBERS["Detect_solar_dust/Clean/a.png"]).hexdigest()
+
+
+def test_reingestion_only_touches_changed_members(tmp_path):
+    archive = _archive(tmp_path / "source.zip", MEMBERS)
+    config = _config(tmp_path, str(archive))
+    DataIngestion(config).download_data()
+    DataIngestion(config).extract_zip_file()
+    out = config.unzipped_data_dir
+    unchanged = out / "Detect_solar_dust/Clean/a.png"
+    mtime = unchanged.stat().st_mtime_ns
+
+    updated = dict(MEMBERS)
+    updated["Detect_solar_dust/Clean/b.png"] = _png(10)
+    del updated["Detect_solar_dust/Dusty/d.png"]
+    _archive(archive, updated)
+    DataIngestion(config).download_data()
+    DataIngestion(config).extract_zip_file()
+
+    assert unchanged.stat().st_mtime_ns == mtime
+    assert (out / "Detect_solar_dust/Clean/b.png").read_bytes() == updated["Detect_solar_dust/Clean/b.png"]
+    assert not (out / "Detect_solar_dust/Dusty/d.png").exists()
+    assert len(read_manifest(config.manifest_path)["files"]) == 3
+
+
+def test_checksum_mismatch_fails(tmp_path):
+    archive = _archive(tmp_path / "source.zip", MEMBERS)
+    ingestion = DataIngestion(_config(tmp_path, str(archive), sha256="0" * 64))
+    ingestion.download_data()
+    with pytest.raises(ValueError, match="Checksum mismatch"):
+        ingestion.extract_zip_file()
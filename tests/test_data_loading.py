@@ -0,0 +1,34 @@
+from types import SimpleNamespace
+
+from solar_dust_detection.utils import data_loading
+from solar_dust_detection.utils.data_loading import dataloader_kwargs, resolve_num_workers
+
+
+def _config(num_workers, pin_memory="auto"):
+    return SimpleNamespace(
+        params_num_workers=num_workers,
+        params_prefetch_factor=4,
+        params_persistent_workers=True,
+        params_pin_memory=pin_memory,
+    )
+
+
+def test_auto_workers_leave_a_core_for_the_main_process(monkeypatch):
+    monkeypatch.setattr(data_loading, "available_cores", lambda: 4)
+    assert resolve_num_workers("auto") == 3
+    monkeypatch.setattr(data_loading, "available_cores", lambda: 1)
+    assert resolve_num_workers("auto") == 0
+    monkeypatch.setattr(data_loading, "available_cores", lambda: 64)
+    assert resolve_num_workers("auto") == 8
+    assert resolve_num_workers(2) == 2
+
+
+def test_worker_only_options_are_dropped_without_workers():
+    assert dataloader_kwargs(_config(0), "cpu") == {"num_workers": 0, "pin_memory": False}
+    assert dataloader_kwargs(_config(2), "cuda") == {
+        "num_workers": 2,
+        "pin_memory": True,
+        "prefetch_factor": 4,
+        "persistent_workers": True,
+    }
+    assert dataloader_kwargs(_config(2, pin_memory=False), "cuda")["pin_memory"] is False
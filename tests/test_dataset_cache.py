@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+from PIL import Image  # noqa: E402
+from torchvision import datasets  # noqa: E402
+
+from solar_dust_detection.components.dataset_cache import (  # noqa: E402
+    CachedImageDataset,
+    DatasetCache,
+)
+from solar_dust_detection.entity.config_entity import DatasetCacheConfig  # noqa: E402
+from solar_dust_detection.utils.preprocessing import ImagePreprocessor  # noqa: E402
+
+
+def _image_folder(root):
+    rng = np.random.default_rng(0)
+    for label in ("Clean", "Dusty"):
+        (root / label).mkdir(parents=True)
+        for i in range(3):
+            pixels = rng.integers(0, 256, (40 + 10 * i, 50, 3), dtype=np.uint8)
+            Image.fromarray(pixels).save(root / label / f"{i}.png")
+    return root
+
+
+def test_cache_matches_image_folder_order_and_pixels(tmp_path):
+    data = _image_folder(tmp_path / "data")
+    config = DatasetCacheConfig(
+        root_dir=tmp_path / "cache",
+        training_data=data,
+        data_manifest_path=tmp_path / "manifest.json",
+        params_image_size=[32, 32, 3],
+    )
+    DatasetCache(config).build(num_workers=2)
+
+    cached = CachedImageDataset.open_if_fresh(config.root_dir, (32, 32), data)
+    folder = datasets.ImageFolder(root=data)
+    preprocessor = ImagePreprocessor(size=(32, 32))
+
+    assert cached is not None
+    assert len(cached) == len(folder) == 6
+    assert cached.classes == folder.classes
+    for i, (path, label) in enumerate(folder.samples):
+        image, cached_label = cached[i]
+        assert cached_label == label
+        assert torch.equal(image, preprocessor.load(path))
+
+
+def test_cache_is_ignored_once_the_source_changes(tmp_path):
+    data = _image_folder(tmp_path / "data")
+    config = DatasetCacheConfig(
+        root_dir=tmp_path / "cache",
+        training_data=data,
+        data_manifest_path=tmp_path / "manifest.json",
+        params_image_size=[32, 32, 3],
+    )
+    DatasetCache(config).build(num_workers=1)
+
+    Image.new("RGB", (20, 20)).save(data / "Dusty" / "new.png")
+
+    assert CachedImageDataset.open_if_fresh(config.root_dir, (32, 32), data) is None
+    assert CachedImageDataset.open_if_fresh(config.root_dir, (64, 64), data) is None
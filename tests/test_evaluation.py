@@ -0,0 +1,89 @@
+import json
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+from conftest import _image_folder  # noqa: E402
+
+from solar_dust_detection.components.model_evaluation_mlflow import Evaluation  # noqa: E402
+from solar_dust_detection.entity.config_entity import EvaluationConfig  # noqa: E402
+from solar_dust_detection.utils.prediction_log import load_prediction_log  # noqa: E402
+
+
+@pytest.fixture
+def evaluation(tmp_path, monkeypatch, model_checkpoint):
+    monkeypatch.chdir(tmp_path)  # scores.json is written to the working directory
+    model_checkpoint()
+    _image_folder(tmp_path / "data")
+    config = EvaluationConfig(
+        root_dir=tmp_path / "evaluation",
+        path_of_model=tmp_path / "model.pt",
+        prediction_log_path=tmp_path / "evaluation" / "predictions.npz",
+        split_manifest_path=tmp_path / "evaluation" / "split.json",
+        metrics_path=tmp_path / "evaluation" / "metrics.json",
+        training_data=tmp_path / "data",
+        data_manifest_path=tmp_path / "manifest.json",
+        dataset_cache_dir=tmp_path / "dataset_cache",
+        all_params={},
+        mlflow_uri="",
+        params_image_size=[32, 32, 3],
+        params_batch_size=2,
+        params_classes=2,
+        params_architecture="resnet18",
+        params_num_workers=0,
+        params_prefetch_factor=2,
+        params_persistent_workers=False,
+        params_pin_memory=False,
+        params_bf16=False,
+        params_channels_last=False,
+        params_compile=False,
+        params_intra_op_threads=0,
+        params_inter_op_threads=0,
+    )
+    return lambda: Evaluation(config)
+
+
+def test_one_pass_writes_prediction_log_and_metrics(evaluation, tmp_path):
+    run = evaluation()
+    run.evaluation()
+
+    log = load_prediction_log(tmp_path / "evaluation" / "predictions.npz")
+    assert log["classes"] == ["Clean", "Dusty"]
+    assert log["logits"].shape == (3, 2) and log["logits"].dtype == np.float32
+    assert [p.split("/")[0] for p in log["path"]] == [["Clean", "Dusty"][y] for y in log["label"]]
+    assert list(log["index"]) == run.val_indices
+
+    # The metrics come from the log and agree with the scores of the same pass.
+    scores = json.loads((tmp_path / "scores.json").read_text())
+    metrics = json.loads((tmp_path / "evaluation" / "metrics.json").read_text())
+    assert metrics["samples"] == 3
+    assert metrics["accuracy"] == pytest.approx(scores["accuracy"])
+    assert np.sum(metrics["confusion_matrix"]) == 3
+
+
+def test_split_manifest_is_reused_until_the_dataset_changes(evaluation, tmp_path):
+    first = evaluation()
+    first._valid_generator()
+
+    torch.manual_seed(123)
+    second = evaluation()
+    second._valid_generator()
+    assert second.val_indices == first.val_indices
+    assert second.train_subset.indices == first.train_subset.indices
+
+    (tmp_path / "data" / "Dusty" / "5.png").write_bytes((tmp_path / "data" / "Dusty" / "0.png").read_bytes())
+    third = evaluation()
+    third._valid_generator()
+    split = json.loads((tmp_path / "evaluation" / "split.json").read_text())
+    assert split["samples"] == 11
+    assert sorted(split["train"] + split["val"]) == list(range(11))
+
+
+def test_registered_model_name_follows_the_architecture(evaluation):
+    import dataclasses
+
+    run = evaluation()
+    assert run.registered_model_name() == "ResNet18Model"
+    run.config = dataclasses.replace(run.config, params_architecture="mobilenet_v3_small")
+    assert run.registered_model_name() == "MobileNetV3SmallModel"
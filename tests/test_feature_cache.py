@@ -0,0 +1,72 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+import torch.nn as nn  # noqa: E402
+
+from solar_dust_detection.components import model_training  # noqa: E402
+from solar_dust_detection.components.feature_cache import FeatureCache  # noqa: E402
+from solar_dust_detection.components.model_training import Training  # noqa: E402
+
+
+def _training(config):
+    training = Training(config)
+    training.get_base_model()
+    training.train_valid_generator()
+    return training
+
+
+def test_head_training_only_changes_fc_and_reuses_the_cache(make_training_config, monkeypatch):
+    config = make_training_config(params_feature_cache=True)
+    training = _training(config)
+    training.train()
+
+    base = torch.load(config.updated_base_model_path)
+    trained = torch.load(config.trained_model_path)
+    for name, tensor in base.items():
+        changed = not torch.equal(tensor, trained[name])
+        assert changed == name.startswith("fc."), name
+
+    def fail(*args, **kwargs):
+        raise AssertionError("features should come from the cache")
+
+    monkeypatch.setattr(FeatureCache, "extract", staticmethod(fail))
+    features, labels = _training(config).cached_train_features()
+    assert features.shape == (8, 3, 512)
+    assert len(labels) == 8
+
+
+def test_unaugmented_view_matches_the_backbone(make_training_config):
+    training = _training(make_training_config(params_feature_cache=True, params_is_augmentation=False))
+    features, _ = training.cached_train_features()
+    assert features.shape[1] == 1
+
+    subset = training.train_subset
+    images = torch.stack([training.val_transforms(subset[i][0]) for i in range(len(subset))])
+    training.model.fc = nn.Identity()
+    training.model.eval()
+    with torch.no_grad():
+        expected = training.model(training.preprocessor.normalize(images))
+    torch.testing.assert_close(features[:, 0], expected)
+
+
+def test_head_training_validates_early_stops_and_exports_the_best_epoch(make_training_config, monkeypatch):
+    config = make_training_config(
+        params_feature_cache=True, params_epochs=10, params_early_stopping_patience=2
+    )
+    val_losses = iter([1.0, 0.5, 0.6, 0.7, 0.4])
+    snapshots = []
+    evaluate = model_training.evaluate
+
+    def fake_evaluate(head, batches, *args, **kwargs):
+        evaluate(head, batches, *args, **kwargs)  # the head scores cached feature rows
+        snapshots.append({k: v.clone() for k, v in head.state_dict().items()})
+        return next(val_losses), 0.5
+
+    monkeypatch.setattr(model_training, "evaluate", fake_evaluate)
+    _training(config).train()
+
+    assert len(snapshots) == 4  # stopped two epochs after the best one
+    exported = torch.load(config.trained_model_path)
+    torch.testing.assert_close(exported["fc.weight"], snapshots[1]["weight"])
+    torch.testing.assert_close(exported["fc.bias"], snapshots[1]["bias"])
+    assert not config.checkpoint_path.exists()
@@ -0,0 +1,56 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ROOT, SRC
+
+STAGES = [f"solar_dust_detection.pipeline.stage_0{i}_{name}" for i, name in (
+    (1, "data_ingestion"), (2, "base_model"), (3, "model_training"), (4, "model_evaluation_mlflow"),
+    (5, "model_export"), (6, "model_quantization"), (7, "dataset_cache"), (8, "model_distillation"),
+    (9, "distillation_evaluation"),
+)]
+
+
+def _loaded_after_import(modules, cwd):
+    code = (
+        "import json, sys\n"
+        f"for m in {modules!r}: __import__(m)\n"
+        "print(json.dumps(sorted(m.split('.')[0] for m in sys.modules)))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join([str(SRC), str(ROOT)])},
+    ).stdout
+    return set(json.loads(out))
+
+
+def test_package_cli_config_and_stage_modules_import_without_side_effects(tmp_path):
+    modules = [
+        "solar_dust_detection",
+        "solar_dust_detection.cli",
+        "solar_dust_detection.config.configuration",
+        "solar_dust_detection.pipeline.runner",
+        *STAGES,
+    ]
+    loaded = _loaded_after_import(modules, tmp_path)
+    assert not loaded & {"torch", "torchvision", "mlflow", "gdown", "dvc", "joblib"}
+    assert not (tmp_path / "logs").exists()
+
+
+def test_serving_never_imports_training_only_dependencies(tmp_path):
+    loaded = _loaded_after_import(["app", "solar_dust_detection.pipeline.prediction"], tmp_path)
+    assert "torch" in loaded
+    assert not loaded & {"mlflow", "gdown", "dvc", "dotenv"}
+
+
+def test_every_stage_module_has_an_import_budget():
+    budgets = json.loads((ROOT / "benchmarks" / "import_budget.json").read_text())
+    stage_files = sorted((SRC / "solar_dust_detection" / "pipeline").glob("stage_*.py"))
+    modules = {f"solar_dust_detection.pipeline.{path.stem}" for path in stage_files}
+    assert modules == set(STAGES)
+    assert modules <= set(budgets)
@@ -0,0 +1,119 @@
+import base64
+import threading
+import time
+
+
+def _wait_for(client, job_id, status, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = client.get(f"/jobs/{job_id}").get_json()
+        if job["status"] == status:
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} never reached {status}: {job}")
+
+
+class EchoPipeline:
+    chunk_size = 2
+
+    def __init__(self, filename=None, model_path=None):
+        self.model_path = model_path
+
+    def predict_batch(self, images):
+        return [{"image": image.decode() if isinstance(image, bytes) else "file"} for image in images]
+
+
+def test_job_runs_in_background_and_reports_results_in_order(monkeypatch):
+    from app import create_app
+
+    client = create_app(pipeline_cls=EchoPipeline).test_client()
+    images = [base64.b64encode(f"img{i}".encode()).decode() for i in range(5)]
+
+    resp = client.post("/jobs", json={"images": images})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["id"]
+    assert resp.headers["Location"] == f"/jobs/{job_id}"
+
+    job = _wait_for(client, job_id, "done")
+    assert job["total"] == job["done"] == 5
+    assert job["progress"] == 1.0
+    assert [r["image"] for r in job["results"]] == [f"img{i}" for i in range(5)]
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_full_job_queue_returns_429(monkeypatch):
+    release = threading.Event()
+
+    class BlockingPipeline(EchoPipeline):
+        def predict_batch(self, images):
+            release.wait(5)
+            return super().predict_batch(images)
+
+    monkeypatch.setenv("JOBS_MAX_QUEUED", "1")
+    from app import create_app
+
+    client = create_app(pipeline_cls=BlockingPipeline).test_client()
+    body = {"images": [base64.b64encode(b"x").decode()]}
+    try:
+        running = client.post("/jobs", json=body).get_json()["id"]
+        _wait_for(client, running, "running")
+        assert client.post("/jobs", json=body).status_code == 202  # fills the one queue slot
+        resp = client.post("/jobs", json=body)
+        assert resp.status_code == 429
+        assert "Retry-After" in resp.headers
+    finally:
+        release.set()
+
+
+def test_path_jobs_are_confined_to_the_input_root(monkeypatch, tmp_path):
+    (tmp_path / "site" / "cam1").mkdir(parents=True)
+    for name in ("b.jpg", "a.png", "notes.txt"):
+        (tmp_path / "site" / "cam1" / name).write_bytes(b"data")
+    monkeypatch.setenv("JOBS_INPUT_ROOT", str(tmp_path / "site"))
+    from app import create_app
+
+    client = create_app(pipeline_cls=EchoPipeline).test_client()
+
+    job_id = client.post("/jobs", json={"path": "cam1"}).get_json()["id"]
+    job = _wait_for(client, job_id, "done")
+    assert [r["path"].rsplit("/", 1)[1] for r in job["results"]] == ["a.png", "b.jpg"]
+    assert client.post("/jobs", json={"path": "../"}).status_code == 400
+
+
+def test_queued_image_bytes_are_capped(monkeypatch):
+    release = threading.Event()
+
+    class BlockingPipeline(EchoPipeline):
+        def predict_batch(self, images):
+            release.wait(5)
+            return super().predict_batch(images)
+
+    monkeypatch.setenv("JOBS_MAX_QUEUED_BYTES", "10")
+    from app import create_app
+
+    client = create_app(pipeline_cls=BlockingPipeline).test_client()
+    try:
+        assert client.post("/jobs", json={"images": [base64.b64encode(b"x" * 11).decode()]}).status_code == 413
+        # Refused from Content-Length alone.
+        assert client.post("/jobs", data=b"x" * (2 * 1024 * 1024)).status_code == 413
+        running = client.post("/jobs", json={"images": [base64.b64encode(b"x" * 6).decode()]})
+        assert running.status_code == 202
+        # A free job slot is not enough once the bytes are used up.
+        resp = client.post("/jobs", json={"images": [base64.b64encode(b"x" * 6).decode()]})
+        assert resp.status_code == 429
+    finally:
+        release.set()
+    _wait_for(client, running.get_json()["id"], "done")
+    assert client.post("/jobs", json={"images": [base64.b64encode(b"x" * 6).decode()]}).status_code == 202
+
+
+def test_job_store_reconnects_after_fork(monkeypatch, tmp_path):
+    from solar_dust_detection.pipeline import jobs
+    from solar_dust_detection.pipeline.jobs import JobStore
+
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.create("a", 1)
+    parent_conn = store._conn
+    monkeypatch.setattr(jobs.os, "getpid", lambda: -1)  # as seen from a forked worker
+    assert store._conn is not parent_conn
+    assert store.get("a")["status"] == "queued"
@@ -0,0 +1,53 @@
+import base64
+
+from solar_dust_detection.pipeline.metrics import Counter, Histogram, Registry
+
+
+def test_histogram_and_counter_render_prometheus_text():
+    registry = Registry()
+    latency = registry.register(Histogram("t_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0)))
+    errors = registry.register(Counter("t_errors_total", "Errors.", ("kind",)))
+    latency.observe(0.05, "forward")
+    latency.observe(0.1, "forward")
+    latency.observe(3.0, "forward")
+    errors.inc("internal")
+    errors.inc("internal", amount=2)
+
+    assert registry.render().splitlines() == [
+        "# HELP t_seconds Latency.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{stage="forward",le="0.1"} 2',
+        't_seconds_bucket{stage="forward",le="1"} 2',
+        't_seconds_bucket{stage="forward",le="+Inf"} 3',
+        't_seconds_sum{stage="forward"} 3.15',
+        't_seconds_count{stage="forward"} 3',
+        "# HELP t_errors_total Errors.",
+        "# TYPE t_errors_total counter",
+        't_errors_total{kind="internal"} 3',
+    ]
+
+
+def test_metrics_endpoint_reports_requests_stages_and_errors():
+    class FakePipeline:
+        def __init__(self, filename=None, model_path=None):
+            self.model_path = model_path
+
+        def predict(self, image=None):
+            return [{"image": "Clean"}]
+
+    from app import create_app
+
+    client = create_app(pipeline_cls=FakePipeline).test_client()
+    client.post("/predict", json={"image": base64.b64encode(b"bytes").decode()})
+    client.post("/predict", json={})
+
+    resp = client.get("/metrics")
+    body = resp.get_data(as_text=True)
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "text/plain"
+    assert 'solar_dust_requests_total{endpoint="/predict",status="200"}' in body
+    assert 'solar_dust_errors_total{endpoint="/predict",kind="invalid_input"}' in body
+    assert 'solar_dust_stage_seconds_count{stage="base64_decode"}' in body
+    assert 'solar_dust_request_seconds_count{endpoint="/predict"}' in body
+    assert "solar_dust_batcher_queue_depth 0" in body
@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+torch = pytest.importorskip("torch")
+import torch.nn.functional as F  # noqa: E402
+from PIL import Image  # noqa: E402
+
+from solar_dust_detection.components.distillation_evaluation import (  # noqa: E402
+    DistillationEvaluation,
+)
+from solar_dust_detection.components.feature_cache import FeatureCache  # noqa: E402
+from solar_dust_detection.components.model_distillation import (  # noqa: E402
+    ModelDistillation,
+    distillation_loss,
+)
+from solar_dust_detection.components.model_evaluation_mlflow import Evaluation  # noqa: E402
+from solar_dust_detection.components.model_training import Training  # noqa: E402
+from solar_dust_detection.entity.config_entity import (  # noqa: E402
+    EvaluationConfig,
+    ModelDistillationConfig,
+)
+from solar_dust_detection.pipeline.prediction import PredictionPipeline  # noqa: E402
+
+
+def _distillation(make_training_config, tmp_path):
+    training_config = make_training_config()
+    config = ModelDistillationConfig(
+        root_dir=tmp_path / "distillation",
+        teacher_model_path=training_config.updated_base_model_path,
+        teacher_logits_dir=tmp_path / "distillation" / "teacher_logits",
+        student_model_path=tmp_path / "distillation" / "student.pt",
+        student_torchscript_path=tmp_path / "distillation" / "student.ts",
+        scores_path=tmp_path / "distillation" / "scores.json",
+        comparison_path=tmp_path / "distillation" / "comparison.json",
+        params_student_architecture="mobilenet_v3_small",
+        params_weights="none",
+        params_epochs=2,
+        params_learning_rate=0.01,
+        params_temperature=4.0,
+        params_alpha=0.7,
+        params_image_size=[32, 32, 3],
+        params_classes=2,
+    )
+    config.root_dir.mkdir(exist_ok=True)
+    training = Training(training_config)
+    distillation = ModelDistillation(config, training)
+    distillation.load_teacher()
+    training.train_valid_generator()
+    return distillation
+
+
+def test_loss_reduces_to_cross_entropy_and_matches_the_teacher():
+    torch.manual_seed(0)
+    student, teacher = torch.randn(6, 2), torch.randn(6, 2)
+    labels = torch.tensor([0, 1, 0, 1, 1, 0])
+    hard = F.cross_entropy(student, labels)
+    torch.testing.assert_close(distillation_loss(student, teacher, labels, 4.0, 0.0), hard)
+    # Matching the teacher exactly leaves only the hard-label term.
+    torch.testing.assert_close(
+        distillation_loss(teacher, teacher, labels, 4.0, 0.7), 0.3 * F.cross_entropy(teacher, labels)
+    )
+
+
+def test_student_is_a_drop_in_and_the_teacher_runs_once(make_training_config, tmp_path, monkeypatch):
+    distillation = _distillation(make_training_config, tmp_path)
+    distillation.train()
+    distillation.export()
+
+    scores = json.loads((tmp_path / "distillation" / "scores.json").read_text())
+    assert scores["student_params"] < scores["teacher_params"]
+
+    images = [Image.new("RGB", (64, 48), color) for color in ("white", "black")]
+    eager = PredictionPipeline(model_path=str(tmp_path / "distillation" / "student.pt"))
+    scripted = PredictionPipeline(model_path=str(tmp_path / "distillation" / "student.ts"))
+    for a, b in zip(eager.predict_batch(images), scripted.predict_batch(images), strict=True):
+        assert a["probabilities"] == pytest.approx(b["probabilities"], abs=1e-4)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("teacher logits should come from the cache")
+
+    monkeypatch.setattr(FeatureCache, "extract", staticmethod(fail))
+    logits, labels = _distillation(make_training_config, tmp_path).teacher_logits()
+    assert logits.shape == (8, 2) and len(labels) == 8
+
+
+def test_student_is_compared_against_the_teacher_in_its_own_stage(make_training_config, tmp_path):
+    distillation = _distillation(make_training_config, tmp_path)
+    distillation.train()
+    distillation.export()
+    training_config = distillation.training.config
+    evaluation = Evaluation(
+        EvaluationConfig(
+            root_dir=tmp_path / "evaluation",
+            path_of_model=training_config.updated_base_model_path,
+            prediction_log_path=tmp_path / "evaluation" / "predictions.npz",
+            split_manifest_path=tmp_path / "evaluation" / "split.json",
+            metrics_path=tmp_path / "evaluation" / "metrics.json",
+            training_data=training_config.training_data,
+            data_manifest_path=training_config.data_manifest_path,
+            dataset_cache_dir=training_config.dataset_cache_dir,
+            all_params={},
+            mlflow_uri="",
+            params_image_size=[32, 32, 3],
+            params_batch_size=2,
+            params_classes=2,
+            params_architecture="resnet18",
+            params_num_workers=0,
+            params_prefetch_factor=2,
+            params_persistent_workers=False,
+            params_pin_memory=False,
+            params_bf16=False,
+            params_channels_last=False,
+            params_compile=False,
+            params_intra_op_threads=0,
+            params_inter_op_threads=0,
+        )
+    )
+    comparison = DistillationEvaluation(distillation.config, evaluation)
+    comparison.evaluate()
+    comparison.save_scores()
+
+    scores = json.loads((tmp_path / "distillation" / "comparison.json").read_text())
+    assert scores["accuracy_gap"] == pytest.approx(
+        scores["teacher_accuracy"] - scores["student_accuracy"]
+    )
+    assert scores["speedup"] > 0 and scores["student_model_size_mb"] > 0
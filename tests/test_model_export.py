@@ -0,0 +1,78 @@
+import os
+from pathlib import Path
+
+import pytest
+
+torch = pytest.importorskip("torch")
+from PIL import Image  # noqa: E402
+
+from solar_dust_detection.components.model_export import ModelExport  # noqa: E402
+from solar_dust_detection.entity.config_entity import ModelExportConfig  # noqa: E402
+from solar_dust_detection.pipeline.prediction import PredictionPipeline  # noqa: E402
+
+SAMPLE_IMAGES = [Image.new("RGB", (320, 240), color) for color in ("white", "black", "gray")]
+
+
+def _exporter(tmp_path, model_path):
+    config = ModelExportConfig(
+        root_dir=tmp_path,
+        trained_model_path=model_path,
+        torchscript_model_path=tmp_path / "model.ts",
+        onnx_model_path=tmp_path / "model.onnx",
+        params_image_size=[224, 224, 3],
+        params_classes=2,
+        params_architecture="resnet18",
+    )
+    export = ModelExport(config)
+    export.load_trained_model()
+    return export
+
+
+def _assert_same_predictions(expected, actual):
+    for a, b in zip(expected, actual, strict=True):
+        assert a["image"] == b["image"]
+        assert a["probabilities"] == pytest.approx(b["probabilities"], abs=1e-4)
+
+
+def test_torchscript_export_is_a_drop_in_for_prediction(tmp_path, model_checkpoint):
+    export = _exporter(tmp_path, model_checkpoint())
+    export.export_torchscript()
+    export.verify()
+
+    eager = PredictionPipeline(model_path=str(tmp_path / "model.pt"))
+    scripted = PredictionPipeline(model_path=str(tmp_path / "model.ts"))
+    assert isinstance(scripted.model, torch.jit.ScriptModule)
+
+    _assert_same_predictions(eager.predict_batch(SAMPLE_IMAGES), scripted.predict_batch(SAMPLE_IMAGES))
+
+
+def test_onnxruntime_backend_matches_torch_backend(tmp_path, model_checkpoint):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    export = _exporter(tmp_path, model_checkpoint())
+    export.export_onnx()
+    export.verify_onnx()
+
+    eager = PredictionPipeline(model_path=str(tmp_path / "model.pt"), backend="torch")
+    onnx = PredictionPipeline(model_path=str(tmp_path / "model.onnx"), backend="onnxruntime")
+
+    _assert_same_predictions(eager.predict_batch(SAMPLE_IMAGES), onnx.predict_batch(SAMPLE_IMAGES))
+    assert onnx.predict(SAMPLE_IMAGES[0]) == eager.predict(SAMPLE_IMAGES[0])
+
+
+def test_torchscript_export_older_than_the_checkpoint_is_not_served(
+    tmp_path, monkeypatch, model_checkpoint
+):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("MODEL_PATH", raising=False)
+    checkpoint, exported = Path("artifacts/training/model.pt"), Path("artifacts/model_export/model.ts")
+    checkpoint.parent.mkdir(parents=True)
+    exported.parent.mkdir(parents=True)
+    model_checkpoint(path=checkpoint)
+    _exporter(exported.parent, checkpoint).export_torchscript()
+    assert PredictionPipeline().model_path == exported
+
+    # Retrained without rerunning model_export.
+    stat = exported.stat()
+    os.utime(checkpoint, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert PredictionPipeline().model_path == checkpoint
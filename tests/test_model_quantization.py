@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("mlflow")
+
+from conftest import _image_folder  # noqa: E402
+
+from solar_dust_detection.components.model_quantization import ModelQuantization  # noqa: E402
+from solar_dust_detection.entity.config_entity import ModelQuantizationConfig  # noqa: E402
+
+
+def _quantization(tmp_path, accuracy_delta):
+    config = ModelQuantizationConfig(
+        root_dir=tmp_path,
+        trained_model_path=tmp_path / "model.pt",
+        onnx_model_path=tmp_path / "model.onnx",
+        candidate_model_path=tmp_path / "candidate_int8.onnx",
+        quantized_model_path=tmp_path / "model_int8.onnx",
+        scores_path=tmp_path / "scores.json",
+        params_calibration_samples=8,
+        params_max_accuracy_drop=0.01,
+    )
+    quantization = ModelQuantization(config=config, evaluation=None)
+    quantization.scores = {"accuracy_delta": accuracy_delta}
+    config.candidate_model_path.write_bytes(b"candidate")
+    return quantization
+
+
+def _published(tmp_path):
+    return json.loads((tmp_path / "scores.json").read_text())["published"]
+
+
+def test_candidate_within_accuracy_budget_is_published(tmp_path):
+    quantization = _quantization(tmp_path, accuracy_delta=-0.005)
+
+    quantization.publish()
+
+    assert (tmp_path / "model_int8.onnx").read_bytes() == b"candidate"
+    assert _published(tmp_path) is True
+
+
+def test_candidate_over_accuracy_budget_is_refused_and_stale_model_removed(tmp_path):
+    quantization = _quantization(tmp_path, accuracy_delta=-0.05)
+    (tmp_path / "model_int8.onnx").write_bytes(b"previous run")
+
+    quantization.publish()
+
+    assert not (tmp_path / "model_int8.onnx").exists()
+    assert _published(tmp_path) is False
+
+
+def _exporter(tmp_path, model_path, onnx_model_path):
+    """ModelExport holding the checkpoint at `model_path`."""
+    from solar_dust_detection.components.model_export import ModelExport
+    from solar_dust_detection.entity.config_entity import ModelExportConfig
+
+    export = ModelExport(ModelExportConfig(
+        root_dir=tmp_path,
+        trained_model_path=model_path,
+        torchscript_model_path=tmp_path / "model.ts",
+        onnx_model_path=onnx_model_path,
+        params_image_size=[32, 32, 3],
+        params_classes=2,
+        params_architecture="resnet18",
+    ))
+    export.load_trained_model()
+    return export
+
+
+def test_quantized_model_is_scored_against_the_float_onnx_export(
+    tmp_path, monkeypatch, model_checkpoint
+):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    from solar_dust_detection.components.model_evaluation_mlflow import Evaluation
+    from solar_dust_detection.entity.config_entity import EvaluationConfig
+
+    monkeypatch.chdir(tmp_path)
+    _image_folder(tmp_path / "data", per_class=10)
+    _exporter(tmp_path, model_checkpoint(), onnx_model_path=tmp_path / "model.onnx").export_onnx()
+
+    evaluation = Evaluation(EvaluationConfig(
+        root_dir=tmp_path / "evaluation",
+        path_of_model=tmp_path / "model.pt",
+        prediction_log_path=tmp_path / "evaluation" / "predictions.npz",
+        split_manifest_path=tmp_path / "evaluation" / "split.json",
+        metrics_path=tmp_path / "evaluation" / "metrics.json",
+        training_data=tmp_path / "data",
+        data_manifest_path=tmp_path / "manifest.json",
+        dataset_cache_dir=tmp_path / "dataset_cache",
+        all_params={},
+        mlflow_uri="",
+        params_image_size=[32, 32, 3],
+        params_batch_size=4,
+        params_classes=2,
+        params_architecture="resnet18",
+        params_num_workers=0,
+        params_prefetch_factor=2,
+        params_persistent_workers=False,
+        params_pin_memory=False,
+        params_bf16=False,
+        params_channels_last=False,
+        params_compile=False,
+        params_intra_op_threads=0,
+        params_inter_op_threads=0,
+    ))
+    quantization = _quantization(tmp_path, accuracy_delta=0.0)
+    quantization.evaluation = evaluation
+
+    quantization.quantize()
+    quantization.evaluate()
+
+    scores = quantization.scores
+    assert scores["accuracy_delta"] == pytest.approx(scores["int8_accuracy"] - scores["float_accuracy"])
+    assert abs(scores["accuracy_delta"]) <= 1 / 6 + 1e-9  # at most one of 6 validation images flips
+    # Float and INT8 sizes are both ONNX files: INT8 weights are about a quarter of fp32.
+    assert scores["float_model_size_mb"] == pytest.approx((tmp_path / "model.onnx").stat().st_size / 2**20)
+    assert scores["int8_model_size_mb"] < scores["float_model_size_mb"] / 2
+
+
+def test_int8_model_is_served_only_when_opted_in(tmp_path, monkeypatch, model_checkpoint):
+    pytest.importorskip("onnx")
+    pytest.importorskip("onnxruntime")
+    import shutil
+
+    from solar_dust_detection.pipeline.prediction import (
+        INT8_CANDIDATES,
+        MODEL_CANDIDATES,
+        PredictionPipeline,
+    )
+
+    monkeypatch.chdir(tmp_path)
+    float_path, int8_path = MODEL_CANDIDATES["onnxruntime"][1], INT8_CANDIDATES[1]
+    float_path.parent.mkdir()
+    _exporter(tmp_path, model_checkpoint(), onnx_model_path=float_path).export_onnx()
+    shutil.copyfile(float_path, int8_path)
+
+    assert PredictionPipeline(backend="onnxruntime").model_path == float_path
+    monkeypatch.setenv("PREDICT_INT8", "1")
+    assert PredictionPipeline(backend="onnxruntime").model_path == int8_path
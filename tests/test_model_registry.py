@@ -0,0 +1,61 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from solar_dust_detection.components.model_training import Training  # noqa: E402
+from solar_dust_detection.pipeline.prediction import PredictionPipeline  # noqa: E402
+from solar_dust_detection.utils.model_registry import (  # noqa: E402
+    ARCHITECTURES,
+    build_model,
+    detect_architecture,
+    get_architecture,
+    get_head,
+    model_from_state_dict,
+)
+
+
+@pytest.mark.parametrize("name", sorted(ARCHITECTURES))
+def test_state_dicts_round_trip_through_detection(name):
+    torch.manual_seed(0)
+    model = build_model(name, num_classes=3).eval()
+    assert get_head(model, name).out_features == 3
+
+    state_dict = model.state_dict()
+    assert detect_architecture(state_dict) == name
+    loaded = model_from_state_dict(state_dict)
+    images = torch.randn(2, 3, 64, 64)
+    with torch.no_grad():
+        torch.testing.assert_close(loaded(images), model(images))
+
+
+def test_unknown_architecture_or_weights_are_rejected():
+    with pytest.raises(ValueError, match="Unknown architecture"):
+        get_architecture("vgg16")
+    with pytest.raises(ValueError, match="match none"):
+        detect_architecture({"weight": torch.zeros(1)})
+
+
+def test_training_and_serving_use_the_configured_backbone(make_training_config, model_checkpoint, tmp_path):
+    head = get_architecture("mobilenet_v3_small").head
+    base_path = model_checkpoint("mobilenet_v3_small", path=tmp_path / "mobilenet_base.pt")
+    base = torch.load(base_path)
+    # A random MobileNet's features are ~1e-9: their updates only show on a zero head.
+    base[f"{head}.weight"].zero_()
+    torch.save(base, base_path)
+    config = make_training_config(
+        params_architecture="mobilenet_v3_small",
+        updated_base_model_path=base_path,
+        params_feature_cache=True,
+        params_epochs=1,
+    )
+    training = Training(config)
+    training.get_base_model()
+    training.train_valid_generator()
+    training.train()
+
+    trained = torch.load(config.trained_model_path)
+    for name, tensor in base.items():
+        assert torch.equal(tensor, trained[name]) != name.startswith(f"{head}."), name
+
+    pipeline = PredictionPipeline(model_path=str(config.trained_model_path))
+    assert detect_architecture(pipeline.model.state_dict()) == "mobilenet_v3_small"
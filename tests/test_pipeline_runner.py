@@ -0,0 +1,131 @@
+import pytest
+import yaml
+from conftest import ROOT
+
+from solar_dust_detection.pipeline.runner import (
+    PIPELINES,
+    PipelineRunner,
+    execution_order,
+    format_report,
+    read_stages,
+)
+
+DVC = {
+    "stages": {
+        "prepare": {
+            "cmd": "prepare",
+            "deps": ["src/prepare.py"],
+            "params": ["SIZE"],
+            "outs": ["out/data"],
+        },
+        "train": {
+            "cmd": "train",
+            "deps": ["src/train.py", "out/data"],
+            "params": ["EPOCHS"],
+            "outs": ["out/model.txt"],
+            "metrics": [{"scores.json": {"cache": False}}],
+        },
+    }
+}
+
+
+def _pipelines(root, calls):
+    class Prepare:
+        def main(self, config=None, context=None):
+            calls.append("prepare")
+            (root / "out" / "data").mkdir(parents=True, exist_ok=True)
+            (root / "out" / "data" / "a.txt").write_text("data")
+            context["dataset"] = "in memory"
+
+    class Train:
+        def main(self, config=None, context=None):
+            calls.append(("train", context.get("dataset")))
+            (root / "out" / "model.txt").write_text("model")
+            (root / "scores.json").write_text("{}")
+
+    return {"prepare": Prepare, "train": Train}
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "prepare.py").write_text("v1")
+    (tmp_path / "src" / "train.py").write_text("v1")
+    (tmp_path / "dvc.yaml").write_text(yaml.safe_dump(DVC))
+    (tmp_path / "params.yaml").write_text(yaml.safe_dump({"SIZE": 32, "EPOCHS": 2, "OTHER": 1}))
+    calls = []
+
+    def run(targets=None, force=False):
+        runner = PipelineRunner(
+            dvc_file=tmp_path / "dvc.yaml",
+            params_file=tmp_path / "params.yaml",
+            state_path=tmp_path / "out" / "state.json",
+            pipelines=_pipelines(tmp_path, calls),
+            config=object(),
+        )
+        return {r.name: r.status for r in runner.run(targets, force=force)}
+
+    return tmp_path, calls, run
+
+
+def test_skips_unchanged_stages_and_hands_results_over_in_memory(project):
+    root, calls, run = project
+    assert run() == {"prepare": "ran", "train": "ran"}
+    assert calls == ["prepare", ("train", "in memory")]
+
+    calls.clear()
+    assert run() == {"prepare": "skipped", "train": "skipped"}
+    assert calls == []
+
+    # A param the stage does not list changes nothing; one it lists re-runs only that stage.
+    (root / "params.yaml").write_text(yaml.safe_dump({"SIZE": 32, "EPOCHS": 3, "OTHER": 2}))
+    assert run() == {"prepare": "skipped", "train": "ran"}
+    # The skipped stage left nothing in memory, so the consumer reads from disk.
+    assert calls == [("train", None)]
+
+
+def test_code_change_or_missing_output_reruns_downstream(project):
+    root, calls, run = project
+    run()
+    (root / "src" / "prepare.py").write_text("v2")
+    assert run() == {"prepare": "ran", "train": "ran"}
+
+    (root / "scores.json").unlink()
+    assert run() == {"prepare": "skipped", "train": "ran"}
+    assert run(force=True) == {"prepare": "ran", "train": "ran"}
+
+
+def test_targets_include_upstream_stages_only(project):
+    _, _, run = project
+    assert run(["prepare"]) == {"prepare": "ran"}
+    with pytest.raises(ValueError, match="Unknown stage"):
+        run(["nope"])
+
+
+def test_repo_pipeline_graph_is_covered():
+    stages = read_stages(ROOT / "dvc.yaml")
+    assert {stage.name for stage in stages} == set(PIPELINES)
+    order = [stage.name for stage in execution_order(stages)]
+    for before, after in [
+        ("data_ingestion", "dataset_cache"),
+        ("base_model", "training"),
+        ("dataset_cache", "training"),
+        ("training", "evaluation"),
+        ("model_export", "model_quantization"),
+    ]:
+        assert order.index(before) < order.index(after)
+
+
+def test_report_lists_every_stage(project):
+    root, _, _ = project
+    runner = PipelineRunner(
+        dvc_file=root / "dvc.yaml",
+        params_file=root / "params.yaml",
+        state_path=root / "state.json",
+        pipelines=_pipelines(root, []),
+        config=object(),
+    )
+    report = format_report(runner.run())
+    assert report.splitlines()[0].split() == ["stage", "status", "seconds", "peak", "RSS", "MB"]
+    assert [line.split()[:2] for line in report.splitlines()[1:3]] == [["prepare", "ran"], ["train", "ran"]]
+    assert all(r.peak_rss_mb > 0 for r in runner.results)
@@ -0,0 +1,85 @@
+import io
+import os
+
+import pytest
+
+from solar_dust_detection.pipeline.prediction_cache import PredictionCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_evicts_least_recently_used_and_ttl_expires():
+    clock = FakeClock()
+    cache = PredictionCache(max_entries=2, ttl_s=10, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+    clock.now = 11
+    assert cache.get("a") is None
+    assert cache.stats() == {
+        "entries": 1,
+        "max_entries": 2,
+        "ttl_s": 10,
+        "hits": 2,
+        "misses": 2,
+        "hit_rate": 0.5,
+        "evictions": 1,
+        "expirations": 1,
+    }
+
+
+def test_pipeline_serves_repeats_from_cache_until_the_model_changes(model_checkpoint, monkeypatch):
+    torch = pytest.importorskip("torch")
+    from PIL import Image
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    model_path = model_checkpoint()
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), "gray").save(buf, format="PNG")
+    image_bytes = buf.getvalue()
+
+    pipeline = PredictionPipeline(model_path=str(model_path))
+    first = pipeline.predict(image_bytes)
+    batch = pipeline.predict_batch([image_bytes, b"not an image"])
+
+    def fail(tensors):
+        raise AssertionError("cached images should skip the forward pass")
+
+    monkeypatch.setattr(pipeline, "_forward", fail)
+    assert pipeline.predict(image_bytes) == first
+    assert pipeline.predict_batch([image_bytes])[0] == batch[0]
+    assert batch[0]["image"] == first[0]["image"]
+    assert "error" in batch[1]
+    assert pipeline.cache_stats()["hits"] == 3
+
+    # Retrained weights at the same MODEL_PATH: the shared cache must not answer for them.
+    state_dict = torch.load(model_path)
+    state_dict["fc.bias"] = torch.tensor([5.0, -5.0])
+    torch.save(state_dict, model_path)
+    stat = model_path.stat()
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    reloaded = PredictionPipeline(model_path=str(model_path))
+    reloaded.cache = pipeline.cache
+    forward, calls = reloaded._forward, []
+
+    def counting_forward(tensors):
+        calls.append(len(tensors))
+        return forward(tensors)
+
+    monkeypatch.setattr(reloaded, "_forward", counting_forward)
+    misses = pipeline.cache_stats()["misses"]
+    again = reloaded.predict_batch([image_bytes])[0]
+    assert calls == [1]
+    assert pipeline.cache_stats()["misses"] == misses + 1
+    assert again["probabilities"] != batch[0]["probabilities"]
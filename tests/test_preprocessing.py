@@ -0,0 +1,75 @@
+import io
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+transforms = pytest.importorskip("torchvision.transforms")
+from PIL import Image  # noqa: E402
+
+from solar_dust_detection.utils.preprocessing import (  # noqa: E402
+    IMAGENET_MEAN,
+    IMAGENET_STD,
+    ImagePreprocessor,
+)
+
+
+def _jpeg(width, height, seed):
+    rng = np.random.default_rng(seed)
+    buf = io.BytesIO()
+    Image.fromarray(rng.integers(0, 256, (height, width, 3), dtype=np.uint8)).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def test_batch_matches_torchvision_chain():
+    reference = transforms.Compose(
+        [
+            transforms.Resize((224, 224)),
+            transforms.ToTensor(),
+            transforms.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+        ]
+    )
+    images = [_jpeg(320, 240, 0), _jpeg(200, 300, 1), _jpeg(224, 224, 2)]
+    expected = torch.stack([reference(Image.open(io.BytesIO(b)).convert("RGB")) for b in images])
+
+    actual = ImagePreprocessor(size=(224, 224))(images)
+
+    assert actual.shape == expected.shape == (3, 3, 224, 224)
+    assert actual.dtype == torch.float32
+    torch.testing.assert_close(actual, expected, atol=1e-5, rtol=1e-5)
+
+
+def test_collate_normalizes_uint8_samples():
+    preprocessor = ImagePreprocessor(size=(8, 8))
+    samples = [(torch.full((3, 8, 8), 255, dtype=torch.uint8), 1), (torch.zeros(3, 8, 8, dtype=torch.uint8), 0)]
+
+    images, labels = preprocessor.collate(samples)
+
+    assert labels.tolist() == [1, 0]
+    mean = torch.tensor(IMAGENET_MEAN).view(3, 1, 1)
+    std = torch.tensor(IMAGENET_STD).view(3, 1, 1)
+    torch.testing.assert_close(images[0], ((1 - mean) / std).expand(3, 8, 8))
+    torch.testing.assert_close(images[1], (-mean / std).expand(3, 8, 8))
+
+
+def test_undecodable_bytes_raise_value_error():
+    with pytest.raises(ValueError):
+        ImagePreprocessor().load(b"not an image")
+
+
+def test_truncated_image_raises_value_error():
+    data = _jpeg(320, 240, 0)
+    with pytest.raises(ValueError):
+        ImagePreprocessor().decode(data[: len(data) // 2])
+
+
+def test_predict_batch_reports_truncated_image_per_item(model_checkpoint):
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    pipeline = PredictionPipeline(model_path=str(model_checkpoint()))
+
+    data = _jpeg(320, 240, 0)
+    results = pipeline.predict_batch([data, data[: len(data) // 2]])
+    assert results[0]["image"] in ("Clean", "Dusty")
+    assert "error" in results[1]
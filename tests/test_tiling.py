@@ -0,0 +1,116 @@
+import base64
+import io
+
+import pytest
+
+from solar_dust_detection.pipeline.tiling import (
+    TileBudgetExceeded,
+    decode_peak_bytes,
+    tile_boxes,
+    tile_starts,
+    tiles_per_batch,
+)
+
+
+def test_tiles_overlap_and_cover_both_edges():
+    assert tile_starts(500, 224, 168) == [0, 168, 276]
+    assert tile_starts(224, 224, 168) == [0]
+    rows, cols, boxes = tile_boxes(500, 224, 224, 168)
+    assert (rows, cols) == (1, 3)
+    assert boxes[-1] == (276, 0, 500, 224)
+
+
+def test_predict_tiled_maps_dust_per_tile_within_the_memory_budget(tmp_path, model_checkpoint):
+    torch = pytest.importorskip("torch")
+    from PIL import Image
+
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    pipeline = PredictionPipeline(model_path=str(model_checkpoint()))
+
+    class Brightness(torch.nn.Module):
+        # Dark tiles score as dusty.
+        def forward(self, x):
+            mean = x.mean(dim=(1, 2, 3))
+            return torch.stack([mean, -mean], dim=1) * 10
+
+    batch_sizes = []
+    pipeline.model = Brightness()
+    forward = pipeline._forward
+    pipeline._forward = lambda tiles: batch_sizes.append(len(tiles)) or forward(tiles)
+
+    image = Image.new("RGB", (672, 300), "white")
+    image.paste((0, 0, 0), (448, 0, 672, 300))
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+
+    result = pipeline.predict_tiled(buf.getvalue(), overlap=0.0, memory_budget_mb=17)
+
+    assert (result["rows"], result["cols"]) == (2, 3)
+    assert [[p > 0.5 for p in row] for row in result["grid"]] == [[False, False, True]] * 2
+    assert result["coverage_pct"] == pytest.approx(100 / 3)
+    assert batch_sizes == [2, 2, 2]
+
+    with pytest.raises(TileBudgetExceeded):
+        pipeline.predict_tiled(buf.getvalue(), memory_budget_mb=8)
+    # An explicit 0 is a budget, not "use the default".
+    with pytest.raises(TileBudgetExceeded):
+        pipeline.predict_tiled(buf.getvalue(), memory_budget_mb=0)
+
+
+def test_budget_counts_the_decode_and_resize_copies():
+    # Source pixels (up to 4 bands) plus the RGB copy from convert("RGB").
+    assert decode_peak_bytes((1000, 1000), (1000, 1000)) == 7_000_000
+    # Upscaling holds the RGB source and the resized image at once.
+    assert decode_peak_bytes((100, 2000), (224, 4480)) == (200_000 + 224 * 4480) * 3
+
+    image_bytes, tile_bytes = 3_000_000, 8_000_000
+    fits_tiles_only = image_bytes + tile_bytes
+    assert tiles_per_batch(image_bytes, fits_tiles_only, 8, tile_bytes) == 1
+    with pytest.raises(TileBudgetExceeded):
+        tiles_per_batch(image_bytes, fits_tiles_only, 8, tile_bytes, decode_bytes=fits_tiles_only + 1)
+
+
+def test_tiled_route_passes_options_and_maps_budget_errors_to_413():
+    from app import create_app
+
+    calls = []
+
+    class FakePipeline:
+        def __init__(self, filename=None, model_path=None):
+            pass
+
+        def predict_tiled(self, image, **options):
+            calls.append(options)
+            if image == b"huge":
+                raise TileBudgetExceeded("too big")
+            return {"rows": 1, "cols": 1, "grid": [[0.9]], "coverage_pct": 100.0}
+
+    client = create_app(pipeline_cls=FakePipeline).test_client()
+
+    resp = client.post(
+        "/predict/tiled", json={"image": base64.b64encode(b"img").decode(), "overlap": 0.5}
+    )
+    assert resp.status_code == 200
+    assert resp.get_json()["coverage_pct"] == 100.0
+    assert calls == [{"overlap": 0.5}]
+
+    resp = client.post("/predict/tiled", data={"image": (io.BytesIO(b"huge"), "a.jpg")})
+    assert resp.status_code == 413
+
+    resp = client.post("/predict/tiled", json={"image": "aW1n", "threshold": "high"})
+    assert resp.status_code == 400
+
+
+def test_tile_forward_estimate_follows_the_backbone(model_checkpoint):
+    pytest.importorskip("torch")
+    from solar_dust_detection.pipeline.prediction import PredictionPipeline
+
+    small = PredictionPipeline(model_path=str(model_checkpoint("mobilenet_v3_small")))
+    large = PredictionPipeline(model_path=str(model_checkpoint("efficientnet_b0")))
+    assert small.architecture == "mobilenet_v3_small"
+    assert small.tile_forward_bytes == 3 * 2**20
+    assert large.tile_forward_bytes == 12 * 2**20
+    # Tiles per pass in a 64MB budget for a 672x300 image.
+    assert tiles_per_batch(672 * 300 * 3, 64 * 2**20, 32, small.tile_forward_bytes) == 21
+    assert tiles_per_batch(672 * 300 * 3, 64 * 2**20, 32, large.tile_forward_bytes) == 5
@@ -0,0 +1,40 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from solar_dust_detection.utils.train_loop import evaluate, train_epoch  # noqa: E402
+
+
+def _batches(steps=5, batch_size=4):
+    generator = torch.Generator().manual_seed(0)
+    return [
+        (torch.randn(batch_size, 3, generator=generator), torch.randint(2, (batch_size,), generator=generator))
+        for _ in range(steps)
+    ]
+
+
+def test_epoch_metrics_match_per_batch_reads_with_one_read_back(monkeypatch):
+    batches = _batches()
+    model = torch.nn.Linear(3, 2)
+    criterion = torch.nn.CrossEntropyLoss()
+
+    with torch.no_grad():
+        expected_loss = sum(criterion(model(x), y).item() for x, y in batches) / len(batches)
+        expected_acc = sum((model(x).argmax(1) == y).sum().item() for x, y in batches) / 20
+
+    item_calls = []
+    item = torch.Tensor.item
+    monkeypatch.setattr(torch.Tensor, "item", lambda t: item_calls.append(1) or item(t))
+    loss, acc = evaluate(model, batches, criterion, "cpu")
+    assert len(item_calls) == 2  # loss and correct, once per pass
+    assert loss == pytest.approx(expected_loss)
+    assert acc == pytest.approx(expected_acc)
+
+    item_calls.clear()
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1)
+    train_epoch(model, batches, criterion, optimizer, "cpu")
+    assert len(item_calls) == 2
+    assert all(p.grad is not None for p in model.parameters())
+
+    item_calls.clear()
+    train_epoch(model, batches, criterion, optimizer, "cpu", log_every=2)
+    assert len(item_calls) == 2 + 2 * 2  # two progress logs in five steps
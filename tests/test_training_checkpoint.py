@@ -0,0 +1,68 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+from solar_dust_detection.components import model_training  # noqa: E402
+from solar_dust_detection.components.model_training import Training  # noqa: E402
+
+
+def _train(config):
+    training = Training(config)
+    training.get_base_model()
+    training.train_valid_generator()
+    training.train()
+    return training
+
+
+def test_interrupted_run_resumes_after_the_last_checkpoint(make_training_config, monkeypatch):
+    config = make_training_config(params_epochs=3)
+    epochs_run = []
+    train_epoch = model_training.train_epoch
+
+    def crash_in_epoch_2(*args, epoch=None, **kwargs):
+        if epoch == 2:
+            raise RuntimeError("killed")
+        epochs_run.append(epoch)
+        return train_epoch(*args, epoch=epoch, **kwargs)
+
+    monkeypatch.setattr(model_training, "train_epoch", crash_in_epoch_2)
+    with pytest.raises(RuntimeError, match="killed"):
+        _train(config)
+    assert config.checkpoint_path.exists()
+    assert not config.trained_model_path.exists()
+
+    def record(*args, epoch=None, **kwargs):
+        epochs_run.append(epoch)
+        return train_epoch(*args, epoch=epoch, **kwargs)
+
+    monkeypatch.setattr(model_training, "train_epoch", record)
+    _train(config)
+    assert epochs_run == [1, 2, 3]
+    assert config.trained_model_path.exists()
+    assert not config.checkpoint_path.exists()
+
+    # A checkpoint from different settings is not resumed.
+    monkeypatch.setattr(model_training, "train_epoch", crash_in_epoch_2)
+    with pytest.raises(RuntimeError):
+        _train(config)
+    epochs_run.clear()
+    monkeypatch.setattr(model_training, "train_epoch", record)
+    _train(make_training_config(params_epochs=3, params_learning_rate=0.02))
+    assert epochs_run == [1, 2, 3]
+
+
+def test_early_stopping_exports_the_best_epoch(make_training_config, monkeypatch):
+    config = make_training_config(params_epochs=10, params_early_stopping_patience=2)
+    val_losses = iter([1.0, 0.5, 0.6, 0.7, 0.4])
+    snapshots = []
+
+    def fake_evaluate(model, *args, **kwargs):
+        snapshots.append({k: v.clone() for k, v in model.state_dict().items()})
+        return next(val_losses), 0.5
+
+    monkeypatch.setattr(model_training, "evaluate", fake_evaluate)
+    _train(config)
+
+    assert len(snapshots) == 4  # stopped two epochs after the best one
+    exported = torch.load(config.trained_model_path)
+    for name, tensor in exported.items():
+        torch.testing.assert_close(tensor, snapshots[1][name])